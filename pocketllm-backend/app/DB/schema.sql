@@ -95,6 +95,16 @@ CREATE TABLE IF NOT EXISTS public.messages (
   created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Rolling summary of a chat's older turns, up to covered_message_id.
+CREATE TABLE IF NOT EXISTS public.chat_summaries (
+  chat_id UUID PRIMARY KEY REFERENCES public.chats(id) ON DELETE CASCADE,
+  summary TEXT NOT NULL,
+  covered_until TIMESTAMPTZ NOT NULL,
+  covered_message_id UUID NOT NULL,
+  token_estimate INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- =====================================================================
 -- 5. Jobs
 -- =====================================================================
@@ -225,15 +235,29 @@ CREATE TRIGGER trg_jobs_updated
   BEFORE UPDATE ON public.jobs
   FOR EACH ROW EXECUTE PROCEDURE public.touch_updated_at();
 
+-- New messages bump their chat's updated_at inside the insert itself.
+CREATE OR REPLACE FUNCTION public.touch_chat_on_message()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE public.chats SET updated_at = NOW() WHERE id = NEW.chat_id;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_messages_touch_chat
+  AFTER INSERT ON public.messages
+  FOR EACH ROW EXECUTE PROCEDURE public.touch_chat_on_message();
+
 -- =====================================================================
 -- Indexes
 -- =====================================================================
 CREATE INDEX IF NOT EXISTS idx_profiles_email ON public.profiles(email);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_profiles_invite_code ON public.profiles(invite_code);
 CREATE INDEX IF NOT EXISTS idx_model_configs_user_id ON public.model_configs(user_id);
-CREATE INDEX IF NOT EXISTS idx_chats_user_id ON public.chats(user_id);
-CREATE INDEX IF NOT EXISTS idx_messages_chat_id ON public.messages(chat_id);
+CREATE INDEX IF NOT EXISTS idx_chats_user_id_updated_at ON public.chats(user_id, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_chat_id_created_at ON public.messages(chat_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_jobs_user_id_status ON public.jobs(user_id, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_user_id_created_at ON public.jobs(user_id, created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_referrals_referrer ON public.referrals(referrer_user_id);
 CREATE UNIQUE INDEX IF NOT EXISTS idx_referrals_invite_email ON public.referrals(invite_code_id, referee_email);
 
@@ -245,6 +269,7 @@ ALTER TABLE public.providers ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.model_configs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.chats ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.messages ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.chat_summaries ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.jobs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.waitlist_entries ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.invite_codes ENABLE ROW LEVEL SECURITY;
@@ -259,6 +284,9 @@ CREATE POLICY "Users manage own chats" ON public.chats FOR ALL USING (auth.uid()
 CREATE POLICY "Users manage own messages" ON public.messages FOR ALL USING (
   auth.uid() = (SELECT user_id FROM public.chats WHERE id = chat_id)
 );
+CREATE POLICY "Users read own chat summaries" ON public.chat_summaries FOR SELECT USING (
+  auth.uid() = (SELECT user_id FROM public.chats WHERE id = chat_id)
+);
 CREATE POLICY "Users manage own jobs" ON public.jobs FOR ALL USING (auth.uid() = user_id);
 CREATE POLICY "Users own invite codes" ON public.invite_codes FOR ALL USING (auth.uid() = issued_by);
 CREATE POLICY "Users view own referral applications" ON public.referral_applications FOR ALL USING (auth.uid() = user_id);
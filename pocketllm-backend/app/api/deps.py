@@ -8,7 +8,8 @@ from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.core.config import Settings, get_settings
-from app.core.database import Database, get_database
+from app.core.database import DatabaseBackend, get_database
+from app.core.timing import timed
 from app.schemas.auth import TokenPayload
 from app.utils.security import decode_access_token
 
@@ -24,7 +25,7 @@ async def get_settings_dependency() -> Settings:
 
 async def get_database_dependency(
     settings: Settings = Depends(get_settings_dependency),
-) -> Database:
+) -> DatabaseBackend:
     """Return the database singleton."""
 
     database = get_database(settings)
@@ -65,7 +66,8 @@ async def get_current_token_payload(
     token = next((value.strip() for value in possible_tokens if value and value.strip()), None)
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-    return decode_access_token(token, settings)
+    with timed("auth", "access_token"):
+        return await decode_access_token(token, settings)
 
 
 async def get_current_request_user(
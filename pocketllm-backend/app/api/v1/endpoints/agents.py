@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from app.api.deps import get_current_request_user, get_database_dependency, get_settings_dependency
 from app.schemas.agents import AgentInfo, AgentListResponse, AgentRunRequest, AgentRunResponse
 from app.schemas.auth import TokenPayload
-from app.services.agents import AgentContext, build_agent_registry
+from app.services import agents as agent_services
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 LOGGER = logging.getLogger("app.api.v1.agents")
@@ -17,11 +17,11 @@ LOGGER = logging.getLogger("app.api.v1.agents")
 
 @router.get("/list", response_model=AgentListResponse, summary="List available agents")
 async def list_agents(
-    database=Depends(get_database_dependency),
     settings=Depends(get_settings_dependency),
     _: TokenPayload = Depends(get_current_request_user),
 ) -> AgentListResponse:
-    registry = build_agent_registry(settings, database)
+    await agent_services.load_agent_stack()
+    registry = agent_services.get_agent_registry(settings)
     agents = [
         AgentInfo(name=agent.name, description=agent.description, capabilities=agent.capabilities)
         for agent in registry.list_agents()
@@ -36,11 +36,14 @@ async def run_agent(
     database=Depends(get_database_dependency),
     settings=Depends(get_settings_dependency),
 ) -> AgentRunResponse:
-    registry = build_agent_registry(settings, database)
+    await agent_services.load_agent_stack()
+    registry = agent_services.get_agent_registry(settings)
     session_id = payload.session_id or str(user.sub)
-    context = AgentContext(session_id=session_id, user_id=str(user.sub), metadata=payload.metadata)
+    context = agent_services.AgentContext(session_id=session_id, user_id=str(user.sub), metadata=payload.metadata)
     try:
-        result = await registry.run_agent(payload.agent, context, prompt=payload.prompt, task=payload.task)
+        result = await registry.run_agent(
+            payload.agent, context, prompt=payload.prompt, task=payload.task, database=database
+        )
     except KeyError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     LOGGER.info("Agent run completed", extra={"agent": payload.agent, "user_id": str(user.sub)})
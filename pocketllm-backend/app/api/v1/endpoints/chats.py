@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.api.deps import (
     get_current_request_user,
@@ -13,19 +14,30 @@ from app.api.deps import (
 )
 from app.schemas.auth import TokenPayload
 from app.schemas.chats import ChatCreate, ChatSummary, ChatUpdate, ChatWithMessages, Message, MessageCreate
+from app.schemas.common import CursorPage
 from app.services.chats import ChatsService
+from app.utils.pagination import MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/chats", tags=["chats"])
 
 
-@router.get("", response_model=list[ChatSummary], summary="Get user chats")
+@router.get(
+    "",
+    response_model=list[ChatSummary] | CursorPage[ChatSummary],
+    summary="Get user chats",
+)
 async def list_chats(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(default=None),
+    before: str | None = Query(default=None),
     user: TokenPayload = Depends(get_current_request_user),
     database=Depends(get_database_dependency),
     settings=Depends(get_settings_dependency),
-) -> list[ChatSummary]:
+) -> list[ChatSummary] | CursorPage[ChatSummary]:
     service = ChatsService(database=database, settings=settings)
-    return await service.list_chats(user.sub)
+    if limit is None and after is None and before is None:
+        return await service.list_chats(user.sub)
+    return await service.list_chats_page(user.sub, limit=limit, after=after, before=before)
 
 
 @router.post("", response_model=ChatSummary, summary="Create a new chat")
@@ -73,24 +85,53 @@ async def delete_chat(
     await service.delete_chat(chat_id, user.sub)
 
 
-@router.post("/{chat_id}/messages", response_model=Message, summary="Send message")
+@router.post(
+    "/{chat_id}/messages",
+    response_model=Message,
+    summary="Send message",
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
 async def create_message(
     chat_id: UUID,
     payload: MessageCreate,
+    request: Request,
     user: TokenPayload = Depends(get_current_request_user),
     database=Depends(get_database_dependency),
     settings=Depends(get_settings_dependency),
-) -> Message:
+) -> Message | StreamingResponse:
     service = ChatsService(database=database, settings=settings)
+    if payload.stream:
+        events = await service.stream_message(
+            chat_id,
+            user.sub,
+            payload,
+            is_disconnected=request.is_disconnected,
+        )
+        return StreamingResponse(
+            events,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
     return await service.create_message(chat_id, user.sub, payload)
 
 
-@router.get("/{chat_id}/messages", response_model=list[Message], summary="Get chat messages")
+@router.get(
+    "/{chat_id}/messages",
+    response_model=list[Message] | CursorPage[Message],
+    summary="Get chat messages",
+)
 async def list_messages(
     chat_id: UUID,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(default=None),
+    before: str | None = Query(default=None),
     user: TokenPayload = Depends(get_current_request_user),
     database=Depends(get_database_dependency),
     settings=Depends(get_settings_dependency),
-) -> list[Message]:
+) -> list[Message] | CursorPage[Message]:
     service = ChatsService(database=database, settings=settings)
-    return await service.list_messages(chat_id, user.sub)
+    if limit is None and after is None and before is None:
+        return await service.list_messages(chat_id, user.sub)
+    return await service.list_messages_page(
+        chat_id, user.sub, limit=limit, after=after, before=before
+    )
@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
+from typing import Any
 
 from fastapi import APIRouter, Depends, Request, Response
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 
 from app.api.deps import get_settings_dependency
 from app.core.config import Settings
+from app.core.http_clients import get_http_client_registry
+from app.core.metrics import CONTENT_TYPE, get_metrics_exporter
 from app.schemas.common import HealthResponse
+from app.services.providers.catalogue import ProviderModelCatalogue
+from app.services.resolved_configs import get_resolved_config_cache
 from app.utils.html_templates import render_health_page, render_root_page
 
 router = APIRouter(tags=["default"])
@@ -47,3 +52,28 @@ async def health(
         return HTMLResponse(content=render_health_page(payload), status_code=200)
 
     return JSONResponse(content=jsonable_encoder(payload))
+
+
+@router.get("/health/http-clients", summary="Provider HTTP connection pool statistics")
+async def http_client_stats() -> dict[str, Any]:
+    """Expose pooled provider HTTP client statistics for monitoring."""
+
+    return get_http_client_registry().stats()
+
+
+@router.get("/health/caches", summary="In-process cache statistics")
+async def cache_stats(settings: Settings = Depends(get_settings_dependency)) -> dict[str, Any]:
+    """Expose hit/miss counters for the per-process caches."""
+
+    return {
+        "resolved_configs": get_resolved_config_cache(settings).stats(),
+        "provider_catalogue": ProviderModelCatalogue(settings).stats(),
+    }
+
+
+@router.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+async def metrics(settings: Settings = Depends(get_settings_dependency)) -> Response:
+    """Expose request, database and provider metrics in the text exposition format."""
+
+    body = get_metrics_exporter(settings).render()
+    return PlainTextResponse(content=body, media_type=CONTENT_TYPE)
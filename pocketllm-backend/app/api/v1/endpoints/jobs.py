@@ -4,10 +4,11 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.api.deps import get_current_request_user, get_database_dependency, get_settings_dependency
 from app.schemas.auth import TokenPayload
+from app.schemas.common import CursorPage
 from app.schemas.jobs import (
     Job,
     JobCreateRequest,
@@ -16,18 +17,24 @@ from app.schemas.jobs import (
     JobEstimateResponse,
 )
 from app.services.jobs import JobsService
+from app.utils.pagination import MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
-@router.get("", response_model=list[Job], summary="Get user jobs")
+@router.get("", response_model=list[Job] | CursorPage[Job], summary="Get user jobs")
 async def list_jobs(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(default=None),
+    before: str | None = Query(default=None),
     user: TokenPayload = Depends(get_current_request_user),
     settings=Depends(get_settings_dependency),
     database=Depends(get_database_dependency),
-) -> list[Job]:
+) -> list[Job] | CursorPage[Job]:
     service = JobsService(settings=settings, database=database)
-    return await service.list_jobs(user.sub)
+    if limit is None and after is None and before is None:
+        return await service.list_jobs(user.sub)
+    return await service.list_jobs_page(user.sub, limit=limit, after=after, before=before)
 
 
 @router.post("/image-generation", response_model=JobCreateResponse, summary="Create image generation job")
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import json
+from collections.abc import AsyncIterator
+from typing import Any
 from urllib.parse import parse_qs
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.api.deps import (
     get_current_request_user,
@@ -24,9 +28,17 @@ from app.services.provider_configs import ProvidersService
 
 router = APIRouter(prefix="/models", tags=["models"])
 
+_STREAM_MEDIA_TYPES = ("application/x-ndjson", "text/event-stream")
 
-@router.get("", response_model=ProviderModelsResponse, summary="List provider models")
+
+@router.get(
+    "",
+    response_model=ProviderModelsResponse,
+    summary="List provider models",
+    responses={200: {"content": {media_type: {} for media_type in _STREAM_MEDIA_TYPES}}},
+)
 async def list_models(
+    request: Request,
     user: TokenPayload = Depends(get_current_request_user),
     settings=Depends(get_settings_dependency),
     database=Depends(get_database_dependency),
@@ -34,7 +46,26 @@ async def list_models(
     name: str | None = Query(default=None, description="Case-insensitive substring filter applied to model names"),
     model_id: str | None = Query(default=None, description="Case-insensitive substring filter applied to model identifiers"),
     query: str | None = Query(default=None, description="Free text search across model id, name, and description"),
-) -> ProviderModelsResponse:
+    limit: int | None = Query(default=None, ge=1, description="Return at most this many models, best matches first"),
+) -> ProviderModelsResponse | StreamingResponse:
+    """List models; ``Accept: application/x-ndjson`` or ``text/event-stream`` streams them per provider."""
+
+    media_type = _stream_media_type(request.headers.get("accept", ""))
+    if media_type is not None:
+        service = ProvidersService(settings=settings, database=database)
+        events = await service.stream_provider_models(
+            user.sub,
+            provider=provider,
+            name=name,
+            model_id=model_id,
+            query=query,
+            limit=limit,
+        )
+        return StreamingResponse(
+            _encode_events(events, media_type),
+            media_type=media_type,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
     return await _resolve_models_response(
         user,
         settings,
@@ -43,6 +74,7 @@ async def list_models(
         name=name,
         model_id=model_id,
         query=query,
+        limit=limit,
     )
 
 
@@ -121,6 +153,7 @@ async def _resolve_models_response(
     name: str | None = None,
     model_id: str | None = None,
     query: str | None = None,
+    limit: int | None = None,
 ) -> ProviderModelsResponse:
     service = ProvidersService(settings=settings, database=database)
     return await service.get_provider_models(
@@ -129,9 +162,28 @@ async def _resolve_models_response(
         name=name,
         model_id=model_id,
         query=query,
+        limit=limit,
     )
 
 
+def _stream_media_type(accept: str) -> str | None:
+    """Return the first streaming media type named in an ``Accept`` header."""
+
+    for item in accept.split(","):
+        media_type = item.split(";", 1)[0].strip().lower()
+        if media_type in _STREAM_MEDIA_TYPES:
+            return media_type
+    return None
+
+
+async def _encode_events(events: AsyncIterator[tuple[str, dict[str, Any]]], media_type: str) -> AsyncIterator[str]:
+    async for event, data in events:
+        if media_type == "text/event-stream":
+            yield f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+        else:
+            yield json.dumps({"event": event, "data": data}, separators=(",", ":")) + "\n"
+
+
 def _first_query_value(parameters: dict[str, list[str]], key: str) -> str | None:
     """Return the first non-empty value for ``key`` from parsed query parameters."""
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from app.api.deps import (
     get_current_request_user,
@@ -12,23 +12,36 @@ from app.api.deps import (
     get_settings_dependency,
 )
 from app.schemas.auth import TokenPayload
+from app.schemas.common import CursorPage
 from app.schemas.notifications import (
     Notification,
     NotificationUpdate,
 )
 from app.services.notifications import NotificationService
+from app.utils.pagination import MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
-@router.get("", response_model=list[Notification], summary="List notifications for the current user")
+@router.get(
+    "",
+    response_model=list[Notification] | CursorPage[Notification],
+    summary="List notifications for the current user",
+)
 async def list_notifications(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(default=None),
+    before: str | None = Query(default=None),
     payload: TokenPayload = Depends(get_current_request_user),
     settings=Depends(get_settings_dependency),
     database=Depends(get_database_dependency),
-) -> list[Notification]:
+) -> list[Notification] | CursorPage[Notification]:
     service = NotificationService(settings=settings, database=database)
-    return await service.list_notifications(UUID(str(payload.sub)))
+    if limit is None and after is None and before is None:
+        return await service.list_notifications(UUID(str(payload.sub)))
+    return await service.list_notifications_page(
+        UUID(str(payload.sub)), limit=limit, after=after, before=before
+    )
 
 
 @router.patch("/{notification_id}/read", response_model=Notification, summary="Mark a notification as read")
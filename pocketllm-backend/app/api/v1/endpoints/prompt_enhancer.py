@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends
 from app.api.deps import get_current_request_user, get_database_dependency, get_settings_dependency
 from app.schemas.agents import PromptEnhancerRequest, PromptEnhancerResponse
 from app.schemas.auth import TokenPayload
-from app.services.agents import AgentContext, AgentMemoryStore, PromptEnhancerAgent
+from app.services import agents as agent_services
 from app.utils.rate_limit import RateLimiter
 
 router = APIRouter(prefix="/prompt-enhancer", tags=["prompt-enhancer"])
@@ -28,10 +28,11 @@ async def improve_prompt(
     session_id = payload.session_id or str(user.sub)
     LOGGER.info("Prompt enhancement requested", extra={"user_id": str(user.sub), "task": payload.task})
 
-    memory_store = AgentMemoryStore(database)
-    agent = PromptEnhancerAgent(settings, memory_store)
-    context = AgentContext(session_id=session_id, user_id=str(user.sub), metadata=payload.metadata)
-    result = await agent.improve_prompt(context, task=payload.task, prompt=payload.prompt)
+    await agent_services.load_agent_stack()
+    agent = agent_services.get_agent_registry(settings).get_agent("prompt_enhancer")
+    context = agent_services.AgentContext(session_id=session_id, user_id=str(user.sub), metadata=payload.metadata)
+    with agent_services.bind_agent_database(database):
+        result = await agent.improve_prompt(context, task=payload.task, prompt=payload.prompt)
 
     return PromptEnhancerResponse(
         task=result.data.get("task", payload.task.lower()),
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import List
+from typing import List, Literal
 
 from pydantic import AnyHttpUrl, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -54,6 +54,16 @@ class Settings(BaseSettings):
     supabase_jwt_secret: str | None = None
     supabase_jwt_audience: str = "authenticated"
     supabase_schema: str = "public"
+    # Asymmetric access tokens are verified against this JWKS (defaults to the
+    # project's /auth/v1/.well-known/jwks.json), cached for SUPABASE_JWKS_TTL.
+    supabase_jwks_url: str | None = Field(default=None, alias="SUPABASE_JWKS_URL")
+    supabase_jwks_ttl: float = Field(default=600.0, alias="SUPABASE_JWKS_TTL")
+    # Fetch the JWKS at startup instead of on the first asymmetric token.
+    supabase_jwks_prefetch: bool = Field(default=False, alias="SUPABASE_JWKS_PREFETCH")
+    # Ask Supabase Auth to validate tokens that cannot be verified locally.
+    supabase_auth_remote_verification: bool = Field(
+        default=False, alias="SUPABASE_AUTH_REMOTE_VERIFICATION"
+    )
 
     # Database connection (direct Postgres access through Supabase)
     database_url: str | None = Field(default=None, alias="SUPABASE_DB_URL")
@@ -61,6 +71,28 @@ class Settings(BaseSettings):
     database_pool_max_size: int = 10
     database_statement_timeout: int = 30_000
 
+    # Data layer backend: "supabase" runs the Supabase SDK on the default
+    # thread pool, "postgrest" calls PostgREST over pooled async HTTP and
+    # "asyncpg" connects to SUPABASE_DB_URL directly.
+    database_backend: Literal["supabase", "postgrest", "asyncpg"] = Field(
+        default="supabase", alias="DATABASE_BACKEND"
+    )
+    # Set to 0 behind transaction-mode poolers (pgbouncer/Supavisor :6543),
+    # which cannot hold prepared statements across transactions.
+    database_statement_cache_size: int = Field(
+        default=100, alias="DATABASE_STATEMENT_CACHE_SIZE"
+    )
+    database_rest_max_connections: int = Field(
+        default=100, alias="DATABASE_REST_MAX_CONNECTIONS"
+    )
+    database_rest_max_keepalive_connections: int = Field(
+        default=20, alias="DATABASE_REST_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    database_rest_timeout: float = Field(default=30.0, alias="DATABASE_REST_TIMEOUT")
+    # When disabled, startup does not wait for the connectivity check; it runs
+    # in the background and the first request pays for anything left over.
+    database_warmup: bool = Field(default=True, alias="DATABASE_WARMUP")
+
     # Redis / job queue configuration
     redis_url: str | None = None
     job_results_ttl_seconds: int = 60 * 60  # 1 hour
@@ -71,10 +103,19 @@ class Settings(BaseSettings):
     refresh_token_expire_minutes: int = 60 * 24 * 14
     token_algorithm: str = "HS256"
     encryption_key: str = ""
+    # Comma-separated keys that previously served as ENCRYPTION_KEY; secrets
+    # they encrypted still decrypt and are re-encrypted under the new key.
+    encryption_legacy_keys: str = ""
 
     # Logging configuration
     log_level: str = Field(default="INFO", validation_alias="LOG_LEVEL")
     log_json: bool = Field(default=False, validation_alias="LOG_JSON", json_schema_extra={"example": False})
+    # Records are formatted and written on a background thread; disable to
+    # write synchronously (e.g. when debugging logging itself).
+    log_queue_enabled: bool = Field(default=True, validation_alias="LOG_QUEUE_ENABLED")
+    # Fraction of successful database operation logs to keep; failures are
+    # always logged.
+    db_log_sample_rate: float = Field(default=1.0, validation_alias="DB_LOG_SAMPLE_RATE")
 
     # Storage configuration
     storage_bucket_models: str = "model-artifacts"
@@ -113,6 +154,94 @@ class Settings(BaseSettings):
     provider_catalogue_total_timeout: float = Field(
         default=30.0, alias="PROVIDER_CATALOGUE_TOTAL_TIMEOUT"
     )
+    # Expired catalogues are served for up to this long while they refresh in
+    # the background; failed fetches are retried after the error TTL.
+    provider_catalogue_max_stale: int = Field(
+        default=900, alias="PROVIDER_CATALOGUE_MAX_STALE"
+    )
+    provider_catalogue_error_ttl: int = Field(
+        default=30, alias="PROVIDER_CATALOGUE_ERROR_TTL"
+    )
+    # How many of the most requested catalogues to refresh before they expire (0 disables).
+    provider_catalogue_prewarm_top: int = Field(
+        default=20, alias="PROVIDER_CATALOGUE_PREWARM_TOP"
+    )
+    provider_catalogue_cache_max_entries: int = Field(
+        default=1024, alias="PROVIDER_CATALOGUE_CACHE_MAX_ENTRIES"
+    )
+    # Second-tier catalogue cache shared by workers: "sqlite" (a local file) or
+    # "redis" (REDIS_URL).
+    provider_catalogue_store: Literal["none", "sqlite", "redis"] = Field(
+        default="none", alias="PROVIDER_CATALOGUE_STORE"
+    )
+    provider_catalogue_store_path: str = Field(
+        default="/tmp/pocketllm-catalogue.sqlite3", alias="PROVIDER_CATALOGUE_STORE_PATH"
+    )
+
+    # Pooled HTTP clients used for upstream provider calls
+    provider_http_max_connections: int = Field(
+        default=100, alias="PROVIDER_HTTP_MAX_CONNECTIONS"
+    )
+    provider_http_max_keepalive_connections: int = Field(
+        default=20, alias="PROVIDER_HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    provider_http_keepalive_expiry: float = Field(
+        default=30.0, alias="PROVIDER_HTTP_KEEPALIVE_EXPIRY"
+    )
+    provider_http_timeout: float = Field(default=60.0, alias="PROVIDER_HTTP_TIMEOUT")
+    provider_http2_enabled: bool = Field(default=True, alias="PROVIDER_HTTP2_ENABLED")
+
+    # Chat context window management: the fallback window for models missing
+    # from the cached catalogue, and how many history rows to read per page.
+    chat_default_context_window: int = Field(
+        default=8192, alias="CHAT_DEFAULT_CONTEXT_WINDOW"
+    )
+    chat_history_page_size: int = Field(default=50, alias="CHAT_HISTORY_PAGE_SIZE")
+
+    # Import LangChain/LangGraph during startup instead of on the first agent request.
+    agents_preload: bool = Field(default=False, alias="AGENTS_PRELOAD")
+
+    # Rolling chat summaries: once the unsummarised history of a chat passes
+    # the trigger, older turns are compacted in the background by a cheap
+    # model using the deployment's own key for that provider.
+    chat_summary_enabled: bool = Field(default=False, alias="CHAT_SUMMARY_ENABLED")
+    chat_summary_provider: str = Field(default="openai", alias="CHAT_SUMMARY_PROVIDER")
+    chat_summary_model: str | None = Field(default="gpt-4o-mini", alias="CHAT_SUMMARY_MODEL")
+    chat_summary_trigger_tokens: int = Field(
+        default=4000, alias="CHAT_SUMMARY_TRIGGER_TOKENS"
+    )
+    chat_summary_keep_recent: int = Field(default=6, alias="CHAT_SUMMARY_KEEP_RECENT")
+    # Only summarise once the turns older than the kept ones reach this size.
+    chat_summary_min_batch_tokens: int = Field(
+        default=1000, alias="CHAT_SUMMARY_MIN_BATCH_TOKENS"
+    )
+    chat_summary_batch_size: int = Field(default=200, alias="CHAT_SUMMARY_BATCH_SIZE")
+    chat_summary_max_tokens: int = Field(default=512, alias="CHAT_SUMMARY_MAX_TOKENS")
+
+    # Seconds a per-process unread notification count is trusted before it is
+    # recounted; bounds drift from writes made by other workers.
+    notification_unread_count_ttl: float = Field(
+        default=30.0, alias="NOTIFICATION_UNREAD_COUNT_TTL"
+    )
+
+    # Per-process cache of each user's resolved model configurations and
+    # provider records (decrypted keys stay in memory only).
+    resolved_config_cache_ttl: float = Field(
+        default=60.0, alias="RESOLVED_CONFIG_CACHE_TTL"
+    )
+    resolved_config_cache_max_users: int = Field(
+        default=1024, alias="RESOLVED_CONFIG_CACHE_MAX_USERS"
+    )
+
+    # Prometheus metrics: with several workers, point every worker at the
+    # same (initially empty) directory so a scrape reports all of them.
+    metrics_multiproc_dir: str | None = Field(default=None, alias="METRICS_MULTIPROC_DIR")
+    metrics_flush_interval: float = Field(default=10.0, alias="METRICS_FLUSH_INTERVAL")
+
+    # Server-Timing breakdowns: off unless enabled for every request, or
+    # requested per request with ``X-Server-Timing: <SERVER_TIMING_TOKEN>``.
+    server_timing_enabled: bool = Field(default=False, alias="SERVER_TIMING_ENABLED")
+    server_timing_token: str | None = Field(default=None, alias="SERVER_TIMING_TOKEN")
 
     # Invite code configuration
     invite_code_required: bool = Field(default=True, alias="INVITE_CODE")
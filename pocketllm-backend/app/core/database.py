@@ -6,12 +6,17 @@ import asyncio
 import logging
 from contextlib import asynccontextmanager
 from functools import partial
-from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
 from uuid import UUID
 
+from app.core.metrics import instrument_db_operation
+
 if TYPE_CHECKING:  # pragma: no cover - typing helper
     from app.core.config import Settings
+    from app.core.postgres import AsyncpgDatabase
+    from app.core.postgrest import PostgRESTDatabase
     from app.database.connection import SupabaseDatabase
+    from app.utils.pagination import Keyset
 else:  # pragma: no cover - fallback for runtime without config dependency
     Settings = Any  # type: ignore[misc,assignment]
     SupabaseDatabase = Any  # type: ignore[misc,assignment]
@@ -38,7 +43,12 @@ class Database:
         """Supabase connections are stateless; nothing to close."""
 
     def _ensure_client_ready(self) -> None:
-        self._supabase.client
+        # Creates the SDK client on first use and runs the startup check once.
+        connect = getattr(self._supabase, "connect", None)
+        if connect is not None:
+            connect()
+        else:
+            self._supabase.client
         if getattr(self._supabase, "_connection_verified", False):
             return
 
@@ -77,18 +87,22 @@ class Database:
     # ------------------------------------------------------------------
     # Profile helpers
     # ------------------------------------------------------------------
+    @instrument_db_operation("get_profile", table="profiles")
     async def get_profile(self, user_id: UUID | str) -> Optional[Dict[str, Any]]:
         return await self._run(self._supabase.get_profile, str(user_id))
 
+    @instrument_db_operation("upsert_profile", table="profiles")
     async def upsert_profile(self, user_id: UUID | str, payload: Dict[str, Any]) -> Dict[str, Any]:
         return await self._run(self._supabase.upsert_profile, str(user_id), payload)
 
+    @instrument_db_operation("update_profile", table="profiles")
     async def update_profile(self, user_id: UUID | str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         return await self._run(self._supabase.update_profile, str(user_id), payload)
 
     # ------------------------------------------------------------------
     # Generic CRUD helpers
     # ------------------------------------------------------------------
+    @instrument_db_operation("select")
     async def select(
         self,
         table: str,
@@ -97,6 +111,7 @@ class Database:
         filters: Optional[Dict[str, Any]] = None,
         limit: Optional[int] = None,
         order_by: Optional[Iterable[Any]] = None,
+        keyset: Optional["Keyset"] = None,
     ) -> List[Dict[str, Any]]:
         order_param = None
         if isinstance(order_by, str):
@@ -111,17 +126,31 @@ class Database:
             filters=self._stringify_filters(filters),
             limit=limit,
             order_by=order_param,
+            keyset=keyset,
+        )
+
+    @instrument_db_operation("count")
+    async def count(self, table: str, *, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Return the number of rows matching ``filters`` without fetching them."""
+
+        return await self._run(
+            self._supabase.count,
+            table,
+            filters=self._stringify_filters(filters),
         )
 
+    @instrument_db_operation("insert")
     async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         records = await self._run(self._supabase.insert, table, data)
         if not records:
             raise RuntimeError(f"Insert into {table} returned no data")
         return records[0]
 
+    @instrument_db_operation("insert_many")
     async def insert_many(self, table: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         return await self._run(self._supabase.insert, table, data)
 
+    @instrument_db_operation("update")
     async def update(self, table: str, data: Dict[str, Any], *, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         return await self._run(
             self._supabase.update,
@@ -130,6 +159,7 @@ class Database:
             filters=self._stringify_filters(filters),
         )
 
+    @instrument_db_operation("upsert")
     async def upsert(
         self,
         table: str,
@@ -139,6 +169,7 @@ class Database:
     ) -> List[Dict[str, Any]]:
         return await self._run(self._supabase.upsert, table, data, on_conflict=on_conflict)
 
+    @instrument_db_operation("delete")
     async def delete(self, table: str, *, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         return await self._run(
             self._supabase.delete,
@@ -160,11 +191,13 @@ class Database:
         return {key: str(value) if isinstance(value, UUID) else value for key, value in filters.items()}
 
 
-_database_instance: Database | None = None
+DatabaseBackend = Union[Database, "PostgRESTDatabase", "AsyncpgDatabase"]
+
+_database_instance: DatabaseBackend | None = None
 
 
-def get_database(settings: "Settings" | None = None) -> Database:
-    """Return a singleton :class:`Database` instance."""
+def get_database(settings: "Settings" | None = None) -> DatabaseBackend:
+    """Return the singleton database backend selected by ``database_backend``."""
 
     global _database_instance
     if _database_instance is None:
@@ -172,10 +205,25 @@ def get_database(settings: "Settings" | None = None) -> Database:
             from app.core.config import get_settings
 
             settings = get_settings()
-        _database_instance = Database(settings)
+        _database_instance = _build_database(settings)
     return _database_instance
 
 
+def _build_database(settings: "Settings") -> DatabaseBackend:
+    backend = getattr(settings, "database_backend", "supabase")
+    if backend == "postgrest":
+        from app.core.postgrest import PostgRESTDatabase
+
+        logger.info("Using native async PostgREST database backend")
+        return PostgRESTDatabase(settings)
+    if backend == "asyncpg":
+        from app.core.postgres import AsyncpgDatabase
+
+        logger.info("Using asyncpg database backend")
+        return AsyncpgDatabase(settings)
+    return Database(settings)
+
+
 async def connect_to_database() -> None:
     """Initialise the global Supabase client."""
 
@@ -188,7 +236,7 @@ async def close_database() -> None:
     await get_database().disconnect()
 
 
-async def run_db_task(task: Callable[["Database"], Any]) -> Any:
+async def run_db_task(task: Callable[[DatabaseBackend], Any]) -> Any:
     """Execute ``task`` with a connected :class:`Database` instance."""
 
     database = get_database()
@@ -210,6 +258,7 @@ def _resolve_supabase(supabase: "SupabaseDatabase" | None) -> "SupabaseDatabase"
 
 __all__ = [
     "Database",
+    "DatabaseBackend",
     "connect_to_database",
     "close_database",
     "get_database",
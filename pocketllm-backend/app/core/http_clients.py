@@ -0,0 +1,182 @@
+"""Process-wide pooled HTTP clients for upstream provider calls."""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.timing import HTTPX_EVENT_HOOKS
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from app.core.config import Settings
+else:  # pragma: no cover - fallback for runtime without config dependency
+    Settings = Any  # type: ignore[misc,assignment]
+
+logger = logging.getLogger(__name__)
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class ProviderHTTPClientRegistry:
+    """Hand out one long-lived :class:`httpx.AsyncClient` per upstream origin.
+
+    Clients keep their connections alive between requests so repeated chat
+    turns and catalogue refreshes reuse the same TCP/TLS session. Timeouts and
+    headers are supplied per request because they vary between callers.
+    """
+
+    def __init__(
+        self,
+        settings: "Settings" | None = None,
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=int(getattr(settings, "provider_http_max_connections", 100)),
+            max_keepalive_connections=int(
+                getattr(settings, "provider_http_max_keepalive_connections", 20)
+            ),
+            keepalive_expiry=float(getattr(settings, "provider_http_keepalive_expiry", 30.0)),
+        )
+        self._timeout = float(getattr(settings, "provider_http_timeout", 60.0))
+        self._http2 = bool(getattr(settings, "provider_http2_enabled", True)) and _HTTP2_AVAILABLE
+        self._transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._request_counts: dict[str, int] = {}
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client serving the origin of ``url``."""
+
+        key = _origin_key(url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self._limits,
+                timeout=self._timeout,
+                http2=self._http2,
+                transport=self._transport,
+                event_hooks=HTTPX_EVENT_HOOKS,
+            )
+            self._clients[key] = client
+            logger.debug("Opened pooled HTTP client for %s (http2=%s)", key, self._http2)
+        self._request_counts[key] = self._request_counts.get(key, 0) + 1
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client and drop their connections."""
+
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:  # pragma: no cover - best effort shutdown
+                logger.exception("Failed to close pooled HTTP client")
+
+    def stats(self) -> dict[str, Any]:
+        """Return connection pool statistics keyed by upstream origin."""
+
+        pools: dict[str, Any] = {}
+        for key, client in self._clients.items():
+            connections = _pool_connections(client)
+            pools[key] = {
+                "checkouts": self._request_counts.get(key, 0),
+                "connections": len(connections),
+                "idle_connections": sum(
+                    1 for connection in connections if _safe_call(connection, "is_idle")
+                ),
+                "http2": self._http2,
+                "closed": client.is_closed,
+            }
+        return {
+            "limits": {
+                "max_connections": self._limits.max_connections,
+                "max_keepalive_connections": self._limits.max_keepalive_connections,
+                "keepalive_expiry": self._limits.keepalive_expiry,
+            },
+            "pools": pools,
+        }
+
+
+_registry: ProviderHTTPClientRegistry | None = None
+
+
+def get_http_client_registry(settings: "Settings" | None = None) -> ProviderHTTPClientRegistry:
+    """Return the process-wide :class:`ProviderHTTPClientRegistry`."""
+
+    global _registry
+    if _registry is None:
+        if settings is None:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+        _registry = ProviderHTTPClientRegistry(settings)
+    return _registry
+
+
+async def close_http_clients() -> None:
+    """Close the process-wide registry; a fresh one is created on next use."""
+
+    global _registry
+    registry, _registry = _registry, None
+    if registry is not None:
+        await registry.aclose()
+
+
+@asynccontextmanager
+async def provider_http_client(
+    url: str,
+    *,
+    transport: httpx.AsyncBaseTransport | None = None,
+    registry: ProviderHTTPClientRegistry | None = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield a client for ``url``.
+
+    Callers that inject a ``transport`` (tests, custom proxies) get a
+    short-lived client bound to it; everyone else borrows the pooled client.
+    """
+
+    if transport is not None:
+        async with httpx.AsyncClient(transport=transport, event_hooks=HTTPX_EVENT_HOOKS) as client:
+            yield client
+        return
+
+    yield (registry or get_http_client_registry()).get_client(url)
+
+
+def _origin_key(url: str) -> str:
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port is None or (scheme, port) in {("https", 443), ("http", 80)}:
+        return f"{scheme}://{host}"
+    return f"{scheme}://{host}:{port}"
+
+
+def _pool_connections(client: httpx.AsyncClient) -> list[Any]:
+    transport = getattr(client, "_transport", None)
+    pool = getattr(transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    return list(connections) if connections else []
+
+
+def _safe_call(target: Any, name: str) -> bool:
+    method = getattr(target, name, None)
+    try:
+        return bool(method()) if callable(method) else False
+    except Exception:  # pragma: no cover - defensive guard for httpcore internals
+        return False
+
+
+__all__ = [
+    "ProviderHTTPClientRegistry",
+    "close_http_clients",
+    "get_http_client_registry",
+    "provider_http_client",
+]
@@ -0,0 +1,180 @@
+"""Cached JSON Web Key Set for verifying Supabase access tokens locally."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+import httpx
+import jwt
+
+from app.core.http_clients import provider_http_client
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Unknown ``kid`` values trigger a refetch (the project may have rotated its
+# signing key), but never more often than this.
+_MIN_REFETCH_INTERVAL = 30.0
+# Until a first fetch succeeds, retry after 1, 2, 4, ... seconds (capped at
+# the interval above) so a cold worker is not left without keys for long.
+_COLD_RETRY_DELAY = 1.0
+_FETCH_TIMEOUT = 5.0
+
+
+class JWKSCache:
+    """Signing keys from the project's JWKS endpoint, refreshed off the request path.
+
+    Fresh keys are served from memory. Once ``ttl`` has passed the cached keys
+    keep being served while a single background task refetches them; only the
+    very first lookup, or one for a ``kid`` not seen before, waits on the
+    network. The periodic refresh starts with the first lookup, so deployments
+    that only see HS256 tokens never poll the endpoint.
+    """
+
+    def __init__(
+        self,
+        settings: "Settings",
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        supabase_url = str(getattr(settings, "supabase_url", "")).rstrip("/")
+        self.url = (
+            getattr(settings, "supabase_jwks_url", None)
+            or f"{supabase_url}/auth/v1/.well-known/jwks.json"
+        )
+        self._api_key = getattr(settings, "supabase_anon_key", None)
+        self._ttl = float(getattr(settings, "supabase_jwks_ttl", 600.0))
+        self._transport = transport
+        self._clock = clock
+        self._keys: dict[str | None, jwt.PyJWK] = {}
+        self._fetched_at: float | None = None
+        self._last_attempt = float("-inf")
+        self._failures = 0
+        self._inflight: asyncio.Task[None] | None = None
+        self._refresher: asyncio.Task[None] | None = None
+
+    async def get_signing_key(self, kid: str | None) -> jwt.PyJWK | None:
+        """Return the key for ``kid``, or ``None`` when the set does not contain it."""
+
+        if self._fetched_at is None:
+            if self._may_refetch():
+                await self.refresh()
+        elif self._clock() - self._fetched_at >= self._ttl and self._may_refetch():
+            self._schedule_refresh()
+
+        key = self._lookup(kid)
+        if key is None and self._fetched_at is not None and self._may_refetch():
+            await self.refresh()
+            key = self._lookup(kid)
+        self.start()
+        return key
+
+    async def refresh(self) -> None:
+        """Refetch the key set; concurrent callers share one request."""
+
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch())
+        await asyncio.shield(self._inflight)
+
+    def start(self) -> None:
+        """Keep the key set warm with a periodic background refresh."""
+
+        if self._refresher is None or self._refresher.done():
+            if self._fetched_at is None and self._may_refetch():
+                self._schedule_refresh()
+            self._refresher = asyncio.create_task(self._refresh_periodically())
+
+    async def aclose(self) -> None:
+        for task in (self._refresher, self._inflight):
+            if task is not None and not task.done():
+                task.cancel()
+        self._refresher = self._inflight = None
+
+    def _lookup(self, kid: str | None) -> jwt.PyJWK | None:
+        if kid is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+        return self._keys.get(kid)
+
+    def _may_refetch(self) -> bool:
+        return self._clock() - self._last_attempt >= self._retry_delay()
+
+    def _retry_delay(self) -> float:
+        if self._fetched_at is None and self._failures:
+            return min(_COLD_RETRY_DELAY * 2 ** (self._failures - 1), _MIN_REFETCH_INTERVAL)
+        return _MIN_REFETCH_INTERVAL
+
+    def _schedule_refresh(self) -> None:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch())
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            if self._inflight is not None and not self._inflight.done():
+                await asyncio.shield(self._inflight)
+            if self._fetched_at is None:
+                await asyncio.sleep(self._retry_delay())
+            else:
+                await asyncio.sleep(max(self._ttl / 2, _MIN_REFETCH_INTERVAL))
+            await self.refresh()
+
+    async def _fetch(self) -> None:
+        self._last_attempt = self._clock()
+        headers = {"apikey": self._api_key} if self._api_key else None
+        try:
+            async with provider_http_client(self.url, transport=self._transport) as client:
+                response = await client.get(self.url, headers=headers, timeout=_FETCH_TIMEOUT)
+                response.raise_for_status()
+                payload: Any = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            self._failures += 1
+            logger.warning("Failed to fetch JWKS from %s: %s", self.url, exc)
+            return
+
+        keys: dict[str | None, jwt.PyJWK] = {}
+        for entry in payload.get("keys", []) if isinstance(payload, dict) else []:
+            try:
+                key = jwt.PyJWK(entry)
+            except (jwt.PyJWKError, jwt.InvalidKeyError) as exc:
+                logger.debug("Skipping unusable JWK %s: %s", entry.get("kid"), exc)
+                continue
+            keys[key.key_id] = key
+        if not keys:
+            # Never swap a working key set for an empty one.
+            self._failures += 1
+            logger.warning("JWKS from %s contained no usable keys; keeping the previous set", self.url)
+            return
+        self._keys = keys
+        self._fetched_at = self._clock()
+        self._failures = 0
+
+
+_cache: JWKSCache | None = None
+
+
+def get_jwks_cache(settings: "Settings" | None = None) -> JWKSCache:
+    """Return the process-wide :class:`JWKSCache`."""
+
+    global _cache
+    if _cache is None:
+        if settings is None:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+        _cache = JWKSCache(settings)
+    return _cache
+
+
+async def close_jwks_cache() -> None:
+    global _cache
+    cache, _cache = _cache, None
+    if cache is not None:
+        await cache.aclose()
+
+
+__all__ = ["JWKSCache", "close_jwks_cache", "get_jwks_cache"]
@@ -1,32 +1,112 @@
-"""Logging configuration helpers."""
+"""Logging configuration helpers.
+
+Application threads only enqueue records; formatting and writing happen on a
+:class:`~logging.handlers.QueueListener` thread. Records are enqueued as they
+are, so ``%``-style arguments, :func:`lazy_json` values and ``extra`` fields
+are only rendered when a record is actually written.
+"""
 
 from __future__ import annotations
 
+import atexit
+import json
 import logging
+import random
 import sys
+from datetime import UTC, datetime
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from typing import Any, Dict
 
 from .config import Settings
 
+# Records logged with ``extra={SAMPLED: True}`` are routine success-path
+# messages that ``DB_LOG_SAMPLE_RATE`` may drop; warnings and errors never are.
+SAMPLED = "sampled"
+
+_LOGGERS = ("", "uvicorn", "uvicorn.error", "uvicorn.access", "app")
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "color_message", SAMPLED}
+
+_listener: QueueListener | None = None
+
+
+class lazy_json:
+    """Defer ``json.dumps(value)`` until the log record is formatted."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __str__(self) -> str:
+        return json.dumps(self.value, default=str)
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, including any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a ``rate`` fraction of records marked :data:`SAMPLED`."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = min(max(rate, 0.0), 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno >= logging.WARNING or not getattr(record, SAMPLED, False):
+            return True
+        return random.random() < self.rate
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records unformatted so the listener thread does the work.
+
+    :meth:`QueueHandler.prepare` would merge the message and arguments in
+    the calling thread; that copy only matters for queues that cross process
+    boundaries, which this one never does. As with any deferred logging,
+    objects passed as arguments must not be mutated after logging them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
 
 def configure_logging(settings: Settings) -> None:
     """Configure structured logging for the application."""
 
     # Use colored logs in development unless explicitly disabled
     use_colors = not settings.log_json and settings.environment.lower() == "development"
-    
+
     log_format = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+    default_formatter: Dict[str, Any] = {"format": log_format}
     if settings.log_json:
-        log_format = "%(message)s"
+        default_formatter = {"()": JSONFormatter}
 
     log_config: Dict[str, Any] = {
         "version": 1,
         "disable_existing_loggers": False,
         "formatters": {
-            "default": {
-                "format": log_format,
-            },
+            "default": default_formatter,
             "colored": {
                 "()": "uvicorn.logging.ColourizedFormatter",
                 "fmt": "%(levelprefix)s %(name)s %(message)s",
@@ -55,8 +135,52 @@ def configure_logging(settings: Settings) -> None:
         },
     }
 
+    stop_logging()
     dictConfig(log_config)
+    _install_queue(
+        sample_rate=float(getattr(settings, "db_log_sample_rate", 1.0)),
+        use_queue=bool(getattr(settings, "log_queue_enabled", True)),
+    )
     logging.getLogger(__name__).info("Logging configured", extra={"level": settings.log_level})
 
 
-__all__ = ["configure_logging"]
\ No newline at end of file
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def _install_queue(*, sample_rate: float, use_queue: bool) -> None:
+    global _listener
+    target = logging.getHandlerByName("default")
+    if target is None:  # pragma: no cover - dictConfig always creates it
+        return
+    sampler = SamplingFilter(sample_rate)
+    if not use_queue:
+        target.addFilter(sampler)
+        return
+
+    queue_handler = _DeferredQueueHandler(SimpleQueue())
+    queue_handler.setLevel(target.level)
+    queue_handler.addFilter(sampler)
+    for name in _LOGGERS:
+        handlers = logging.getLogger(name).handlers
+        handlers[:] = [queue_handler if handler is target else handler for handler in handlers]
+    _listener = QueueListener(queue_handler.queue, target, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(stop_logging)
+
+
+__all__ = [
+    "JSONFormatter",
+    "SAMPLED",
+    "SamplingFilter",
+    "configure_logging",
+    "lazy_json",
+    "stop_logging",
+]
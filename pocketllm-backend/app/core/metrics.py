@@ -0,0 +1,488 @@
+"""Process-local metrics rendered in the Prometheus text exposition format.
+
+Metrics are plain Python objects updated from the event loop thread, so the
+hot path is an attribute increment and a ``bisect`` with no locks and no
+formatting; text is only produced when ``/metrics`` is scraped.
+
+With several uvicorn workers each process only sees its own requests. When
+``METRICS_MULTIPROC_DIR`` is set every worker periodically writes a snapshot
+of its metrics to that directory and a scrape, whichever worker serves it,
+sums the counters and histograms of all snapshots. Gauges are reported per
+worker with a ``pid`` label. Clear the directory when the deployment starts,
+as with ``prometheus_client``'s multiprocess mode.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Sequence, TypeVar
+
+from app.core.timing import record_timing
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+# Gauges from snapshots older than this many flush intervals belong to
+# workers that have exited and are left out of the scrape.
+_STALE_FLUSHES = 3
+
+_F = TypeVar("_F", bound=Callable[..., Awaitable[Any]])
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Any] = {}
+
+    def labels(self, *values: str) -> Any:
+        """Return the child for ``values``; bind it once and reuse it on hot paths."""
+
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def clear(self) -> None:
+        self._children.clear()
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        """Create the per-label-set child that records samples."""
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "type": self.kind,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(key), child.value] for key, child in self._children.items()],
+        }
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "type": self.kind,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "buckets": list(self.buckets),
+            "samples": [
+                [list(key), list(child.counts), child.sum] for key, child in self._children.items()
+            ],
+        }
+
+
+class MetricsRegistry:
+    """The set of metrics exported by this process."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before every snapshot to refresh sampled gauges."""
+
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict[str, Any]:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:  # pragma: no cover - defensive catch-all
+                logger.exception("Metrics collector %r failed", collector)
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def clear(self) -> None:
+        """Drop every recorded sample; intended for tests."""
+
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def _register(self, metric: Any) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "pocketllm_http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    ("method", "route", "status"),
+)
+DB_OPERATION_SECONDS = REGISTRY.histogram(
+    "pocketllm_db_operation_duration_seconds",
+    "Database operation latency by table and operation.",
+    ("table", "operation"),
+)
+DB_OPERATION_ERRORS = REGISTRY.counter(
+    "pocketllm_db_operation_errors_total",
+    "Database operations that raised, by table and operation.",
+    ("table", "operation"),
+)
+PROVIDER_REQUEST_SECONDS = REGISTRY.histogram(
+    "pocketllm_provider_request_duration_seconds",
+    "Provider chat completion latency by provider and mode.",
+    ("provider", "mode"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+)
+PROVIDER_TTFB_SECONDS = REGISTRY.histogram(
+    "pocketllm_provider_ttfb_seconds",
+    "Time until a streamed provider completion delivers its first token.",
+    ("provider",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0),
+)
+PROVIDER_ERRORS = REGISTRY.counter(
+    "pocketllm_provider_errors_total",
+    "Failed provider chat completions by provider and reason.",
+    ("provider", "reason"),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "pocketllm_cache_lookups_total",
+    "In-process cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+EXECUTOR_QUEUE_DEPTH = REGISTRY.gauge(
+    "pocketllm_executor_queue_depth",
+    "Calls waiting for a thread in the event loop's default executor.",
+)
+EXECUTOR_THREADS = REGISTRY.gauge(
+    "pocketllm_executor_threads",
+    "Threads started by the event loop's default executor.",
+)
+
+
+def _collect_executor() -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    executor = getattr(loop, "_default_executor", None)
+    queue = getattr(executor, "_work_queue", None)
+    EXECUTOR_QUEUE_DEPTH.set(queue.qsize() if queue is not None else 0)
+    EXECUTOR_THREADS.set(len(getattr(executor, "_threads", ())))
+
+
+REGISTRY.add_collector(_collect_executor)
+
+
+def instrument_db_operation(operation: str, *, table: str | None = None) -> Callable[[_F], _F]:
+    """Time a database backend method; the table is its first argument unless fixed."""
+
+    def decorator(func: _F) -> _F:
+        @wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            table_name = table or (args[0] if args else kwargs.get("table", "unknown"))
+            started = time.perf_counter()
+            try:
+                return await func(self, *args, **kwargs)
+            except Exception:
+                DB_OPERATION_ERRORS.labels(table_name, operation).inc()
+                raise
+            finally:
+                duration = time.perf_counter() - started
+                DB_OPERATION_SECONDS.labels(table_name, operation).observe(duration)
+                record_timing("db", f"{table_name}.{operation}", duration)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# Exposition
+# ----------------------------------------------------------------------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def merge_snapshots(snapshots: Iterable[tuple[int, dict[str, Any]]]) -> dict[str, Any]:
+    """Sum counters and histograms across workers; keep gauges per ``pid``."""
+
+    merged: dict[str, Any] = {}
+    for pid, snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = {**metric, "samples": {}}
+                if metric["type"] == "gauge":
+                    target["labelnames"] = [*metric["labelnames"], "pid"]
+            samples = target["samples"]
+            for sample in metric["samples"]:
+                if metric["type"] == "gauge":
+                    samples[(*sample[0], str(pid))] = sample[1]
+                    continue
+                key = tuple(sample[0])
+                if metric["type"] == "counter":
+                    samples[key] = samples.get(key, 0.0) + sample[1]
+                    continue
+                counts, total = samples.get(key, ([0] * len(sample[1]), 0.0))
+                samples[key] = ([a + b for a, b in zip(counts, sample[1])], total + sample[2])
+    for metric in merged.values():
+        metric["samples"] = [
+            [list(key), *value] if isinstance(value, tuple) else [list(key), value]
+            for key, value in metric["samples"].items()
+        ]
+    return merged
+
+
+def render(snapshot: dict[str, Any]) -> str:
+    """Format a snapshot in the Prometheus text exposition format."""
+
+    lines: list[str] = []
+    for name, metric in snapshot.items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric["labelnames"]
+        if metric["type"] != "histogram":
+            for values, value in metric["samples"]:
+                lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(value)}")
+            continue
+        bounds = [*metric["buckets"], float("inf")]
+        for values, counts, total in metric["samples"]:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+            labels = _format_labels(labelnames, values)
+            lines.append(f"{name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{name}_count{labels} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Serve this process's metrics, merged with sibling workers when configured."""
+
+    def __init__(self, settings: "Settings", registry: MetricsRegistry = REGISTRY) -> None:
+        directory = getattr(settings, "metrics_multiproc_dir", None)
+        self.directory = Path(directory) if directory else None
+        self._interval = float(getattr(settings, "metrics_flush_interval", 10.0))
+        self._registry = registry
+        self._pid = os.getpid()
+        self._flusher: asyncio.Task[None] | None = None
+
+    def render(self) -> str:
+        if self.directory is None:
+            return render(self._registry.snapshot())
+        self.flush()
+        return render(merge_snapshots(self._read_snapshots()))
+
+    def flush(self) -> None:
+        """Write this worker's snapshot to the shared directory."""
+
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"worker-{self._pid}.json"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self._registry.snapshot(), separators=(",", ":")))
+        os.replace(temporary, path)
+
+    def start(self) -> None:
+        if self.directory is not None and (self._flusher is None or self._flusher.done()):
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def aclose(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+        self._flusher = None
+        self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                self.flush()
+            except OSError as exc:
+                logger.warning("Failed to write metrics snapshot to %s: %s", self.directory, exc)
+
+    def _read_snapshots(self) -> list[tuple[int, dict[str, Any]]]:
+        assert self.directory is not None
+        stale_before = time.time() - self._interval * _STALE_FLUSHES
+        snapshots: list[tuple[int, dict[str, Any]]] = []
+        for path in sorted(self.directory.glob("worker-*.json")):
+            try:
+                pid = int(path.stem.split("-", 1)[1])
+                modified = path.stat().st_mtime
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError) as exc:
+                logger.debug("Skipping unreadable metrics snapshot %s: %s", path, exc)
+                continue
+            if modified < stale_before and pid != self._pid:
+                snapshot = {
+                    name: metric for name, metric in snapshot.items() if metric["type"] != "gauge"
+                }
+            snapshots.append((pid, snapshot))
+        return snapshots
+
+
+_exporter: MetricsExporter | None = None
+
+
+def get_metrics_exporter(settings: "Settings" | None = None) -> MetricsExporter:
+    """Return the process-wide :class:`MetricsExporter`."""
+
+    global _exporter
+    if _exporter is None:
+        if settings is None:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+        _exporter = MetricsExporter(settings)
+    return _exporter
+
+
+async def close_metrics_exporter() -> None:
+    global _exporter
+    exporter, _exporter = _exporter, None
+    if exporter is not None:
+        await exporter.aclose()
+
+
+__all__ = [
+    "CACHE_LOOKUPS",
+    "CONTENT_TYPE",
+    "Counter",
+    "DB_OPERATION_ERRORS",
+    "DB_OPERATION_SECONDS",
+    "EXECUTOR_QUEUE_DEPTH",
+    "EXECUTOR_THREADS",
+    "Gauge",
+    "HTTP_REQUEST_SECONDS",
+    "Histogram",
+    "MetricsExporter",
+    "MetricsRegistry",
+    "PROVIDER_ERRORS",
+    "PROVIDER_REQUEST_SECONDS",
+    "PROVIDER_TTFB_SECONDS",
+    "REGISTRY",
+    "close_metrics_exporter",
+    "get_metrics_exporter",
+    "instrument_db_operation",
+    "merge_snapshots",
+    "render",
+]
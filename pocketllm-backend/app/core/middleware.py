@@ -1,51 +1,195 @@
-"""Custom FastAPI middleware components."""
+"""Custom ASGI middleware components.
+
+All middlewares wrap ``send`` directly instead of subclassing Starlette's
+``BaseHTTPMiddleware``, which runs each request in an extra task behind a
+memory stream and buffers streaming responses through it.
+"""
 
 from __future__ import annotations
 
+import hmac
+import json
+import logging
 import time
 import uuid
+from typing import TYPE_CHECKING
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_REQUEST_SECONDS
+from app.core.timing import REQUEST_HEADER as TIMING_REQUEST_HEADER
+from app.core.timing import finish_request_timings, start_request_timings
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from app.core.config import Settings
 
+_timing_logger = logging.getLogger("pocketllm.timing")
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
+
+class RequestContextMiddleware:
     """Attach a request identifier to every incoming request."""
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        request.state.request_id = uuid.uuid4().hex
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request.state.request_id
-        return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Structured logging for incoming requests."""
+        request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
 
-    def __init__(self, app, logger_name: str = "pocketllm.api") -> None:
-        super().__init__(app)
-        import logging
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+
+class LoggingMiddleware:
+    """Structured logging for incoming requests."""
 
+    def __init__(self, app: ASGIApp, logger_name: str = "pocketllm.api") -> None:
+        self.app = app
         self._logger = logging.getLogger(logger_name)
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = round((time.perf_counter() - start_time) * 1000, 2)
+                MutableHeaders(scope=message)["X-Process-Time"] = str(process_time)
+                client = scope.get("client")
+                self._logger.info(
+                    "HTTP request",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status_code": message["status"],
+                        "duration_ms": process_time,
+                        "request_id": scope.get("state", {}).get("request_id"),
+                        "client_ip": client[0] if client else None,
+                    },
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+class MetricsMiddleware:
+    """Record request latency by route template, method and status code.
+
+    Requests that match no route share the ``unmatched`` label so scanners
+    cannot grow the number of series. Streaming responses are timed until
+    their last chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.perf_counter()
-        response = await call_next(request)
-        process_time = (time.perf_counter() - start_time) * 1000
-
-        self._logger.info(
-            "HTTP request",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration_ms": round(process_time, 2),
-                "request_id": getattr(request.state, "request_id", None),
-                "client_ip": request.client.host if request.client else None,
-            },
-        )
-        response.headers["X-Process-Time"] = str(round(process_time, 2))
-        return response
-
-
-__all__ = ["LoggingMiddleware", "RequestContextMiddleware"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], _route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - start_time)
+
+
+class ServerTimingMiddleware:
+    """Collect spans for opted-in requests and report them in ``Server-Timing``.
+
+    The header summarises the work done before the response started. The full
+    list of spans, including those recorded while a streaming body was being
+    sent, is logged on ``pocketllm.timing`` at DEBUG with the request id and,
+    when the server supports ASGI response trailers, sent as a
+    ``Server-Timing-Detail`` JSON trailer.
+    """
+
+    def __init__(self, app: ASGIApp, settings: "Settings" | None = None) -> None:
+        self.app = app
+        self._enabled = bool(getattr(settings, "server_timing_enabled", False))
+        token = getattr(settings, "server_timing_token", None)
+        self._token = token.encode() if token else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (self._enabled or self._opted_in(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = start_request_timings(scope.get("state", {}).get("request_id"))
+        trailers = "http.response.trailers" in scope.get("extensions", {})
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+                if trailers:
+                    message["trailers"] = True
+            await send(message)
+            if trailers and message["type"] == "http.response.body" and not message.get("more_body"):
+                detail = json.dumps(timings.as_dict(), separators=(",", ":"))
+                await send(
+                    {
+                        "type": "http.response.trailers",
+                        "headers": [(b"server-timing-detail", detail.encode())],
+                        "more_trailers": False,
+                    }
+                )
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish_request_timings(token)
+            if _timing_logger.isEnabledFor(logging.DEBUG):
+                _timing_logger.debug("Request timings: %s", json.dumps(timings.as_dict()))
+
+    def _opted_in(self, scope: Scope) -> bool:
+        if self._token is None:
+            return False
+        for name, value in scope["headers"]:
+            if name == TIMING_REQUEST_HEADER:
+                return hmac.compare_digest(value, self._token)
+        return False
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if not template:
+        return "unmatched"
+    # Routes of included routers may report their path without the router
+    # prefix; the prefix is the leading segments of the matched path.
+    path = scope["path"]
+    extra = path.count("/") - template.count("/")
+    if extra > 0 and ":path}" not in template:
+        template = "/".join(path.split("/")[: extra + 1]) + template
+    return template
+
+
+__all__ = [
+    "LoggingMiddleware",
+    "MetricsMiddleware",
+    "RequestContextMiddleware",
+    "ServerTimingMiddleware",
+]
@@ -0,0 +1,487 @@
+"""Direct Postgres backend for :mod:`app.core.database` built on asyncpg.
+
+Queries are generated from the same ``select/insert/update/upsert/delete``
+arguments the services already pass, including the PostgREST embedding
+syntax used for chat lookups. Payloads and filters are bound as a single
+``jsonb`` parameter and coerced with ``jsonb_populate_record`` (which is what
+PostgREST itself does), and rows come back as ``to_jsonb`` documents, so
+results have exactly the shape the HTTP backends return.
+
+SQL text is deterministic for a given call shape, so asyncpg's per-connection
+statement cache turns the hot queries (chat lookup, message history, provider
+lookup) into prepared statements after their first execution.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Union
+from uuid import UUID
+
+from app.core.metrics import instrument_db_operation
+from app.core.postgrest import normalise_order
+from app.utils.pagination import Keyset
+from app.utils.serializers import serialize_dates_for_json
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    import asyncpg
+
+    from app.core.config import Settings
+else:  # pragma: no cover - fallback for runtime without config dependency
+    Settings = Any  # type: ignore[misc,assignment]
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_EMBED = re.compile(r"^(?:(?P<alias>\w+):)?(?P<table>\w+)(?:!(?P<fk>\w+))?\((?P<columns>.*)\)$", re.S)
+
+# Connection bound by ``connection()``/``transaction()`` for the current task.
+_bound_connection: ContextVar["asyncpg.Connection | None"] = ContextVar(
+    "pocketllm_asyncpg_connection", default=None
+)
+
+
+class AsyncpgDatabase:
+    """Async database backend talking to Postgres over an asyncpg pool."""
+
+    def __init__(self, settings: "Settings") -> None:
+        if not getattr(settings, "database_url", None):
+            raise ValueError("SUPABASE_DB_URL must be set to use the asyncpg database backend")
+        self._settings = settings
+        self._schema = getattr(settings, "supabase_schema", "public") or "public"
+        self._pool: "asyncpg.Pool | None" = None
+        self._pool_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Lifecycle management
+    # ------------------------------------------------------------------
+    async def connect(self) -> None:
+        """Create the connection pool on first use."""
+
+        if self._pool is not None:
+            return
+        async with self._pool_lock:
+            if self._pool is not None:
+                return
+            import asyncpg
+
+            settings = self._settings
+            self._pool = await asyncpg.create_pool(
+                dsn=_normalise_dsn(settings.database_url),
+                min_size=int(settings.database_pool_min_size),
+                max_size=int(settings.database_pool_max_size),
+                statement_cache_size=int(getattr(settings, "database_statement_cache_size", 100)),
+                server_settings={
+                    "statement_timeout": str(int(settings.database_statement_timeout)),
+                    "application_name": "pocketllm-backend",
+                },
+                init=_init_connection,
+            )
+            logger.info(
+                "✅ asyncpg pool ready (min=%s, max=%s)",
+                settings.database_pool_min_size,
+                settings.database_pool_max_size,
+            )
+
+    async def disconnect(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await pool.close()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator["AsyncpgDatabase"]:
+        """Pin every query issued inside the block to one pooled connection.
+
+        Queries inside the block share that connection, so they must be
+        awaited one after another rather than gathered concurrently.
+        """
+
+        if _bound_connection.get() is not None:
+            yield self
+            return
+        await self.connect()
+        assert self._pool is not None
+        async with self._pool.acquire() as connection:
+            token = _bound_connection.set(connection)
+            try:
+                yield self
+            finally:
+                _bound_connection.reset(token)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["AsyncpgDatabase"]:
+        """Run the block in a real transaction (a savepoint when nested)."""
+
+        async with self.connection():
+            connection = _bound_connection.get()
+            assert connection is not None
+            async with connection.transaction():
+                yield self
+
+    # ------------------------------------------------------------------
+    # Profile helpers
+    # ------------------------------------------------------------------
+    async def get_profile(self, user_id: UUID | str) -> Optional[Dict[str, Any]]:
+        records = await self.select("profiles", filters={"id": str(user_id)}, limit=1)
+        return records[0] if records else None
+
+    async def upsert_profile(self, user_id: UUID | str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        data = {"id": str(user_id), **payload, "updated_at": datetime.now(tz=UTC)}
+        records = await self.upsert("profiles", data, on_conflict="id")
+        return records[0]
+
+    async def update_profile(self, user_id: UUID | str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        data = {**payload, "updated_at": datetime.now(tz=UTC)}
+        records = await self.update("profiles", data, filters={"id": str(user_id)})
+        return records[0] if records else None
+
+    # ------------------------------------------------------------------
+    # Generic CRUD helpers
+    # ------------------------------------------------------------------
+    @instrument_db_operation("select")
+    async def select(
+        self,
+        table: str,
+        *,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[Iterable[Any]] = None,
+        keyset: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        filter_keys, null_keys, values = _split_filters(filters)
+        sql = build_select(
+            self._schema,
+            table,
+            columns,
+            filter_keys,
+            null_keys,
+            tuple(normalise_order(order_by)),
+            limit,
+            keyset.columns if keyset else (),
+            bool(keyset and keyset.descending),
+        )
+        args = [_to_json(values)] if filter_keys else []
+        if keyset is not None:
+            args.append(_to_json(dict(zip(keyset.columns, keyset.values))))
+        return await self._fetch(sql, *args)
+
+    @instrument_db_operation("count")
+    async def count(self, table: str, *, filters: Optional[Dict[str, Any]] = None) -> int:
+        filter_keys, null_keys, values = _split_filters(filters)
+        sql = build_count(self._schema, table, filter_keys, null_keys)
+        [total] = await self._fetch(sql, *([_to_json(values)] if filter_keys else []))
+        return int(total)
+
+    @instrument_db_operation("insert")
+    async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        records = await self._insert_rows(table, [data])
+        if not records:
+            raise RuntimeError(f"Insert into {table} returned no data")
+        return records[0]
+
+    @instrument_db_operation("insert_many")
+    async def insert_many(self, table: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._insert_rows(table, data)
+
+    @instrument_db_operation("update")
+    async def update(self, table: str, data: Dict[str, Any], *, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        filter_keys, null_keys, values = _split_filters(filters)
+        sql = build_update(self._schema, table, tuple(data), filter_keys, null_keys)
+        return await self._fetch(sql, _to_json(data), _to_json(values))
+
+    @instrument_db_operation("upsert")
+    async def upsert(
+        self,
+        table: str,
+        data: Union[Dict[str, Any], List[Dict[str, Any]]],
+        *,
+        on_conflict: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        rows = data if isinstance(data, list) else [data]
+        conflict = tuple(column.strip() for column in (on_conflict or "id").split(","))
+        sql = build_insert(self._schema, table, _payload_keys(rows), conflict)
+        records = await self._fetch(sql, _to_json(rows))
+        if not records:
+            raise RuntimeError(f"Upsert operation failed for {table}")
+        return records
+
+    @instrument_db_operation("delete")
+    async def delete(self, table: str, *, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        filter_keys, null_keys, values = _split_filters(filters)
+        sql = build_delete(self._schema, table, filter_keys, null_keys)
+        return await self._fetch(sql, *([_to_json(values)] if filter_keys else []))
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    async def _insert_rows(self, table: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not data:
+            return []
+        sql = build_insert(self._schema, table, _payload_keys(data), None)
+        return await self._fetch(sql, _to_json(data))
+
+    async def _fetch(self, sql: str, *args: Any) -> List[Dict[str, Any]]:
+        connection = _bound_connection.get()
+        if connection is not None:
+            rows = await connection.fetch(sql, *args)
+        else:
+            await self.connect()
+            assert self._pool is not None
+            rows = await self._pool.fetch(sql, *args)
+        return [row[0] for row in rows]
+
+
+# ----------------------------------------------------------------------
+# SQL generation
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Embed:
+    alias: str
+    table: str
+    foreign_key: str
+    columns: tuple[Union[str, "_Embed"], ...]
+
+
+@lru_cache(maxsize=512)
+def build_select(
+    schema: str,
+    table: str,
+    columns: str,
+    filter_keys: tuple[str, ...],
+    null_keys: tuple[str, ...],
+    order: tuple[tuple[str, bool], ...],
+    limit: Optional[int],
+    keyset_columns: tuple[str, ...] = (),
+    keyset_descending: bool = False,
+) -> str:
+    """Return the SQL for a ``select`` call.
+
+    ``$1`` carries the filter values and the following parameter the keyset
+    position, both as ``jsonb`` objects.
+    """
+
+    target = _qualified(schema, table)
+    sql = f"SELECT {_row_document(schema, 't0', _parse_columns(columns), 0)} FROM {target} AS t0"
+    if filter_keys:
+        sql += f" CROSS JOIN LATERAL jsonb_populate_record(NULL::{target}, $1::jsonb) AS f"
+    if keyset_columns:
+        position = 2 if filter_keys else 1
+        sql += f" CROSS JOIN LATERAL jsonb_populate_record(NULL::{target}, ${position}::jsonb) AS k"
+    sql += _where(filter_keys, null_keys)
+    if keyset_columns:
+        left = ", ".join(f"t0.{_quote(column)}" for column in keyset_columns)
+        right = ", ".join(f"k.{_quote(column)}" for column in keyset_columns)
+        sql += " AND " if filter_keys or null_keys else " WHERE "
+        sql += f"({left}) {'<' if keyset_descending else '>'} ({right})"
+    if order:
+        sql += " ORDER BY " + ", ".join(
+            f"t0.{_quote(column)} {'DESC' if descending else 'ASC'}" for column, descending in order
+        )
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql
+
+
+@lru_cache(maxsize=128)
+def build_count(
+    schema: str,
+    table: str,
+    filter_keys: tuple[str, ...],
+    null_keys: tuple[str, ...],
+) -> str:
+    """Return the SQL counting rows matching the filters in ``$1``."""
+
+    target = _qualified(schema, table)
+    sql = f"SELECT count(*) FROM {target} AS t0"
+    if filter_keys:
+        sql += f" CROSS JOIN LATERAL jsonb_populate_record(NULL::{target}, $1::jsonb) AS f"
+    return sql + _where(filter_keys, null_keys)
+
+
+@lru_cache(maxsize=256)
+def build_insert(
+    schema: str,
+    table: str,
+    keys: tuple[str, ...],
+    on_conflict: Optional[tuple[str, ...]],
+) -> str:
+    """Return the SQL inserting the ``jsonb`` array in ``$1``, optionally upserting."""
+
+    target = _qualified(schema, table)
+    column_list = ", ".join(_quote(key) for key in keys)
+    sql = (
+        f"INSERT INTO {target} AS t0 ({column_list}) "
+        f"SELECT {column_list} FROM jsonb_populate_recordset(NULL::{target}, $1::jsonb)"
+    )
+    if on_conflict is not None:
+        updates = [key for key in keys if key not in on_conflict] or list(on_conflict[:1])
+        sql += (
+            f" ON CONFLICT ({', '.join(_quote(key) for key in on_conflict)}) DO UPDATE SET "
+            + ", ".join(f"{_quote(key)} = EXCLUDED.{_quote(key)}" for key in updates)
+        )
+    return sql + " RETURNING to_jsonb(t0.*)"
+
+
+@lru_cache(maxsize=256)
+def build_update(
+    schema: str,
+    table: str,
+    keys: tuple[str, ...],
+    filter_keys: tuple[str, ...],
+    null_keys: tuple[str, ...],
+) -> str:
+    """Return the SQL applying ``$1`` to rows matching the filters in ``$2``."""
+
+    target = _qualified(schema, table)
+    assignments = ", ".join(f"{_quote(key)} = d.{_quote(key)}" for key in keys)
+    sql = (
+        f"UPDATE {target} AS t0 SET {assignments} "
+        f"FROM jsonb_populate_record(NULL::{target}, $1::jsonb) AS d, "
+        f"jsonb_populate_record(NULL::{target}, $2::jsonb) AS f"
+    )
+    return sql + _where(filter_keys, null_keys) + " RETURNING to_jsonb(t0.*)"
+
+
+@lru_cache(maxsize=128)
+def build_delete(
+    schema: str,
+    table: str,
+    filter_keys: tuple[str, ...],
+    null_keys: tuple[str, ...],
+) -> str:
+    """Return the SQL deleting rows matching the filters in ``$1``."""
+
+    target = _qualified(schema, table)
+    sql = f"DELETE FROM {target} AS t0"
+    if filter_keys:
+        sql += f" USING jsonb_populate_record(NULL::{target}, $1::jsonb) AS f"
+    return sql + _where(filter_keys, null_keys) + " RETURNING to_jsonb(t0.*)"
+
+
+def _where(filter_keys: tuple[str, ...], null_keys: tuple[str, ...]) -> str:
+    clauses = [f"t0.{_quote(key)} = f.{_quote(key)}" for key in filter_keys]
+    clauses.extend(f"t0.{_quote(key)} IS NULL" for key in null_keys)
+    return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def _row_document(schema: str, alias: str, columns: tuple[Union[str, _Embed], ...], depth: int) -> str:
+    plain = [column for column in columns if isinstance(column, str)]
+    embeds = [column for column in columns if isinstance(column, _Embed)]
+
+    if "*" in plain:
+        document = f"to_jsonb({alias}.*)"
+    else:
+        pairs = ", ".join(f"'{column}', {alias}.{_quote(column)}" for column in plain)
+        document = f"jsonb_build_object({pairs})"
+
+    for embed in embeds:
+        child = f"t{depth + 1}"
+        target = _qualified(schema, embed.table)
+        nested = _row_document(schema, child, embed.columns, depth + 1)
+        document += (
+            f" || jsonb_build_object('{embed.alias}', (SELECT {nested} FROM {target} AS {child} "
+            f"WHERE {child}.\"id\" = {alias}.{_quote(embed.foreign_key)}))"
+        )
+    return document
+
+
+@lru_cache(maxsize=256)
+def _parse_columns(columns: str) -> tuple[Union[str, _Embed], ...]:
+    parsed: list[Union[str, _Embed]] = []
+    for token in _split_top_level(columns):
+        match = _EMBED.match(token)
+        if match:
+            table = match.group("table")
+            parsed.append(
+                _Embed(
+                    alias=_identifier(match.group("alias") or table),
+                    table=_identifier(table),
+                    foreign_key=_identifier(match.group("fk") or f"{table.removesuffix('s')}_id"),
+                    columns=_parse_columns(match.group("columns")),
+                )
+            )
+        elif token == "*":
+            parsed.append(token)
+        else:
+            parsed.append(_identifier(token))
+    return tuple(parsed)
+
+
+def _split_top_level(columns: str) -> list[str]:
+    tokens: list[str] = []
+    depth = 0
+    current: list[str] = []
+    for char in columns:
+        if char == "," and depth == 0:
+            tokens.append("".join(current).strip())
+            current = []
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current.append(char)
+    tokens.append("".join(current).strip())
+    return [token for token in tokens if token]
+
+
+def _split_filters(
+    filters: Optional[Dict[str, Any]],
+) -> tuple[tuple[str, ...], tuple[str, ...], Dict[str, Any]]:
+    if not filters:
+        return (), (), {}
+    values = {key: value for key, value in filters.items() if value is not None}
+    null_keys = tuple(key for key, value in filters.items() if value is None)
+    return tuple(values), null_keys, values
+
+
+def _payload_keys(rows: List[Dict[str, Any]]) -> tuple[str, ...]:
+    keys: dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    return tuple(keys)
+
+
+def _to_json(value: Any) -> str:
+    return json.dumps(serialize_dates_for_json(value), default=str)
+
+
+def _identifier(name: str) -> str:
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+
+def _quote(name: str) -> str:
+    return f'"{_identifier(name)}"'
+
+
+def _qualified(schema: str, table: str) -> str:
+    return f"{_quote(schema)}.{_quote(table)}"
+
+
+def _normalise_dsn(dsn: str) -> str:
+    # SQLAlchemy-style URLs (postgresql+asyncpg://) are accepted for convenience.
+    return re.sub(r"^postgres(?:ql)?\+\w+://", "postgresql://", dsn)
+
+
+def _encode_json(value: Any) -> str:
+    # Parameters are serialised up front by ``_to_json``.
+    return value if isinstance(value, str) else _to_json(value)
+
+
+async def _init_connection(connection: "asyncpg.Connection") -> None:
+    for type_name in ("json", "jsonb"):
+        await connection.set_type_codec(
+            type_name, encoder=_encode_json, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+__all__ = ["AsyncpgDatabase", "build_count", "build_delete", "build_insert", "build_select", "build_update"]
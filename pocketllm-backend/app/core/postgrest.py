@@ -0,0 +1,317 @@
+"""Native async PostgREST backend for :mod:`app.core.database`.
+
+The default backend runs the synchronous Supabase SDK on the default thread
+pool. This one speaks PostgREST directly over a pooled
+:class:`httpx.AsyncClient`, so concurrent queries are bounded by the HTTP
+connection pool instead of the executor size.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Union
+from uuid import UUID
+
+import httpx
+
+from app.core.metrics import instrument_db_operation
+from app.utils.pagination import Keyset, keyset_filter_expression
+from app.utils.serializers import serialize_dates_for_json
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from app.core.config import Settings
+else:  # pragma: no cover - fallback for runtime without config dependency
+    Settings = Any  # type: ignore[misc,assignment]
+
+logger = logging.getLogger(__name__)
+
+_RETURN_REPRESENTATION = "return=representation"
+
+
+class PostgRESTError(RuntimeError):
+    """Raised when PostgREST answers with an error status."""
+
+    def __init__(self, message: str, *, status_code: int, code: str | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+class PostgRESTDatabase:
+    """Async database backend exposing the same interface as ``Database``."""
+
+    def __init__(
+        self,
+        settings: "Settings",
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._settings = settings
+        self._transport = transport
+        self._base_url = f"{str(settings.supabase_url).rstrip('/')}/rest/v1"
+        self._client: httpx.AsyncClient | None = None
+        self._connection_verified = _env_flag_enabled("SUPABASE_SKIP_CONNECTION_TEST")
+
+    # ------------------------------------------------------------------
+    # Lifecycle management
+    # ------------------------------------------------------------------
+    async def connect(self) -> None:
+        """Open the HTTP pool and validate connectivity once per process."""
+
+        client = self._get_client()
+        if self._connection_verified:
+            return
+        response = await client.get("/profiles", params={"select": "id", "limit": "1"})
+        _raise_for_error(response, "profiles")
+        self._connection_verified = True
+        logger.info("✅ VERIFIED: PostgREST connection established")
+
+    async def disconnect(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator["PostgRESTDatabase"]:
+        await self.connect()
+        yield self
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["PostgRESTDatabase"]:
+        """Each PostgREST request runs in its own server-side transaction."""
+
+        await self.connect()
+        yield self
+
+    # ------------------------------------------------------------------
+    # Profile helpers
+    # ------------------------------------------------------------------
+    async def get_profile(self, user_id: UUID | str) -> Optional[Dict[str, Any]]:
+        records = await self.select("profiles", filters={"id": str(user_id)}, limit=1)
+        return records[0] if records else None
+
+    async def upsert_profile(self, user_id: UUID | str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        data = {"id": str(user_id), **payload, "updated_at": datetime.now(tz=UTC)}
+        records = await self.upsert("profiles", data, on_conflict="id")
+        return records[0]
+
+    async def update_profile(self, user_id: UUID | str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        data = {**payload, "updated_at": datetime.now(tz=UTC)}
+        records = await self.update("profiles", data, filters={"id": str(user_id)})
+        return records[0] if records else None
+
+    # ------------------------------------------------------------------
+    # Generic CRUD helpers
+    # ------------------------------------------------------------------
+    @instrument_db_operation("select")
+    async def select(
+        self,
+        table: str,
+        *,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[Iterable[Any]] = None,
+        keyset: Optional[Keyset] = None,
+    ) -> List[Dict[str, Any]]:
+        params = [("select", columns), *_filter_params(filters)]
+        if keyset is not None:
+            params.append(("or", f"({keyset_filter_expression(keyset)})"))
+        order = _order_param(order_by)
+        if order:
+            params.append(("order", order))
+        if limit is not None:
+            params.append(("limit", str(limit)))
+        return await self._request("GET", table, params=params)
+
+    @instrument_db_operation("count")
+    async def count(self, table: str, *, filters: Optional[Dict[str, Any]] = None) -> int:
+        response = await self._get_client().head(
+            f"/{table}",
+            params=[("select", "id"), *_filter_params(filters)],
+            headers={"Prefer": "count=exact"},
+        )
+        _raise_for_error(response, table)
+        # Content-Range is "0-24/25", or "*/0" when nothing matches.
+        total = response.headers.get("content-range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else 0
+
+    @instrument_db_operation("insert")
+    async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        records = await self._write("POST", table, data)
+        if not records:
+            raise RuntimeError(f"Insert into {table} returned no data")
+        return records[0]
+
+    @instrument_db_operation("insert_many")
+    async def insert_many(self, table: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._write("POST", table, data)
+
+    @instrument_db_operation("update")
+    async def update(self, table: str, data: Dict[str, Any], *, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return await self._write("PATCH", table, data, params=_filter_params(filters))
+
+    @instrument_db_operation("upsert")
+    async def upsert(
+        self,
+        table: str,
+        data: Union[Dict[str, Any], List[Dict[str, Any]]],
+        *,
+        on_conflict: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        params = [("on_conflict", on_conflict)] if on_conflict else []
+        records = await self._write(
+            "POST",
+            table,
+            data,
+            params=params,
+            prefer=f"resolution=merge-duplicates,{_RETURN_REPRESENTATION}",
+        )
+        if not records:
+            raise RuntimeError(f"Upsert operation failed for {table}")
+        return records
+
+    @instrument_db_operation("delete")
+    async def delete(self, table: str, *, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return await self._request(
+            "DELETE",
+            table,
+            params=_filter_params(filters),
+            headers={"Prefer": _RETURN_REPRESENTATION},
+        )
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            settings = self._settings
+            key = settings.supabase_service_role_key
+            schema = getattr(settings, "supabase_schema", "public")
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers={
+                    "apikey": key,
+                    "Authorization": f"Bearer {key}",
+                    "Accept-Profile": schema,
+                    "Content-Profile": schema,
+                },
+                limits=httpx.Limits(
+                    max_connections=int(getattr(settings, "database_rest_max_connections", 100)),
+                    max_keepalive_connections=int(
+                        getattr(settings, "database_rest_max_keepalive_connections", 20)
+                    ),
+                ),
+                timeout=float(getattr(settings, "database_rest_timeout", 30.0)),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def _write(
+        self,
+        method: str,
+        table: str,
+        data: Any,
+        *,
+        params: list[tuple[str, str]] | None = None,
+        prefer: str = _RETURN_REPRESENTATION,
+    ) -> List[Dict[str, Any]]:
+        body = json.dumps(serialize_dates_for_json(data), default=str)
+        return await self._request(
+            method,
+            table,
+            params=params,
+            content=body,
+            headers={"Content-Type": "application/json", "Prefer": prefer},
+        )
+
+    async def _request(
+        self,
+        method: str,
+        table: str,
+        *,
+        params: list[tuple[str, str]] | None = None,
+        content: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> List[Dict[str, Any]]:
+        response = await self._get_client().request(
+            method, f"/{table}", params=params, content=content, headers=headers
+        )
+        _raise_for_error(response, table)
+        if not response.content:
+            return []
+        payload = response.json()
+        return payload if isinstance(payload, list) else [payload]
+
+
+def _raise_for_error(response: httpx.Response, table: str) -> None:
+    if response.is_success:
+        return
+    try:
+        detail = response.json()
+    except ValueError:
+        detail = {"message": response.text}
+    message = detail.get("message") if isinstance(detail, dict) else None
+    code = detail.get("code") if isinstance(detail, dict) else None
+    logger.error("❌ PostgREST %s on %s failed: %s", response.request.method, table, message)
+    raise PostgRESTError(
+        message or f"PostgREST request for {table} failed with status {response.status_code}",
+        status_code=response.status_code,
+        code=code,
+    )
+
+
+def _filter_params(filters: Optional[Dict[str, Any]]) -> list[tuple[str, str]]:
+    if not filters:
+        return []
+    return [(key, f"eq.{_filter_value(value)}") for key, value in filters.items()]
+
+
+def _filter_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    serialised = serialize_dates_for_json(value)
+    return str(serialised)
+
+
+def normalise_order(order_by: Optional[Iterable[Any]]) -> list[tuple[str, bool]]:
+    """Return ``(column, descending)`` pairs for the ``order_by`` forms services pass."""
+
+    if not order_by:
+        return []
+    entries = (order_by,) if isinstance(order_by, (str, tuple, dict)) else order_by
+    normalised: list[tuple[str, bool]] = []
+    for entry in entries:
+        if isinstance(entry, tuple):
+            column, descending = str(entry[0]), bool(entry[1])
+        elif isinstance(entry, dict):
+            column = str(entry.get("column") or "")
+            descending = not bool(entry.get("ascending", True))
+        else:
+            token = str(entry).replace(":", ".")
+            column, _, direction = token.rpartition(".")
+            if direction.lower() not in {"asc", "desc"}:
+                column, direction = token, "asc"
+            descending = direction.lower() == "desc"
+        if column:
+            normalised.append((column, descending))
+    return normalised
+
+
+def _order_param(order_by: Optional[Iterable[Any]]) -> str | None:
+    tokens = [
+        f"{column}.{'desc' if descending else 'asc'}"
+        for column, descending in normalise_order(order_by)
+    ]
+    return ",".join(tokens) or None
+
+
+def _env_flag_enabled(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+__all__ = ["PostgRESTDatabase", "PostgRESTError", "normalise_order"]
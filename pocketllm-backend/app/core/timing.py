@@ -0,0 +1,149 @@
+"""Request-scoped timing breakdown reported through ``Server-Timing``.
+
+Collection is off unless ``SERVER_TIMING_ENABLED`` is set or a request
+presents ``SERVER_TIMING_TOKEN`` in its ``X-Server-Timing`` header. When it is
+off no collector exists and every instrumentation point costs a single
+``ContextVar.get``.
+"""
+
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from typing import Any
+
+import httpx
+
+REQUEST_HEADER = b"x-server-timing"
+
+# Categories, in the order they appear in the header.
+_CATEGORIES = ("auth", "db", "provider", "decrypt")
+
+
+class RequestTimings:
+    """Spans recorded while serving one request."""
+
+    __slots__ = ("request_id", "started", "spans")
+
+    def __init__(self, request_id: str | None = None) -> None:
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.spans: list[tuple[str, str, float, float]] = []
+
+    def record(self, category: str, name: str, duration: float) -> None:
+        """Add a span of ``duration`` seconds that ended now."""
+
+        offset = time.perf_counter() - self.started - duration
+        self.spans.append((category, name, offset, duration))
+
+    def server_timing(self) -> str:
+        """Summarise the spans per category as a ``Server-Timing`` value."""
+
+        totals: dict[str, list[float]] = {}
+        for category, _name, _offset, duration in self.spans:
+            entry = totals.setdefault(category, [0.0, 0])
+            entry[0] += duration
+            entry[1] += 1
+        ordered = [c for c in _CATEGORIES if c in totals] + sorted(set(totals) - set(_CATEGORIES))
+        parts = [
+            f'{category};dur={totals[category][0] * 1000:.1f};desc="{totals[category][1]} calls"'
+            for category in ordered
+        ]
+        parts.append(f"app;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "spans": [
+                {
+                    "category": category,
+                    "name": name,
+                    "start_ms": round(offset * 1000, 2),
+                    "duration_ms": round(duration * 1000, 2),
+                }
+                for category, name, offset, duration in self.spans
+            ],
+        }
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings(request_id: str | None) -> tuple[RequestTimings, Any]:
+    """Install a collector for the current request; returns it and a reset token."""
+
+    timings = RequestTimings(request_id)
+    return timings, _current.set(timings)
+
+
+def finish_request_timings(token: Any) -> None:
+    _current.reset(token)
+
+
+def current_timings() -> RequestTimings | None:
+    """Return the collector of the request being served, if timing is on."""
+
+    return _current.get()
+
+
+def record_timing(category: str, name: str, duration: float) -> None:
+    """Record a span measured by the caller; a no-op when timing is off."""
+
+    timings = _current.get()
+    if timings is not None:
+        timings.record(category, name, duration)
+
+
+class timed:
+    """Context manager recording the enclosed block as a span."""
+
+    __slots__ = ("_category", "_name", "_timings", "_started")
+
+    def __init__(self, category: str, name: str) -> None:
+        self._category = category
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._timings = _current.get()
+        if self._timings is not None:
+            self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._timings is not None:
+            self._timings.record(self._category, self._name, time.perf_counter() - self._started)
+
+
+async def _on_provider_request(request: httpx.Request) -> None:
+    if _current.get() is not None:
+        request.extensions["pocketllm_started"] = time.perf_counter()
+
+
+async def _on_provider_response(response: httpx.Response) -> None:
+    started = response.request.extensions.get("pocketllm_started")
+    if started is not None:
+        record_timing(
+            "provider",
+            f"{response.request.method} {response.request.url.host}",
+            time.perf_counter() - started,
+        )
+
+
+# Attach to provider HTTP clients: spans end when the response headers arrive.
+HTTPX_EVENT_HOOKS: dict[str, list[Any]] = {
+    "request": [_on_provider_request],
+    "response": [_on_provider_response],
+}
+
+
+__all__ = [
+    "HTTPX_EVENT_HOOKS",
+    "REQUEST_HEADER",
+    "RequestTimings",
+    "current_timings",
+    "finish_request_timings",
+    "record_timing",
+    "start_request_timings",
+    "timed",
+]
@@ -5,23 +5,32 @@ ZERO fallbacks, ZERO alternatives, ZERO local storage.
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import socket
+import threading
 import traceback
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
-from postgrest.exceptions import APIError
-from supabase import Client, create_client
 
+from app.core.logging import SAMPLED, lazy_json
+from app.utils.pagination import Keyset, keyset_filter_expression
 from app.utils.serializers import serialize_dates_for_json
 
+if TYPE_CHECKING:  # pragma: no cover - the SDK is imported on first use
+    from supabase import Client
+
 logger = logging.getLogger(__name__)
 
+# Guards lazy client creation and the one-off connectivity check.
+_client_lock = threading.RLock()
+
+# Success-path records that ``DB_LOG_SAMPLE_RATE`` may drop.
+_SAMPLED = {SAMPLED: True}
+
 # Load environment variables from a `.env` file if present so that runtime
 # processes (including the development server reloader) have access to the
 # Supabase credentials before the singleton initialises.
@@ -54,68 +63,92 @@ class SupabaseDatabase:
         self._initialised = True
         self._connection_meta: Dict[str, Any] = {}
         self._connection_verified = False
+        self._connection_checked = False
         self._allow_unverified_connection = False
         self._last_connection_error: Optional[Dict[str, Any]] = None
-        self._setup_connection()
 
     # ------------------------------------------------------------------
     # Connection management
     # ------------------------------------------------------------------
-    def _setup_connection(self) -> None:
-        """Initialise the client using ONLY the official Supabase SDK."""
+    def _setup_connection(self) -> Client:
+        """Initialise the client using ONLY the official Supabase SDK.
 
-        try:
-            url = os.getenv("DATABASE_URL") or os.getenv("SUPABASE_URL")
-            service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_SERVICE_ROLE")
-            public_key = os.getenv("SUPABASE_PUBLIC_KEY") or os.getenv("SUPABASE_ANON_KEY")
-            key = service_key or public_key
-            skip_connection_test = _env_flag_enabled("SUPABASE_SKIP_CONNECTION_TEST")
-            strict_startup = _env_flag_enabled("SUPABASE_STRICT_STARTUP")
-
-            if not url or not key:
-                logger.critical("❌ FATAL: Missing Supabase credentials - APPLICATION CANNOT START")
-                raise ValueError(
-                    "CRITICAL: Missing Supabase credentials. "
-                    "DATABASE_URL and a Supabase key are REQUIRED. "
-                    "Provide SUPABASE_SERVICE_ROLE_KEY (preferred) or SUPABASE_PUBLIC_KEY. "
-                    "NO fallback options available."
-                )
+        Called on first access to :attr:`client`, so importing this module
+        neither loads the SDK nor touches the network.
+        """
 
-            self._connection_meta = _summarise_connection_target(url, bool(service_key))
-            logger.debug("🔧 Supabase client target: %s", json.dumps(self._connection_meta))
+        with _client_lock:
+            if self._client is not None:
+                return self._client
+            try:
+                url = os.getenv("DATABASE_URL") or os.getenv("SUPABASE_URL")
+                service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_SERVICE_ROLE")
+                public_key = os.getenv("SUPABASE_PUBLIC_KEY") or os.getenv("SUPABASE_ANON_KEY")
+                key = service_key or public_key
+
+                if not url or not key:
+                    logger.critical("❌ FATAL: Missing Supabase credentials - APPLICATION CANNOT START")
+                    raise ValueError(
+                        "CRITICAL: Missing Supabase credentials. "
+                        "DATABASE_URL and a Supabase key are REQUIRED. "
+                        "Provide SUPABASE_SERVICE_ROLE_KEY (preferred) or SUPABASE_PUBLIC_KEY. "
+                        "NO fallback options available."
+                    )
 
-            self._client = create_client(url, key)
+                self._connection_meta = _summarise_connection_target(url, bool(service_key))
+                logger.debug("🔧 Supabase client target: %s", lazy_json(self._connection_meta))
 
-            if service_key:
-                logger.info("✅ USING SERVICE-ROLE Supabase credentials for SDK client")
+                from supabase import create_client
 
-            if skip_connection_test:
-                logger.warning(
-                    "⚠️ Skipping Supabase connectivity test because SUPABASE_SKIP_CONNECTION_TEST is enabled."
-                )
-                self._connection_verified = True
-            elif not self._test_connection():
-                message = _build_connection_failure_message(self._connection_meta, self._last_connection_error)
-                if strict_startup:
-                    logger.critical("❌ FATAL: %s", message)
-                    raise ConnectionError(message)
-
-                logger.warning(
-                    "⚠️ Supabase connection test failed but continuing because SUPABASE_STRICT_STARTUP is disabled."
-                )
-                self._allow_unverified_connection = True
-            
+                self._client = create_client(url, key)
+
+                if service_key:
+                    logger.info("✅ USING SERVICE-ROLE Supabase credentials for SDK client")
+                return self._client
+            except Exception as exc:  # pragma: no cover - critical path
+                logger.critical("❌ FATAL: Supabase client initialisation failed: %s", exc)
+                raise
+
+    def connect(self) -> None:
+        """Create the client and run the startup connectivity check once.
+
+        ``SUPABASE_SKIP_CONNECTION_TEST`` skips the query and
+        ``SUPABASE_STRICT_STARTUP`` turns a failed check into a
+        :class:`ConnectionError`; otherwise the client is kept unverified.
+        """
+
+        with _client_lock:
+            if self._connection_checked:
+                return
+            self.client
+            try:
+                if _env_flag_enabled("SUPABASE_SKIP_CONNECTION_TEST"):
+                    logger.warning(
+                        "⚠️ Skipping Supabase connectivity test because SUPABASE_SKIP_CONNECTION_TEST is enabled."
+                    )
+                    self._connection_verified = True
+                elif not self._test_connection():
+                    message = _build_connection_failure_message(self._connection_meta, self._last_connection_error)
+                    if _env_flag_enabled("SUPABASE_STRICT_STARTUP"):
+                        logger.critical("❌ FATAL: %s", message)
+                        raise ConnectionError(message)
+
+                    logger.warning(
+                        "⚠️ Supabase connection test failed but continuing because SUPABASE_STRICT_STARTUP is disabled."
+                    )
+                    self._allow_unverified_connection = True
+            except Exception as exc:  # pragma: no cover - critical path
+                logger.critical("❌ FATAL: Supabase connection failed: %s", exc)
+                logger.critical("🚨 NO FALLBACK OPTIONS - APPLICATION MUST NOT START")
+                raise
+
+            self._connection_checked = True
             if self._connection_verified:
                 logger.info("✅ VERIFIED: Official Supabase SDK connection established")
-                logger.debug("✅ Supabase connectivity verified at startup")
             else:
                 logger.info(
                     "⚠️ Supabase SDK client initialised without a verified connection; operations may fail until connectivity is restored."
                 )
-        except Exception as exc:  # pragma: no cover - critical path
-            logger.critical("❌ FATAL: Supabase connection failed: %s", exc)
-            logger.critical("🚨 NO FALLBACK OPTIONS - APPLICATION MUST NOT START")
-            raise
 
     def _test_connection(self) -> bool:
         """Perform a lightweight query to validate connectivity."""
@@ -131,15 +164,15 @@ class SupabaseDatabase:
             self._connection_verified = False
             self._last_connection_error = diagnostics
             logger.error("❌ Connection test failed: %s", diagnostics["message"])
-            logger.debug("📋 Supabase diagnostics: %s", json.dumps(diagnostics))
+            logger.debug("📋 Supabase diagnostics: %s", lazy_json(diagnostics))
             return False
 
     @property
     def client(self) -> Client:
-        if self._client is None:
-            logger.critical("❌ FATAL: No Supabase client available")
-            raise RuntimeError("No Supabase client - application cannot continue")
-        return self._client
+        client = self._client
+        if client is None:
+            client = self._setup_connection()
+        return client
 
     # ------------------------------------------------------------------
     # Logging helpers
@@ -149,24 +182,33 @@ class SupabaseDatabase:
         operation: str,
         table: str,
         *,
+        rows: Optional[int] = None,
         data: Any = None,
         filters: Optional[Dict[str, Any]] = None,
     ) -> None:
-        log_data = {
-            "operation": operation,
-            "table": table,
-            "timestamp": datetime.utcnow().isoformat(),
-            "has_data": data is not None,
-            "has_filters": filters is not None,
-        }
-        logger.info("🔄 DB_OPERATION: %s", json.dumps(log_data))
+        """Log one completed operation; formatted only if the record is written."""
+
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(
+            "✅ DB_OPERATION: %s on %s (%s rows)",
+            operation,
+            table,
+            rows,
+            extra={
+                "operation": operation,
+                "table": table,
+                "rows": rows,
+                "has_data": data is not None,
+                "has_filters": filters is not None,
+                **_SAMPLED,
+            },
+        )
 
     # ------------------------------------------------------------------
     # Profile helpers
     # ------------------------------------------------------------------
     def upsert_profile(self, user_id: str, profile_data: Dict[str, Any]) -> Dict[str, Any]:
-        self._log_operation("upsert_profile", "profiles", data=profile_data, filters={"user_id": user_id})
-
         try:
             payload = {
                 "id": user_id,
@@ -186,7 +228,7 @@ class SupabaseDatabase:
 
             record = result.data[0]
             self._verify_persistence("profiles", record.get("id", user_id))
-            logger.info("✅ VERIFIED: Profile persisted to Supabase for user %s", user_id)
+            self._log_operation("upsert_profile", "profiles", rows=1, data=profile_data)
             return record
         except Exception as exc:
             logger.critical("❌ CRITICAL: Profile upsert failed for user %s: %s", user_id, exc)
@@ -194,8 +236,6 @@ class SupabaseDatabase:
             raise
 
     def get_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
-        self._log_operation("get_profile", "profiles", filters={"user_id": user_id})
-
         try:
             result = (
                 self.client
@@ -205,21 +245,21 @@ class SupabaseDatabase:
                 .single()
                 .execute()
             )
-            logger.info("✅ Profile retrieved from Supabase for user %s", user_id)
+            self._log_operation("get_profile", "profiles", rows=1 if result.data else 0)
             return result.data if result.data else None
-        except APIError as exc:
-            if "PGRST116" in str(exc):
-                logger.info("ℹ️ No profile found in Supabase for user %s", user_id)
-                return None
-            logger.error("❌ Error retrieving profile for user %s: %s", user_id, exc)
-            raise
         except Exception as exc:
+            from postgrest.exceptions import APIError
+
+            if isinstance(exc, APIError):
+                if "PGRST116" in str(exc):
+                    self._log_operation("get_profile", "profiles", rows=0)
+                    return None
+                logger.error("❌ Error retrieving profile for user %s: %s", user_id, exc)
+                raise
             logger.critical("❌ CRITICAL: Unexpected error retrieving profile for user %s: %s", user_id, exc)
             raise
 
     def update_profile(self, user_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        self._log_operation("update_profile", "profiles", data=updates, filters={"user_id": user_id})
-
         try:
             payload = {**updates, "updated_at": datetime.utcnow()}
             payload = self._serialise_for_supabase(payload)
@@ -230,13 +270,10 @@ class SupabaseDatabase:
                 .eq("id", user_id)
                 .execute()
             )
+            self._log_operation("update_profile", "profiles", rows=len(result.data or []), data=updates)
             if not result.data:
-                logger.info("ℹ️ No profile found to update for user %s", user_id)
                 return None
-
-            record = result.data[0]
-            logger.info("✅ Profile updated successfully for user %s", user_id)
-            return record
+            return result.data[0]
         except Exception as exc:
             logger.critical("❌ CRITICAL: Error updating profile for user %s: %s", user_id, exc)
             raise
@@ -255,7 +292,7 @@ class SupabaseDatabase:
                     "❌ CRITICAL: Data NOT persisted - %s:%s not found in Supabase", table, record_id
                 )
                 raise RuntimeError(f"Data persistence verification failed for {table}:{record_id}")
-            logger.info("✅ VERIFIED: Data persisted in Supabase - %s:%s", table, record_id)
+            logger.info("✅ VERIFIED: Data persisted in Supabase - %s:%s", table, record_id, extra=_SAMPLED)
         except Exception as exc:
             logger.critical("❌ CRITICAL: Persistence verification failed: %s", exc)
             raise
@@ -271,9 +308,8 @@ class SupabaseDatabase:
         filters: Optional[Dict[str, Any]] = None,
         limit: Optional[int] = None,
         order_by: Optional[Union[str, Sequence[Union[str, tuple[str, bool], Dict[str, Any]]]]] = None,
+        keyset: Optional[Keyset] = None,
     ) -> List[Dict[str, Any]]:
-        self._log_operation("select", table, filters=filters)
-
         try:
             serialised_filters = self._serialise_for_supabase(filters) if filters else None
 
@@ -282,6 +318,9 @@ class SupabaseDatabase:
                 for key, value in serialised_filters.items():
                     query = query.eq(key, value)
 
+            if keyset is not None:
+                query = query.or_(keyset_filter_expression(keyset))
+
             for column, descending in self._normalise_order(order_by):
                 query = query.order(column, desc=descending)
 
@@ -289,15 +328,26 @@ class SupabaseDatabase:
                 query = query.limit(limit)
 
             result = query.execute()
-            logger.info("✅ Selected %s records from %s", len(result.data or []), table)
+            self._log_operation("select", table, rows=len(result.data or []), filters=filters)
             return result.data or []
         except Exception as exc:
             logger.critical("❌ CRITICAL: Select failed for %s: %s", table, exc)
             raise
 
-    def insert(self, table: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
-        self._log_operation("insert", table, data=data)
+    def count(self, table: str, *, filters: Optional[Dict[str, Any]] = None) -> int:
+        try:
+            query = self.client.table(table).select("id", count="exact", head=True)
+            if filters:
+                for key, value in self._serialise_for_supabase(filters).items():
+                    query = query.eq(key, value)
+            result = query.execute()
+            self._log_operation("count", table, rows=int(result.count or 0), filters=filters)
+            return int(result.count or 0)
+        except Exception as exc:
+            logger.critical("❌ CRITICAL: Count failed for %s: %s", table, exc)
+            raise
 
+    def insert(self, table: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
         try:
             payload = self._serialise_for_supabase(data)
             result = self.client.table(table).insert(payload).execute()
@@ -308,7 +358,7 @@ class SupabaseDatabase:
             records = result.data
             if isinstance(payload, dict) and "id" in payload:
                 self._verify_persistence(table, payload["id"])
-            logger.info("✅ VERIFIED: Inserted %s records into %s", len(records), table)
+            self._log_operation("insert", table, rows=len(records), data=data)
             return records
         except Exception as exc:
             logger.critical("❌ CRITICAL: Insert failed for %s: %s", table, exc)
@@ -321,8 +371,6 @@ class SupabaseDatabase:
         *,
         filters: Dict[str, Any],
     ) -> List[Dict[str, Any]]:
-        self._log_operation("update", table, data=data, filters=filters)
-
         try:
             payload = self._serialise_for_supabase(data)
             serialised_filters = self._serialise_for_supabase(filters)
@@ -331,7 +379,7 @@ class SupabaseDatabase:
             for key, value in serialised_filters.items():
                 query = query.eq(key, value)
             result = query.execute()
-            logger.info("✅ Updated %s records in %s", len(result.data or []), table)
+            self._log_operation("update", table, rows=len(result.data or []), data=data, filters=filters)
             return result.data or []
         except Exception as exc:
             logger.critical("❌ CRITICAL: Update failed for %s: %s", table, exc)
@@ -344,8 +392,6 @@ class SupabaseDatabase:
         *,
         on_conflict: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        self._log_operation("upsert", table, data=data)
-
         try:
             payload = self._serialise_for_supabase(data)
             upsert_kwargs: Dict[str, Any] = {}
@@ -373,15 +419,13 @@ class SupabaseDatabase:
             if not result.data:
                 logger.critical("❌ CRITICAL: Upsert failed for %s - no data returned", table)
                 raise RuntimeError(f"Upsert operation failed for {table}")
-            logger.info("✅ VERIFIED: Upserted %s records in %s", len(result.data), table)
+            self._log_operation("upsert", table, rows=len(result.data), data=data)
             return result.data
         except Exception as exc:
             logger.critical("❌ CRITICAL: Upsert failed for %s: %s", table, exc)
             raise
 
     def delete(self, table: str, *, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        self._log_operation("delete", table, filters=filters)
-
         try:
             serialised_filters = self._serialise_for_supabase(filters)
 
@@ -389,7 +433,7 @@ class SupabaseDatabase:
             for key, value in serialised_filters.items():
                 query = query.eq(key, value)
             result = query.delete().execute()
-            logger.info("✅ Deleted records from %s", table)
+            self._log_operation("delete", table, rows=len(result.data or []), filters=filters)
             return result.data or []
         except Exception as exc:
             logger.critical("❌ CRITICAL: Delete failed for %s: %s", table, exc)
@@ -500,6 +544,7 @@ def _build_connection_failure_message(
     return base_message
 
 
+# Cheap to construct: the SDK client is created on first use.
 db = SupabaseDatabase()
 
 __all__ = ["SupabaseDatabase", "db"]
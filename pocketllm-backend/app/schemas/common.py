@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
 
+ItemT = TypeVar("ItemT")
+
 
 class HealthResponse(BaseModel):
     """Health check payload."""
@@ -25,4 +27,13 @@ class PaginatedResponse(BaseModel):
     offset: int
 
 
-__all__ = ["HealthResponse", "PaginatedResponse"]
+class CursorPage(BaseModel, Generic[ItemT]):
+    """Keyset pagination envelope with opaque cursors."""
+
+    items: list[ItemT]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    limit: int
+
+
+__all__ = ["CursorPage", "HealthResponse", "PaginatedResponse"]
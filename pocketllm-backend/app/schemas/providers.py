@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 from collections.abc import Mapping
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, model_validator
@@ -110,6 +110,19 @@ class ProviderStatus(BaseModel):
     message: str
 
 
+class ProviderCatalogueStatus(BaseModel):
+    """Outcome of fetching one provider's catalogue for a models listing.
+
+    ``stale`` models come from an expired cache entry (the provider is being
+    refetched or just failed); ``timeout`` means the provider had not answered
+    by the listing's deadline and contributed no models.
+    """
+
+    provider: str
+    status: Literal["ok", "stale", "error", "timeout"]
+    model_count: int = 0
+
+
 class ProviderModelsResponse(BaseModel):
     """Envelope returned when listing models from configured providers."""
 
@@ -118,6 +131,8 @@ class ProviderModelsResponse(BaseModel):
     configured_providers: list[str] = Field(default_factory=list)
     missing_providers: list[str] = Field(default_factory=list)
     using_fallback: bool = False
+    provider_status: list[ProviderCatalogueStatus] = Field(default_factory=list)
+    partial: bool = False
 
 
 __all__ = [
@@ -127,5 +142,6 @@ __all__ = [
     "ProviderUpdateRequest",
     "ProviderActivationResponse",
     "ProviderStatus",
+    "ProviderCatalogueStatus",
     "ProviderModelsResponse",
 ]
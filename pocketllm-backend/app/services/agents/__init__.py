@@ -1,13 +1,27 @@
-"""Agent service package."""
+"""Agent service package.
 
-from .base import AgentContext, AgentMetadata, AgentRunResult, BaseConversationalAgent
-from .code import CodeAgent
-from .image import ImageAgent
-from .memory import AgentMemoryStore
-from .prompt_enhancer import PromptEnhancerAgent
-from .registry import AgentRegistry, build_agent_registry
-from .retrieval import RetrievalAgent
-from .workflow import WorkflowAgent
+The agents depend on LangChain, LangGraph and the Groq SDK, which take most
+of a second to import. Exports are therefore resolved on first attribute
+access, and request handlers call :func:`load_agent_stack` so that the
+import runs on a worker thread instead of blocking the event loop. Set
+``AGENTS_PRELOAD=true`` to load the stack during application startup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from .base import AgentContext, AgentMetadata, AgentRunResult, BaseConversationalAgent
+    from .code import CodeAgent
+    from .image import ImageAgent
+    from .memory import AgentMemoryStore, bind_agent_database
+    from .prompt_enhancer import PromptEnhancerAgent
+    from .registry import AgentRegistry, build_agent_registry, get_agent_registry
+    from .retrieval import RetrievalAgent
+    from .workflow import WorkflowAgent
 
 __all__ = [
     "AgentContext",
@@ -21,5 +35,55 @@ __all__ = [
     "ImageAgent",
     "WorkflowAgent",
     "AgentRegistry",
+    "bind_agent_database",
     "build_agent_registry",
+    "get_agent_registry",
+    "load_agent_stack",
+    "preload_agent_stack",
 ]
+
+
+_ATTR_TO_MODULE = {
+    "AgentContext": "app.services.agents.base",
+    "AgentMetadata": "app.services.agents.base",
+    "AgentRunResult": "app.services.agents.base",
+    "BaseConversationalAgent": "app.services.agents.base",
+    "CodeAgent": "app.services.agents.code",
+    "ImageAgent": "app.services.agents.image",
+    "AgentMemoryStore": "app.services.agents.memory",
+    "bind_agent_database": "app.services.agents.memory",
+    "PromptEnhancerAgent": "app.services.agents.prompt_enhancer",
+    "AgentRegistry": "app.services.agents.registry",
+    "build_agent_registry": "app.services.agents.registry",
+    "get_agent_registry": "app.services.agents.registry",
+    "RetrievalAgent": "app.services.agents.retrieval",
+    "WorkflowAgent": "app.services.agents.workflow",
+}
+
+_stack_loaded = False
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _ATTR_TO_MODULE.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    module = import_module(module_name)
+    return getattr(module, name)
+
+
+def preload_agent_stack() -> None:
+    """Import every agent module (and with them LangChain and LangGraph)."""
+
+    global _stack_loaded
+    if _stack_loaded:
+        return
+    # The registry imports every agent implementation.
+    import_module("app.services.agents.registry")
+    _stack_loaded = True
+
+
+async def load_agent_stack() -> None:
+    """Ensure the agent stack is imported without blocking the event loop."""
+
+    if not _stack_loaded:
+        await asyncio.to_thread(preload_agent_stack)
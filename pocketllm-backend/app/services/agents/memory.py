@@ -4,26 +4,50 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
 
 from app.core.database import Database
 
 LOGGER = logging.getLogger("app.services.agents.memory")
 
+# Agents are shared across requests; the database of the run in progress is
+# bound here rather than stored on the agents.
+_bound_database: ContextVar[Database | None] = ContextVar("agent_database", default=None)
+
+
+@contextmanager
+def bind_agent_database(database: Database | None) -> Iterator[None]:
+    """Use ``database`` for agent memory within the enclosed block."""
+
+    token = _bound_database.set(database)
+    try:
+        yield
+    finally:
+        _bound_database.reset(token)
+
 
 class AgentMemoryStore:
     """Persist agent conversation state keyed by session and agent name."""
 
     _TABLE = "agent_memories"
 
-    def __init__(self, database: Database) -> None:
+    def __init__(self, database: Database | None = None) -> None:
         self._database = database
 
+    @property
+    def database(self) -> Database:
+        database = _bound_database.get() or self._database
+        if database is None:
+            raise RuntimeError("No database is bound for agent memory")
+        return database
+
     async def load(self, owner_id: str, session_id: str, agent_key: str) -> dict[str, Any]:
         """Load the serialized memory state for ``agent_key`` within ``session_id``."""
 
         filters = {"owner_id": owner_id, "session_id": session_id, "agent_key": agent_key}
-        records = await self._database.select(self._TABLE, filters=filters, limit=1)
+        records = await self.database.select(self._TABLE, filters=filters, limit=1)
         if not records:
             return {"messages": []}
         record = records[0]
@@ -53,7 +77,7 @@ class AgentMemoryStore:
             "agent_key": agent_key,
             "memory_state": state,
         }
-        await self._database.upsert(
+        await self.database.upsert(
             self._TABLE,
             payload,
             on_conflict="owner_id,session_id,agent_key",
@@ -63,7 +87,7 @@ class AgentMemoryStore:
         """Remove all stored messages for the given key."""
 
         filters = {"owner_id": owner_id, "session_id": session_id, "agent_key": agent_key}
-        await self._database.delete(self._TABLE, filters=filters)
+        await self.database.delete(self._TABLE, filters=filters)
 
 
-__all__ = ["AgentMemoryStore"]
+__all__ = ["AgentMemoryStore", "bind_agent_database"]
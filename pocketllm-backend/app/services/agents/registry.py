@@ -12,7 +12,7 @@ from app.core.database import Database
 from .base import AgentContext, AgentMetadata, AgentRunResult, BaseConversationalAgent
 from .code import CodeAgent
 from .image import ImageAgent
-from .memory import AgentMemoryStore
+from .memory import AgentMemoryStore, bind_agent_database
 from .prompt_enhancer import PromptEnhancerAgent
 from .retrieval import RetrievalAgent
 from .workflow import WorkflowAgent
@@ -21,7 +21,12 @@ LOGGER = logging.getLogger("app.services.agents.registry")
 
 
 class AgentRegistry:
-    """Holds all configured agents and exposes orchestration helpers."""
+    """Holds all configured agents and exposes orchestration helpers.
+
+    Agents keep no per-request state, so one registry (see
+    :func:`get_agent_registry`) serves every request of the process; the
+    database handle is bound for the duration of each run.
+    """
 
     def __init__(
         self,
@@ -39,6 +44,12 @@ class AgentRegistry:
     def list_agents(self) -> list[AgentMetadata]:
         return [agent.metadata for agent in self._agents.values()]
 
+    def get_agent(self, agent_name: str) -> BaseConversationalAgent:
+        agent = self._agents.get(agent_name)
+        if not agent:
+            raise KeyError(f"Agent '{agent_name}' is not registered")
+        return agent
+
     async def run_agent(
         self,
         agent_name: str,
@@ -46,16 +57,36 @@ class AgentRegistry:
         *,
         prompt: str,
         task: str | None = None,
+        database: Database | None = None,
     ) -> AgentRunResult:
-        agent = self._agents.get(agent_name)
-        if not agent:
-            raise KeyError(f"Agent '{agent_name}' is not registered")
+        agent = self.get_agent(agent_name)
         LOGGER.debug("Running agent %s for session %s", agent_name, context.session_id)
-        return await agent.run(context, prompt=prompt, task=task)
+        with bind_agent_database(database):
+            return await agent.run(context, prompt=prompt, task=task)
+
+
+_registry: AgentRegistry | None = None
+
+
+def get_agent_registry(settings: Settings | None = None) -> AgentRegistry:
+    """Return the process-wide registry, building it on first use."""
+
+    global _registry
+    if _registry is None:
+        if settings is None:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+        _registry = build_agent_registry(settings)
+    return _registry
+
 
+def build_agent_registry(settings: Settings, database: Database | None = None) -> AgentRegistry:
+    """Instantiate all agents sharing a common memory store.
 
-def build_agent_registry(settings: Settings, database: Database) -> AgentRegistry:
-    """Instantiate all agents sharing a common memory store."""
+    Without ``database`` the memory store uses the one bound by
+    :meth:`AgentRegistry.run_agent` or :func:`bind_agent_database`.
+    """
 
     memory_store = AgentMemoryStore(database)
     prompt_agent = PromptEnhancerAgent(settings, memory_store)
@@ -111,4 +142,4 @@ def _discover_langchain_components(settings: Settings) -> dict[str, list[str]]:
     return discovered
 
 
-__all__ = ["AgentRegistry", "build_agent_registry"]
+__all__ = ["AgentRegistry", "build_agent_registry", "get_agent_registry"]
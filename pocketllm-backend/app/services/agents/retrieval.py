@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from contextvars import ContextVar
 from typing import Any, Iterable, Optional
 
 from langchain_classic.chains import RetrievalQA
@@ -18,6 +19,9 @@ from .memory import AgentMemoryStore
 
 LOGGER = logging.getLogger("app.services.agents.retrieval")
 
+# (owner_id, session_id) of the run in progress; the retriever is shared.
+_retrieval_session: ContextVar[tuple[str, str] | None] = ContextVar("retrieval_session", default=None)
+
 
 class _SessionMemoryRetriever(BaseRetriever):
     """Retriever that sources context from persisted agent memory."""
@@ -26,15 +30,15 @@ class _SessionMemoryRetriever(BaseRetriever):
         super().__init__()
         self._memory_store = memory_store
         self._agent_key = agent_key
-        self.session_id: str | None = None
-        self.owner_id: str | None = None
 
     async def _aget_relevant_documents(
         self, query: str, *, run_manager: Optional[AsyncCallbackManagerForRetrieverRun] = None
     ) -> list[Document]:
-        if not self.session_id or not self.owner_id:
+        session = _retrieval_session.get()
+        if session is None:
             raise RuntimeError("Session and owner identifiers must be set before calling the retriever")
-        state = await self._memory_store.load(self.owner_id, self.session_id, self._agent_key)
+        owner_id, session_id = session
+        state = await self._memory_store.load(owner_id, session_id, self._agent_key)
         corpus: Iterable[str] = state.get("knowledge_base", []) or []
         if not corpus:
             corpus = ["No prior knowledge is stored for this session. Respond based on the query context only."]
@@ -82,7 +86,7 @@ class _DeterministicLLM(LLM):
         run_manager: AsyncCallbackManagerForLLMRun | None = None,
         **kwargs: Any,
     ) -> str:
-        return await self._acall(prompt, stop=stop, run_manager=run_manager, **kwargs)
+        return self._call(prompt, stop=stop, **kwargs)
 
     def _generate(
         self,
@@ -108,13 +112,15 @@ class RetrievalAgent(BaseConversationalAgent):
         )
         self._retriever = _SessionMemoryRetriever(memory_store, self._name)
         self._llm = _DeterministicLLM()
+        self._chain = RetrievalQA.from_chain_type(llm=self._llm, retriever=self._retriever, chain_type="stuff")
 
     async def run(self, context: AgentContext, *, prompt: str, **_: Any) -> AgentRunResult:
         memory = await self._load_history(context)
-        self._retriever.session_id = context.session_id
-        self._retriever.owner_id = context.user_id
-        chain = RetrievalQA.from_chain_type(llm=self._llm, retriever=self._retriever, chain_type="stuff")
-        response = await chain.acall({"query": prompt})
+        token = _retrieval_session.set((context.user_id, context.session_id))
+        try:
+            response = await self._chain.acall({"query": prompt})
+        finally:
+            _retrieval_session.reset(token)
         answer = response.get("result") or response.get("output_text") or ""
         sources = response.get("source_documents", [])
 
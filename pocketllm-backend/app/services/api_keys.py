@@ -9,6 +9,7 @@ import httpx
 from openai import AsyncOpenAI, OpenAIError
 
 from app.core.config import Settings
+from app.core.http_clients import ProviderHTTPClientRegistry, get_http_client_registry
 
 
 _GROQ_IMPORT_ERROR: Exception | None = None
@@ -29,8 +30,20 @@ logger = logging.getLogger(__name__)
 class APIKeyValidationService:
     """Validate provider API keys using their official SDKs when available."""
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        http_clients: ProviderHTTPClientRegistry | None = None,
+    ) -> None:
         self._settings = settings
+        self._http_clients = http_clients
+
+    @property
+    def http_clients(self) -> ProviderHTTPClientRegistry:
+        """Return the pooled HTTP clients shared with the rest of the process."""
+
+        return self._http_clients or get_http_client_registry(self._settings)
 
     async def validate(
         self,
@@ -56,13 +69,17 @@ class APIKeyValidationService:
         raise ValueError(f"Unsupported provider '{provider}'.")
 
     async def _validate_openai(self, api_key: str, base_url: str | None) -> None:
-        client = AsyncOpenAI(api_key=api_key, base_url=base_url or "https://api.openai.com/v1")
+        resolved_base_url = base_url or "https://api.openai.com/v1"
+        # The SDK borrows the pooled HTTP client, so it must not be closed here.
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=resolved_base_url,
+            http_client=self.http_clients.get_client(resolved_base_url),
+        )
         try:
             await client.models.list()
         except OpenAIError as exc:  # pragma: no cover - depends on SDK runtime
             raise ValueError(f"OpenAI API key validation failed: {exc}") from exc
-        finally:
-            await _close_client(client)
 
     async def _validate_groq(
         self,
@@ -87,13 +104,14 @@ class APIKeyValidationService:
         retries = _coerce_non_negative_int(metadata.get("max_retries")) if metadata else None
         if retries is not None:
             kwargs["max_retries"] = retries
+        kwargs["http_client"] = self.http_clients.get_client(
+            sdk_base_url or "https://api.groq.com"
+        )
         client = AsyncGroq(**kwargs)
         try:
             await client.models.list()
         except GroqAPIError as exc:  # pragma: no cover
             raise ValueError(f"Groq API key validation failed: {exc}") from exc
-        finally:
-            await _close_client(client)
 
     async def _validate_groq_via_http(
         self,
@@ -107,8 +125,8 @@ class APIKeyValidationService:
         url = _join_url_path(http_base_url, "models")
         headers = {"Authorization": f"Bearer {api_key}", "Accept": "application/json"}
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(url, headers=headers)
+            client = self.http_clients.get_client(url)
+            response = await client.get(url, headers=headers, timeout=timeout)
         except httpx.HTTPError as exc:
             raise ValueError(f"Groq API key validation failed: {exc}") from exc
         if response.status_code != 200:
@@ -123,9 +141,11 @@ class APIKeyValidationService:
         base_url: str | None,
         metadata: Mapping[str, Any] | None,
     ) -> None:
+        resolved_base_url = base_url or "https://openrouter.ai/api/v1"
         kwargs: dict[str, Any] = {
             "api_key": api_key,
-            "base_url": base_url or "https://openrouter.ai/api/v1",
+            "base_url": resolved_base_url,
+            "http_client": self.http_clients.get_client(resolved_base_url),
         }
         headers = self._build_openrouter_headers(metadata)
         if headers:
@@ -141,8 +161,6 @@ class APIKeyValidationService:
             await client.models.list()
         except OpenAIError as exc:  # pragma: no cover - depends on SDK runtime
             raise ValueError(f"OpenRouter API key validation failed: {exc}") from exc
-        finally:
-            await _close_client(client)
 
     async def _validate_imagerouter(
         self,
@@ -162,8 +180,8 @@ class APIKeyValidationService:
         headers = {"Authorization": f"Bearer {api_key}", "Accept": "application/json"}
         if metadata and isinstance(metadata.get("headers"), Mapping):
             headers.update({str(k): str(v) for k, v in metadata["headers"].items()})
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, headers=headers)
+        client = self.http_clients.get_client(url)
+        response = await client.get(url, headers=headers, timeout=10.0)
         if response.status_code != 200:
             raise ValueError(
                 f"ImageRouter API key validation failed with status {response.status_code}: {response.text.strip()}"
@@ -187,16 +205,6 @@ class APIKeyValidationService:
         return headers
 
 
-async def _close_client(client: Any) -> None:
-    for attr in ("aclose", "close"):
-        closer = getattr(client, attr, None)
-        if callable(closer):
-            result = closer()
-            if hasattr(result, "__await__"):
-                await result  # type: ignore[func-returns-value]
-            return
-
-
 __all__ = ["APIKeyValidationService"]
 
 
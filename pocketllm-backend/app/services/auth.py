@@ -26,7 +26,7 @@ from app.schemas.auth import (
     SignUpRequest,
     SignUpResponse,
 )
-from app.utils.security import create_supabase_service_headers
+from app.utils.security import create_supabase_service_headers, invalidate_verified_token
 from app.services.users import UsersService
 from app.services.referrals import InviteReferralService, InviteApprovalContext
 
@@ -141,6 +141,7 @@ class AuthService:
                 )
         except httpx.HTTPError as exc:  # pragma: no cover - network failure path
             self._handle_supabase_http_error("sign_out", exc)
+        invalidate_verified_token(access_token)
         if response.status_code >= 400:
             raise HTTPException(status_code=response.status_code, detail="Failed to sign out")
 
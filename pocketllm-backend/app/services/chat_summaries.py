@@ -0,0 +1,242 @@
+"""Rolling summaries that compact the older turns of long chats."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from collections.abc import Sequence
+from typing import Any
+from uuid import UUID
+
+import httpx
+
+from app.core.http_clients import provider_http_client
+from app.schemas.chats import Message
+from app.services.context_window import estimate_message_tokens, estimate_tokens
+from app.utils.pagination import Keyset
+
+logger = logging.getLogger(__name__)
+
+_SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a user and an "
+    "assistant. Merge the existing summary with the new messages into one "
+    "updated summary. Keep facts, decisions, names, numbers, preferences and "
+    "open questions; drop pleasantries. Write plain prose in the third person."
+)
+# Individual turns are clipped before summarisation so one pasted document
+# cannot blow up the summariser's own prompt.
+_MAX_TURN_CHARS = 4000
+
+# Summaries in flight in this process, keyed by chat id. Services are built
+# per request, so the registry has to outlive them.
+_inflight: dict[str, asyncio.Task[Any]] = {}
+
+
+@dataclass(frozen=True)
+class ConversationSummary:
+    """Stored summary of a chat up to and including ``covered_message_id``."""
+
+    chat_id: str
+    summary: str
+    covered_until: datetime
+    covered_message_id: str
+    token_estimate: int
+
+    @classmethod
+    def from_mapping(cls, row: dict[str, Any]) -> "ConversationSummary":
+        summary = str(row.get("summary") or "")
+        return cls(
+            chat_id=str(row["chat_id"]),
+            summary=summary,
+            covered_until=_as_datetime(row["covered_until"]),
+            covered_message_id=str(row["covered_message_id"]),
+            token_estimate=int(row.get("token_estimate") or estimate_tokens(summary)),
+        )
+
+    def covers(self, message: Message) -> bool:
+        """Return whether ``message`` is already folded into the summary."""
+
+        return (_as_datetime(message.created_at), str(message.id)) <= (
+            self.covered_until,
+            self.covered_message_id,
+        )
+
+
+class ConversationSummarizer:
+    """Summarise older chat turns with the deployment's summary model.
+
+    Summaries are produced by :meth:`schedule` on a background task so the
+    request that notices a chat has grown never waits for them.
+    """
+
+    def __init__(
+        self,
+        database: Any,
+        settings: Any,
+        *,
+        base_url: str | None,
+        http_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._database = database
+        self._http_transport = http_transport
+        provider = str(getattr(settings, "chat_summary_provider", "openai") or "").lower()
+        self._model = getattr(settings, "chat_summary_model", None)
+        self._api_key = getattr(settings, f"{provider}_api_key", None)
+        self._base_url = base_url
+        self._enabled = bool(getattr(settings, "chat_summary_enabled", False))
+        self.trigger_tokens = int(getattr(settings, "chat_summary_trigger_tokens", 4000))
+        self._keep_recent = max(0, int(getattr(settings, "chat_summary_keep_recent", 6)))
+        self._min_batch_tokens = max(0, int(getattr(settings, "chat_summary_min_batch_tokens", 1000)))
+        self._batch_size = max(1, int(getattr(settings, "chat_summary_batch_size", 200)))
+        self._max_tokens = int(getattr(settings, "chat_summary_max_tokens", 512))
+        self._timeout = float(getattr(settings, "chat_completion_timeout_seconds", 60.0))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._enabled and self._model and self._api_key and self._base_url)
+
+    async def load(self, chat_id: UUID | str) -> ConversationSummary | None:
+        if not self.enabled:
+            return None
+        records = await self._database.select(
+            "chat_summaries", filters={"chat_id": str(chat_id)}, limit=1
+        )
+        return ConversationSummary.from_mapping(records[0]) if records else None
+
+    def due(self, recent: Sequence[Message], *, over_trigger: bool) -> bool:
+        """Return whether a run would fold enough history to be worth it.
+
+        ``recent`` is the chat's unsummarised history newest first. The newest
+        ``CHAT_SUMMARY_KEEP_RECENT`` turns are never folded, so a chat whose
+        kept turns alone pass the trigger only becomes due once the turns
+        behind them reach ``CHAT_SUMMARY_MIN_BATCH_TOKENS``.
+        """
+
+        if not self.enabled or not over_trigger:
+            return False
+        foldable = recent[self._keep_recent :]
+        if not foldable:
+            return False
+        tokens = 0
+        for message in foldable:
+            tokens += estimate_message_tokens(message.role, message.content)
+            if tokens >= self._min_batch_tokens:
+                return True
+        return False
+
+    def schedule(self, chat_id: UUID | str) -> asyncio.Task[Any] | None:
+        """Start summarising ``chat_id`` unless a run is already in flight."""
+
+        if not self.enabled:
+            return None
+        key = str(chat_id)
+        task = _inflight.get(key)
+        if task is not None and not task.done():
+            return task
+        task = asyncio.create_task(self._run(key))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _forget(key, done))
+        return task
+
+    async def summarise(self, chat_id: UUID | str) -> ConversationSummary | None:
+        """Fold everything but the most recent turns into the stored summary."""
+
+        current = await self.load(chat_id)
+        keyset = (
+            Keyset(
+                ("created_at", "id"),
+                (current.covered_until, current.covered_message_id),
+            )
+            if current
+            else None
+        )
+        rows = await self._database.select(
+            "messages",
+            filters={"chat_id": str(chat_id)},
+            order_by=[("created_at", False), ("id", False)],
+            limit=self._batch_size + self._keep_recent,
+            keyset=keyset,
+        )
+        if len(rows) <= self._keep_recent:
+            return current
+        batch = rows[: len(rows) - self._keep_recent][: self._batch_size]
+
+        text = await self._complete(current, batch)
+        last = batch[-1]
+        record = {
+            "chat_id": str(chat_id),
+            "summary": text,
+            "covered_until": last["created_at"],
+            "covered_message_id": str(last["id"]),
+            "token_estimate": estimate_tokens(text),
+            "updated_at": datetime.now(tz=UTC),
+        }
+        stored = await self._database.upsert("chat_summaries", record, on_conflict="chat_id")
+        return ConversationSummary.from_mapping(stored[0] if stored else record)
+
+    async def _run(self, chat_id: str) -> None:
+        try:
+            summary = await self.summarise(chat_id)
+        except Exception:  # pragma: no cover - background task must never raise
+            logger.exception("Failed to summarise chat %s", chat_id)
+            return
+        if summary is not None:
+            logger.debug(
+                "Summarised chat %s up to message %s (%s tokens)",
+                chat_id,
+                summary.covered_message_id,
+                summary.token_estimate,
+            )
+
+    async def _complete(
+        self, current: ConversationSummary | None, batch: list[dict[str, Any]]
+    ) -> str:
+        transcript = "\n".join(
+            f"{row.get('role')}: {str(row.get('content') or '')[:_MAX_TURN_CHARS]}"
+            for row in batch
+        )
+        existing = current.summary if current else "(none)"
+        url = f"{str(self._base_url).rstrip('/')}/chat/completions"
+        payload = {
+            "model": self._model,
+            "messages": [
+                {"role": "system", "content": _SUMMARY_INSTRUCTIONS},
+                {
+                    "role": "user",
+                    "content": f"Existing summary:\n{existing}\n\nNew messages:\n{transcript}",
+                },
+            ],
+            "temperature": 0,
+            "max_tokens": self._max_tokens,
+        }
+        async with provider_http_client(url, transport=self._http_transport) as client:
+            response = await client.post(
+                url,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {self._api_key}",
+                },
+                json=payload,
+                timeout=self._timeout,
+            )
+        response.raise_for_status()
+        choices = response.json().get("choices") or [{}]
+        content = (choices[0].get("message") or {}).get("content")
+        if not isinstance(content, str) or not content.strip():
+            raise ValueError("Summary model returned no content")
+        return content.strip()
+
+
+def _forget(key: str, task: asyncio.Task[Any]) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+
+
+def _as_datetime(value: Any) -> datetime:
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+__all__ = ["ConversationSummarizer", "ConversationSummary"]
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import replace
 from datetime import UTC, datetime
 from typing import Any, Iterable
@@ -13,6 +17,8 @@ from fastapi import HTTPException, status
 
 from app.core.config import Settings
 from app.core.database import Database
+from app.core.http_clients import provider_http_client
+from app.core.metrics import PROVIDER_ERRORS, PROVIDER_REQUEST_SECONDS, PROVIDER_TTFB_SECONDS
 from app.schemas.chats import (
     ChatCreate,
     ChatSummary,
@@ -21,8 +27,13 @@ from app.schemas.chats import (
     Message,
     MessageCreate,
 )
+from app.schemas.common import CursorPage
 from app.schemas.models import ModelSettings
+from app.services.chat_summaries import ConversationSummarizer, ConversationSummary
+from app.services.context_window import ContextWindow, resolve_context_budget
+from app.services.resolved_configs import get_resolved_config_cache
 from app.utils import decrypt_secret
+from app.utils.pagination import Page, fetch_page
 from database import ModelConfigRecord, ProviderRecord
 
 _DEFAULT_PROVIDER_BASE_URLS: dict[str, str] = {
@@ -32,6 +43,10 @@ _DEFAULT_PROVIDER_BASE_URLS: dict[str, str] = {
     "imagerouter": "https://api.imagerouter.io/v1/openai",
 }
 
+# Chat row plus its model configuration and provider in a single PostgREST
+# round trip, following the chats -> model_configs -> providers foreign keys.
+_CHAT_BUNDLE_COLUMNS = "*,model_config:model_configs(*,provider_record:providers(*))"
+
 
 class ChatsService:
     """Encapsulates chat related persistence and provider orchestration logic."""
@@ -50,6 +65,18 @@ class ChatsService:
         self._request_timeout = float(
             getattr(settings, "chat_completion_timeout_seconds", 60.0)
         )
+        self._history_page_size = int(getattr(settings, "chat_history_page_size", 50))
+        self._configs = get_resolved_config_cache(settings)
+        summary_provider = str(getattr(settings, "chat_summary_provider", "openai") or "").lower()
+        self._summarizer = ConversationSummarizer(
+            database,
+            settings,
+            base_url=(
+                getattr(settings, f"{summary_provider}_api_base", None)
+                or _DEFAULT_PROVIDER_BASE_URLS.get(summary_provider)
+            ),
+            http_transport=http_transport,
+        )
 
     async def list_chats(self, user_id: UUID) -> list[ChatSummary]:
         records = await self._database.select(
@@ -59,6 +86,33 @@ class ChatsService:
         )
         return [ChatSummary.model_validate(record) for record in records]
 
+    async def list_chats_page(
+        self,
+        user_id: UUID,
+        *,
+        limit: int | None = None,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> CursorPage[ChatSummary]:
+        """Return chats most recently updated first, one keyset page at a time."""
+
+        page = await fetch_page(
+            self._database,
+            "chats",
+            filters={"user_id": str(user_id)},
+            columns=("updated_at", "id"),
+            descending=True,
+            limit=limit,
+            after=after,
+            before=before,
+        )
+        return CursorPage[ChatSummary](
+            items=[ChatSummary.model_validate(record) for record in page.rows],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            limit=page.limit,
+        )
+
     async def create_chat(self, user_id: UUID, payload: ChatCreate) -> ChatSummary:
         model_config_id = payload.model_config_id
         if model_config_id is None:
@@ -91,16 +145,18 @@ class ChatsService:
         return chat
 
     async def get_chat(self, chat_id: UUID, user_id: UUID) -> ChatWithMessages:
-        chat_records = await self._database.select(
-            "chats",
-            filters={"id": str(chat_id), "user_id": str(user_id)},
-            limit=1,
+        chat_records, messages = await asyncio.gather(
+            self._database.select(
+                "chats",
+                filters={"id": str(chat_id), "user_id": str(user_id)},
+                limit=1,
+            ),
+            self._fetch_messages(chat_id),
         )
         if not chat_records:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found"
             )
-        messages = await self.list_messages(chat_id, user_id)
         return ChatWithMessages(
             chat=ChatSummary.model_validate(chat_records[0]), messages=messages
         )
@@ -144,43 +200,144 @@ class ChatsService:
     ) -> Message:
         if payload.stream:
             raise HTTPException(
-                status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                detail="Streaming is not supported yet.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Replies with stream=true are delivered as a text/event-stream response, not a single message.",
             )
 
-        chat_record = await self._get_chat_record(chat_id, user_id)
-        model_config = await self._resolve_model_configuration(chat_record, user_id)
-        stored_message = await self._store_message(
-            chat_id, payload.role, payload.content, payload.metadata
-        )
-        if payload.role != "user":
-            await self._touch_chat(chat_id)
-            return stored_message
+        prepared = await self._prepare_message_turn(chat_id, user_id, payload)
+        if isinstance(prepared, Message):
+            return prepared
 
-        system_settings = ModelSettings.model_validate(model_config.settings)
-        provider_record = await self._resolve_provider_record(user_id, model_config)
-        prompt_messages = await self._build_prompt_messages(
-            chat_id, user_id, system_settings
-        )
+        model_config, provider_record, prompt_messages = prepared
         assistant_message = await self._request_and_store_completion(
             chat_id,
             model_config,
             provider_record,
             prompt_messages,
         )
-        await self._touch_chat(chat_id)
         return assistant_message
 
+    async def stream_message(
+        self,
+        chat_id: UUID,
+        user_id: UUID,
+        payload: MessageCreate,
+        *,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> AsyncIterator[str]:
+        """Store ``payload`` and return an iterator of Server-Sent Events.
+
+        Validation and persistence of the user message happen eagerly so that
+        errors surface as regular HTTP responses before the stream starts.
+        """
+
+        prepared = await self._prepare_message_turn(chat_id, user_id, payload)
+        if isinstance(prepared, Message):
+            return _single_event_stream("message", prepared.model_dump(mode="json"))
+
+        model_config, provider_record, prompt_messages = prepared
+        return self._stream_and_store_completion(
+            chat_id,
+            model_config,
+            provider_record,
+            prompt_messages,
+            is_disconnected=is_disconnected,
+        )
+
+    async def _prepare_message_turn(
+        self, chat_id: UUID, user_id: UUID, payload: MessageCreate
+    ) -> Message | tuple[ModelConfigRecord, ProviderRecord, list[dict[str, str]]]:
+        chat_record = await self._get_chat_bundle(chat_id, user_id)
+        model_config, provider_row = await self._resolve_model_configuration(
+            chat_record, user_id
+        )
+        if payload.role != "user":
+            return await self._store_message(
+                chat_id, payload.role, payload.content, payload.metadata
+            )
+
+        # The chat's updated_at is bumped by the messages insert trigger, so the
+        # remaining lookups are independent of each other and run concurrently.
+        stored_message, history_tail, provider_record, summary = await asyncio.gather(
+            self._store_message(chat_id, payload.role, payload.content, payload.metadata),
+            self._fetch_history_page(chat_id),
+            self._resolve_provider_record(user_id, model_config, provider_row),
+            self._summarizer.load(chat_id),
+        )
+        system_settings = ModelSettings.model_validate(model_config.settings)
+        prompt_messages = await self._build_prompt_messages(
+            chat_id, model_config, system_settings, history_tail, stored_message, summary
+        )
+        return model_config, provider_record, prompt_messages
+
     async def list_messages(self, chat_id: UUID, user_id: UUID) -> list[Message]:
-        chat_records = await self._database.select(
-            "chats",
-            filters={"id": str(chat_id), "user_id": str(user_id)},
-            limit=1,
+        chat_records, messages = await asyncio.gather(
+            self._database.select(
+                "chats",
+                columns="id",
+                filters={"id": str(chat_id), "user_id": str(user_id)},
+                limit=1,
+            ),
+            self._fetch_messages(chat_id),
         )
         if not chat_records:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found"
             )
+        return messages
+
+    async def list_messages_page(
+        self,
+        chat_id: UUID,
+        user_id: UUID,
+        *,
+        limit: int | None = None,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> CursorPage[Message]:
+        """Return a chat's messages newest first; ``next_cursor`` pages back in time."""
+
+        chat_records, page = await asyncio.gather(
+            self._database.select(
+                "chats",
+                columns="id",
+                filters={"id": str(chat_id), "user_id": str(user_id)},
+                limit=1,
+            ),
+            fetch_page(
+                self._database,
+                "messages",
+                filters={"chat_id": str(chat_id)},
+                descending=True,
+                limit=limit,
+                after=after,
+                before=before,
+            ),
+        )
+        if not chat_records:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found"
+            )
+        return CursorPage[Message](
+            items=[Message.model_validate(record) for record in page.rows],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            limit=page.limit,
+        )
+
+    async def _fetch_history_page(self, chat_id: UUID, after: str | None = None) -> Page:
+        """Return one page of a chat's history, newest message first."""
+
+        return await fetch_page(
+            self._database,
+            "messages",
+            filters={"chat_id": str(chat_id)},
+            descending=True,
+            limit=self._history_page_size,
+            after=after,
+        )
+
+    async def _fetch_messages(self, chat_id: UUID) -> list[Message]:
         records = await self._database.select(
             "messages",
             filters={"chat_id": str(chat_id)},
@@ -202,9 +359,10 @@ class ChatsService:
             )
         return ChatSummary.model_validate(records[0])
 
-    async def _get_chat_record(self, chat_id: UUID, user_id: UUID) -> dict[str, Any]:
+    async def _get_chat_bundle(self, chat_id: UUID, user_id: UUID) -> dict[str, Any]:
         records = await self._database.select(
             "chats",
+            columns=_CHAT_BUNDLE_COLUMNS,
             filters={"id": str(chat_id), "user_id": str(user_id)},
             limit=1,
         )
@@ -239,10 +397,20 @@ class ChatsService:
 
     async def _resolve_model_configuration(
         self, chat_record: dict[str, Any], user_id: UUID
-    ) -> ModelConfigRecord:
+    ) -> tuple[ModelConfigRecord, dict[str, Any] | None]:
+        """Return the chat's model configuration and its embedded provider row."""
+
         model_config_id = chat_record.get("model_config_id")
         if model_config_id:
-            return await self._fetch_model_config(user_id, UUID(str(model_config_id)))
+            embedded = chat_record.get("model_config")
+            if isinstance(embedded, dict) and _owned_by(embedded, user_id):
+                provider_row = embedded.get("provider_record")
+                return (
+                    ModelConfigRecord.from_mapping(embedded),
+                    provider_row if isinstance(provider_row, dict) else None,
+                )
+            model = await self._fetch_model_config(user_id, UUID(str(model_config_id)))
+            return model, None
 
         model = await self._get_default_model_config(user_id)
         await self._database.update(
@@ -250,23 +418,33 @@ class ChatsService:
             {"model_config_id": str(model.id)},
             filters={"id": str(chat_record["id"])},
         )
-        return model
+        return model, None
 
     async def _fetch_model_config(
         self, user_id: UUID, model_config_id: UUID
     ) -> ModelConfigRecord:
-        records = await self._database.select(
-            "model_configs",
-            filters={"id": str(model_config_id), "user_id": str(user_id)},
-            limit=1,
-        )
-        if not records:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Model configuration not found"
+        async def load() -> ModelConfigRecord:
+            records = await self._database.select(
+                "model_configs",
+                filters={"id": str(model_config_id), "user_id": str(user_id)},
+                limit=1,
             )
-        return ModelConfigRecord.from_mapping(records[0])
+            if not records:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Model configuration not found"
+                )
+            return ModelConfigRecord.from_mapping(records[0])
+
+        return await self._configs.get_or_load(
+            user_id, ("model_config", str(model_config_id)), load
+        )
 
     async def _get_default_model_config(self, user_id: UUID) -> ModelConfigRecord:
+        return await self._configs.get_or_load(
+            user_id, ("default_model_config",), lambda: self._load_default_model_config(user_id)
+        )
+
+    async def _load_default_model_config(self, user_id: UUID) -> ModelConfigRecord:
         records = await self._database.select(
             "model_configs",
             filters={"user_id": str(user_id), "is_default": True},
@@ -292,26 +470,46 @@ class ChatsService:
         await self._fetch_model_config(user_id, model_config_id)
 
     async def _resolve_provider_record(
-        self, user_id: UUID, model_config: ModelConfigRecord
+        self,
+        user_id: UUID,
+        model_config: ModelConfigRecord,
+        provider_row: dict[str, Any] | None = None,
     ) -> ProviderRecord:
-        filters: dict[str, Any] = {"user_id": str(user_id)}
-        if model_config.provider_id:
-            filters["id"] = str(model_config.provider_id)
-        else:
-            filters["provider"] = model_config.provider
+        """Return the provider for ``model_config`` with its API key decrypted."""
 
-        records = await self._database.select(
-            "providers",
-            filters=filters,
-            limit=1,
+        key = ("provider", str(model_config.provider_id or model_config.provider.lower()))
+        return await self._configs.get_or_load(
+            user_id,
+            key,
+            lambda: self._load_provider_record(user_id, model_config, provider_row),
         )
-        if not records:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Provider '{model_config.provider}' is not configured.",
-            )
 
-        provider_record = ProviderRecord.from_mapping(records[0])
+    async def _load_provider_record(
+        self,
+        user_id: UUID,
+        model_config: ModelConfigRecord,
+        provider_row: dict[str, Any] | None,
+    ) -> ProviderRecord:
+        if provider_row is None or not _owned_by(provider_row, user_id):
+            filters: dict[str, Any] = {"user_id": str(user_id)}
+            if model_config.provider_id:
+                filters["id"] = str(model_config.provider_id)
+            else:
+                filters["provider"] = model_config.provider
+
+            records = await self._database.select(
+                "providers",
+                filters=filters,
+                limit=1,
+            )
+            if not records:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Provider '{model_config.provider}' is not configured.",
+                )
+            provider_row = records[0]
+
+        provider_record = ProviderRecord.from_mapping(provider_row)
         api_key = provider_record.api_key
         if not api_key and provider_record.api_key_encrypted:
             api_key = decrypt_secret(provider_record.api_key_encrypted, self._settings)
@@ -325,16 +523,66 @@ class ChatsService:
     async def _build_prompt_messages(
         self,
         chat_id: UUID,
-        user_id: UUID,
+        model_config: ModelConfigRecord,
         settings: ModelSettings,
+        history_tail: Page,
+        latest: Message,
+        summary: ConversationSummary | None = None,
     ) -> list[dict[str, str]]:
+        """Return the system prompt, the newest history that fits, and ``latest``.
+
+        Older pages are only read while the token budget has room left. With a
+        stored ``summary`` only the turns it does not cover are sent, and a
+        chat whose uncovered history has grown is queued for summarisation.
+        """
+
+        budget = resolve_context_budget(
+            model_config.provider, model_config.model, settings, self._settings
+        )
+        window = ContextWindow(budget.prompt_tokens)
+        if settings.system_prompt:
+            window.reserve("system", settings.system_prompt)
+        window.reserve(latest.role, latest.content)
+        summary_message = (
+            f"Summary of the earlier conversation:\n{summary.summary}" if summary else None
+        )
+        if summary_message:
+            window.reserve("system", summary_message)
+        # History is read concurrently with the insert of ``latest`` and may or
+        # may not already contain it.
+        window.exclude(latest.id)
+
+        page = history_tail
+        # Unsummarised turns read so far, newest first, starting with ``latest``.
+        recent: list[Message] = [latest]
+        while True:
+            history = [Message.model_validate(record) for record in page.rows]
+            uncovered = [m for m in history if summary is None or not summary.covers(m)]
+            recent.extend(m for m in uncovered if m.id != latest.id)
+            window.offer(uncovered)
+            if window.full or page.next_cursor is None or len(uncovered) < len(history):
+                break
+            page = await self._fetch_history_page(chat_id, after=page.next_cursor)
+
+        if self._summarizer.due(
+            recent,
+            over_trigger=window.full or window.history_tokens > self._summarizer.trigger_tokens,
+        ):
+            self._summarizer.schedule(chat_id)
+
+        if window.full:
+            self._logger.debug(
+                "Trimmed history for chat %s to fit %s prompt tokens",
+                chat_id,
+                budget.prompt_tokens,
+            )
         messages: list[dict[str, str]] = []
         if settings.system_prompt:
             messages.append({"role": "system", "content": settings.system_prompt})
-
-        history = await self.list_messages(chat_id, user_id)
-        for entry in history:
-            messages.append({"role": entry.role, "content": entry.content})
+        if summary_message:
+            messages.append({"role": "system", "content": summary_message})
+        messages.extend(window.messages())
+        messages.append({"role": latest.role, "content": latest.content})
         return messages
 
     async def _request_and_store_completion(
@@ -356,6 +604,119 @@ class ChatsService:
             response_metadata,
         )
 
+    async def _stream_and_store_completion(
+        self,
+        chat_id: UUID,
+        model_config: ModelConfigRecord,
+        provider_record: ProviderRecord,
+        messages: list[dict[str, str]],
+        *,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> AsyncIterator[str]:
+        payload = self._build_completion_payload(model_config, messages)
+        payload["stream"] = True
+        url = self._resolve_completion_url(provider_record)
+        headers = self._build_provider_headers(provider_record)
+        headers["Accept"] = "text/event-stream"
+
+        fragments: list[str] = []
+        finish_reason: str | None = None
+        usage: dict[str, Any] | None = None
+        provider_name = provider_record.provider.lower()
+        started = time.perf_counter()
+
+        try:
+            async with provider_http_client(url, transport=self._http_transport) as client:
+                async with client.stream(
+                    "POST",
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self._request_timeout,
+                ) as response:
+                    if response.status_code >= 400:
+                        PROVIDER_ERRORS.labels(provider_name, f"http_{response.status_code}").inc()
+                        body = await response.aread()
+                        self._logger.error(
+                            "Provider %s responded with HTTP %s: %s",
+                            provider_record.provider,
+                            response.status_code,
+                            body.decode("utf-8", "replace"),
+                        )
+                        yield _format_sse_event(
+                            "error",
+                            {"detail": f"Provider responded with HTTP {response.status_code}."},
+                        )
+                        return
+
+                    async for line in response.aiter_lines():
+                        if is_disconnected is not None and await is_disconnected():
+                            self._logger.info(
+                                "Client disconnected from chat %s stream; aborting upstream request",
+                                chat_id,
+                            )
+                            return
+                        chunk = _parse_stream_line(line)
+                        if chunk is _STREAM_DONE:
+                            break
+                        if not isinstance(chunk, dict):
+                            continue
+                        delta, chunk_finish_reason = self._extract_stream_delta(chunk)
+                        if chunk_finish_reason:
+                            finish_reason = chunk_finish_reason
+                        if isinstance(chunk.get("usage"), dict):
+                            usage = chunk["usage"]
+                        if delta:
+                            if not fragments:
+                                PROVIDER_TTFB_SECONDS.labels(provider_name).observe(
+                                    time.perf_counter() - started
+                                )
+                            fragments.append(delta)
+                            yield _format_sse_event("delta", {"content": delta})
+        except httpx.HTTPError as exc:  # pragma: no cover - network errors
+            PROVIDER_ERRORS.labels(provider_name, "transport").inc()
+            self._logger.error("Provider streaming request failed: %s", exc)
+            yield _format_sse_event("error", {"detail": "Upstream provider request failed."})
+            return
+        PROVIDER_REQUEST_SECONDS.labels(provider_name, "stream").observe(
+            time.perf_counter() - started
+        )
+
+        content = "".join(fragments).strip()
+        if not content:
+            yield _format_sse_event(
+                "error", {"detail": "Provider response missing assistant content."}
+            )
+            return
+
+        metadata = {
+            "provider": provider_record.provider,
+            "model": model_config.model,
+            "finish_reason": finish_reason,
+            "usage": usage,
+        }
+        message = await self._store_message(chat_id, "assistant", content, metadata)
+        yield _format_sse_event("message", message.model_dump(mode="json"))
+
+    def _extract_stream_delta(
+        self, chunk: dict[str, Any]
+    ) -> tuple[str, str | None]:
+        choices = chunk.get("choices")
+        if not isinstance(choices, list) or not choices:
+            return "", None
+        first_choice = choices[0]
+        if not isinstance(first_choice, dict):
+            return "", None
+        delta = first_choice.get("delta") or {}
+        content = delta.get("content") if isinstance(delta, dict) else None
+        if isinstance(content, list):
+            content = "".join(
+                fragment.get("text", "")
+                for fragment in content
+                if isinstance(fragment, dict)
+            )
+        return (content if isinstance(content, str) else ""), first_choice.get("finish_reason")
+
     def _build_completion_payload(
         self, model_config: ModelConfigRecord, messages: list[dict[str, str]]
     ) -> dict[str, Any]:
@@ -382,21 +743,30 @@ class ChatsService:
     ) -> dict[str, Any]:
         url = self._resolve_completion_url(provider)
         headers = self._build_provider_headers(provider)
+        provider_name = provider.provider.lower()
+        started = time.perf_counter()
 
         try:
-            async with httpx.AsyncClient(
-                timeout=self._request_timeout,
-                transport=self._http_transport,
-            ) as client:
-                response = await client.post(url, headers=headers, json=payload)
+            async with provider_http_client(url, transport=self._http_transport) as client:
+                response = await client.post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self._request_timeout,
+                )
         except httpx.HTTPError as exc:  # pragma: no cover - network errors
+            PROVIDER_ERRORS.labels(provider_name, "transport").inc()
             self._logger.error("Provider request failed: %s", exc)
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
                 detail="Upstream provider request failed.",
             ) from exc
+        PROVIDER_REQUEST_SECONDS.labels(provider_name, "complete").observe(
+            time.perf_counter() - started
+        )
 
         if response.status_code >= 400:
+            PROVIDER_ERRORS.labels(provider_name, f"http_{response.status_code}").inc()
             self._logger.error(
                 "Provider %s responded with HTTP %s: %s",
                 provider.provider,
@@ -480,12 +850,42 @@ class ChatsService:
                 headers.setdefault("X-Title", str(title))
         return headers
 
-    async def _touch_chat(self, chat_id: UUID) -> None:
-        await self._database.update(
-            "chats",
-            {"updated_at": datetime.now(tz=UTC).isoformat()},
-            filters={"id": str(chat_id)},
-        )
+
+# Returned by ``_parse_stream_line`` for the ``[DONE]`` terminator.
+_STREAM_DONE = object()
+
+
+def _owned_by(row: dict[str, Any], user_id: UUID) -> bool:
+    return str(row.get("user_id")) == str(user_id)
+
+
+def _parse_stream_line(line: str) -> dict[str, Any] | object | None:
+    """Decode a single ``data:`` line from an OpenAI-compatible event stream.
+
+    Returns the JSON chunk, ``_STREAM_DONE`` for the terminator, or ``None``
+    for lines to skip.
+    """
+
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if not data:
+        return None
+    if data == "[DONE]":
+        return _STREAM_DONE
+    try:
+        chunk = json.loads(data)
+    except ValueError:
+        return None
+    return chunk if isinstance(chunk, dict) else None
+
+
+def _format_sse_event(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _single_event_stream(event: str, data: dict[str, Any]) -> AsyncIterator[str]:
+    yield _format_sse_event(event, data)
 
 
 __all__ = ["ChatsService"]
@@ -0,0 +1,137 @@
+"""Token budgeting for the chat history sent to providers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from app.schemas.chats import Message
+from app.schemas.models import ModelSettings
+from app.services.providers.catalogue import ProviderModelCatalogue
+
+DEFAULT_CONTEXT_WINDOW = 8192
+DEFAULT_MAX_OUTPUT_TOKENS = 1024
+
+# Chat formats wrap every message in a few tokens of role/separator framing.
+_MESSAGE_OVERHEAD_TOKENS = 4
+# The estimator is approximate, so leave headroom below the hard limit.
+_SAFETY_RATIO = 0.9
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheaply estimate how many tokens ``text`` encodes to.
+
+    ASCII text averages about four characters per token with BPE tokenizers;
+    other scripts are counted as one token per character, which errs on the
+    side of sending less history rather than overflowing the window.
+    """
+
+    if not text:
+        return 0
+    if text.isascii():
+        return (len(text) + 3) // 4
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def estimate_message_tokens(role: str, content: str) -> int:
+    return estimate_tokens(content) + estimate_tokens(role) + _MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass(frozen=True)
+class ContextBudget:
+    """Token limits for one completion request."""
+
+    context_window: int
+    max_output_tokens: int
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Tokens available for the prompt once the output is reserved."""
+
+        return max(0, int(self.context_window * _SAFETY_RATIO) - self.max_output_tokens)
+
+
+def resolve_context_budget(
+    provider: str,
+    model: str,
+    model_settings: ModelSettings,
+    settings: Any,
+) -> ContextBudget:
+    """Combine catalogue limits, the model's settings and deployment defaults.
+
+    Only already-cached catalogue entries are consulted so the chat path never
+    waits on a provider's model listing.
+    """
+
+    catalogue_model = ProviderModelCatalogue.cached_model(provider, model)
+    context_window = (
+        catalogue_model.context_window if catalogue_model and catalogue_model.context_window else None
+    ) or int(getattr(settings, "chat_default_context_window", DEFAULT_CONTEXT_WINDOW))
+
+    output_limits = [
+        value
+        for value in (
+            model_settings.max_tokens,
+            catalogue_model.max_output_tokens if catalogue_model else None,
+        )
+        if value
+    ]
+    max_output_tokens = min(output_limits) if output_limits else DEFAULT_MAX_OUTPUT_TOKENS
+    return ContextBudget(
+        context_window=context_window,
+        max_output_tokens=min(max_output_tokens, context_window // 2),
+    )
+
+
+class ContextWindow:
+    """Accumulate the newest messages that fit in a token budget.
+
+    Messages are offered newest first; the window stops at the first one that
+    does not fit so the history sent upstream is always a contiguous tail.
+    """
+
+    def __init__(self, budget: int) -> None:
+        self._remaining = budget
+        self._selected: list[dict[str, str]] = []
+        self._seen: set[Any] = set()
+        self.full = False
+        self.history_tokens = 0
+
+    def reserve(self, role: str, content: str) -> None:
+        """Account for a message that is always sent (system prompt, latest turn)."""
+
+        self._remaining -= estimate_message_tokens(role, content)
+
+    def offer(self, messages: Iterable[Message]) -> None:
+        for message in messages:
+            if self.full:
+                return
+            if message.id in self._seen:
+                continue
+            cost = estimate_message_tokens(message.role, message.content)
+            if cost > self._remaining:
+                self.full = True
+                return
+            self._remaining -= cost
+            self.history_tokens += cost
+            self._seen.add(message.id)
+            self._selected.append({"role": message.role, "content": message.content})
+
+    def exclude(self, message_id: Any) -> None:
+        self._seen.add(message_id)
+
+    def messages(self) -> list[dict[str, str]]:
+        """Return the selected history oldest first."""
+
+        return list(reversed(self._selected))
+
+
+__all__ = [
+    "ContextBudget",
+    "ContextWindow",
+    "estimate_message_tokens",
+    "estimate_tokens",
+    "resolve_context_budget",
+]
@@ -11,6 +11,7 @@ from fastapi import HTTPException, status
 
 from app.core.config import Settings
 from app.core.database import Database
+from app.schemas.common import CursorPage
 from app.schemas.jobs import (
     Job,
     JobCreateRequest,
@@ -19,6 +20,7 @@ from app.schemas.jobs import (
     JobEstimateResponse,
     JobStatus,
 )
+from app.utils.pagination import fetch_page
 
 
 @dataclass(slots=True)
@@ -91,6 +93,30 @@ class JobsService:
         )
         return [Job.model_validate(record) for record in records]
 
+    async def list_jobs_page(
+        self,
+        user_id: UUID,
+        *,
+        limit: int | None = None,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> CursorPage[Job]:
+        page = await fetch_page(
+            self._database,
+            "jobs",
+            filters={"user_id": str(user_id)},
+            descending=True,
+            limit=limit,
+            after=after,
+            before=before,
+        )
+        return CursorPage[Job](
+            items=[Job.model_validate(record) for record in page.rows],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            limit=page.limit,
+        )
+
     async def get_job(self, user_id: UUID, job_id: UUID) -> Job:
         records = await self._database.select(
             "jobs",
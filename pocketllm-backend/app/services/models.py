@@ -7,6 +7,7 @@ from uuid import UUID
 from fastapi import HTTPException, status
 
 from app.core.database import Database
+from app.services.resolved_configs import invalidate_resolved_configs
 from database import ModelConfigRecord
 from app.schemas.models import (
     ModelConfiguration,
@@ -45,6 +46,7 @@ class ModelsService:
             "model_configs",
             filters={"user_id": str(user_id), "id": str(model_id)},
         )
+        invalidate_resolved_configs(user_id)
         if not deleted:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model not found")
 
@@ -77,6 +79,7 @@ class ModelsService:
             {"is_default": payload.is_default},
             filters={"user_id": str(user_id), "id": str(model_id)},
         )
+        invalidate_resolved_configs(user_id)
         if not updated:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model not found")
         return self._record_to_model(updated[0])
@@ -108,6 +111,7 @@ class ModelsService:
             "is_active": True,
         }
         records = await self._database.insert_many("model_configs", [payload])
+        invalidate_resolved_configs(user_id)
         if not records:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
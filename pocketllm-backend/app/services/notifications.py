@@ -2,12 +2,71 @@
 
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
 from typing import Any
 from uuid import UUID
 
+from fastapi import HTTPException, status
+
 from app.core.database import Database
 from app.core.config import Settings
+from app.schemas.common import CursorPage
 from app.schemas.notifications import Notification
+from app.utils.pagination import fetch_page
+
+
+class UnreadCountCache:
+    """Per-process unread notification counters with a freshness window.
+
+    Writes made through :class:`NotificationService` adjust the cached value
+    in place; anything else (other workers, direct SQL) is picked up when the
+    entry expires and is recounted. At most ``max_entries`` users are kept;
+    the least recently used are evicted first.
+    """
+
+    def __init__(self, *, max_entries: int = 4096) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    def get(self, user_id: UUID) -> int | None:
+        entry = self._entries.get(str(user_id))
+        if entry is None:
+            return None
+        count, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(str(user_id), None)
+            return None
+        self._entries.move_to_end(str(user_id))
+        return count
+
+    def set(self, user_id: UUID, count: int, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        self._entries[str(user_id)] = (max(0, count), now + ttl)
+        self._entries.move_to_end(str(user_id))
+        # Drop users who stopped polling, oldest first, as well as any overflow.
+        while self._entries:
+            _count, expires_at = next(iter(self._entries.values()))
+            if len(self._entries) <= self._max_entries and expires_at > now:
+                break
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def adjust(self, user_id: UUID, delta: int) -> None:
+        entry = self._entries.get(str(user_id))
+        if entry is not None:
+            count, expires_at = entry
+            self._entries[str(user_id)] = (max(0, count + delta), expires_at)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+unread_counts = UnreadCountCache()
 
 
 class NotificationService:
@@ -16,6 +75,7 @@ class NotificationService:
     def __init__(self, settings: Settings, database: Database) -> None:
         self._settings = settings
         self._database = database
+        self._unread_ttl = float(getattr(settings, "notification_unread_count_ttl", 30.0))
 
     async def list_notifications(self, user_id: UUID) -> list[Notification]:
         """List all notifications for the given user."""
@@ -26,32 +86,73 @@ class NotificationService:
         )
         return [Notification.model_validate(row) for row in rows]
 
+    async def list_notifications_page(
+        self,
+        user_id: UUID,
+        *,
+        limit: int | None = None,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> CursorPage[Notification]:
+        """List notifications newest first, one keyset page at a time."""
+        page = await fetch_page(
+            self._database,
+            "notifications",
+            filters={"user_id": str(user_id)},
+            descending=True,
+            limit=limit,
+            after=after,
+            before=before,
+        )
+        return CursorPage[Notification](
+            items=[Notification.model_validate(row) for row in page.rows],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+            limit=page.limit,
+        )
+
     async def mark_notification_as_read(
         self, user_id: UUID, notification_id: UUID
     ) -> Notification:
         """Mark a single notification as read."""
-        row = await self._database.update(
+        filters = {"id": str(notification_id), "user_id": str(user_id)}
+        rows = await self._database.update(
             "notifications",
             {"is_read": True},
-            filters={"id": str(notification_id), "user_id": str(user_id)},
+            filters={**filters, "is_read": False},
         )
-        return Notification.model_validate(row[0])
+        if rows:
+            unread_counts.adjust(user_id, -1)
+        else:
+            # Already read (or missing): nothing changed, return the stored row.
+            rows = await self._database.select("notifications", filters=filters, limit=1)
+            if not rows:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Notification not found",
+                )
+        return Notification.model_validate(rows[0])
 
     async def mark_all_notifications_as_read(self, user_id: UUID) -> None:
         """Mark all notifications as read for the given user."""
         await self._database.update(
             "notifications",
             {"is_read": True},
-            filters={"user_id": str(user_id)},
+            filters={"user_id": str(user_id), "is_read": False},
         )
+        unread_counts.set(user_id, 0, self._unread_ttl)
 
     async def get_unread_notification_count(self, user_id: UUID) -> int:
         """Get the number of unread notifications for the given user."""
-        rows = await self._database.select(
+        cached = unread_counts.get(user_id)
+        if cached is not None:
+            return cached
+        count = await self._database.count(
             "notifications",
             filters={"user_id": str(user_id), "is_read": False},
         )
-        return len(rows)
+        unread_counts.set(user_id, count, self._unread_ttl)
+        return count
 
     async def create_notification(
         self,
@@ -72,3 +173,4 @@ class NotificationService:
                 "data": data,
             },
         )
+        unread_counts.adjust(user_id, 1)
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import replace
-from typing import Any, Iterable, Sequence
+from typing import Any, AsyncIterator, Iterable, Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -14,6 +15,7 @@ from app.core.database import Database
 from app.schemas.providers import (
     ProviderActivationRequest,
     ProviderActivationResponse,
+    ProviderCatalogueStatus,
     ProviderConfiguration,
     ProviderModel,
     ProviderModelsResponse,
@@ -21,6 +23,7 @@ from app.schemas.providers import (
     ProviderUpdateRequest,
 )
 from app.services.api_keys import APIKeyValidationService
+from app.services.resolved_configs import get_resolved_config_cache
 from app.services.providers import (
     GroqProviderClient,
     ImageRouterProviderClient,
@@ -28,7 +31,8 @@ from app.services.providers import (
     OpenRouterProviderClient,
     ProviderModelCatalogue,
 )
-from app.utils import decrypt_secret, encrypt_secret
+from app.services.providers.catalogue_index import search_models
+from app.utils import decrypt_many, encrypt_secret
 from app.utils.security import hash_secret, mask_secret
 from database import ProviderRecord
 
@@ -47,6 +51,7 @@ class ProvidersService:
         self._database = database
         self._catalogue = catalogue or ProviderModelCatalogue(settings)
         self._validator = APIKeyValidationService(settings)
+        self._configs = get_resolved_config_cache(settings)
         self._logger = logging.getLogger("app.services.provider_configs")
 
     async def list_providers(self, user_id: UUID) -> list[ProviderConfiguration]:
@@ -138,6 +143,7 @@ class ProvidersService:
             provider_payload,
             on_conflict="user_id,provider",
         )
+        self._configs.invalidate(user_id)
         if not records:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to save provider")
         provider = ProviderRecord.from_mapping(records[0]).to_schema()
@@ -242,6 +248,7 @@ class ProvidersService:
             updates,
             filters={"user_id": str(user_id), "provider": provider},
         )
+        self._configs.invalidate(user_id)
         if not records:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider not found")
         return ProviderRecord.from_mapping(records[0]).to_schema()
@@ -252,6 +259,7 @@ class ProvidersService:
             {"is_active": False},
             filters={"user_id": str(user_id), "provider": provider},
         )
+        self._configs.invalidate(user_id)
         if not updated:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider not found")
 
@@ -263,22 +271,21 @@ class ProvidersService:
         name: str | None = None,
         model_id: str | None = None,
         query: str | None = None,
+        limit: int | None = None,
     ) -> ProviderModelsResponse:
-        records = await self._fetch_provider_records(user_id)
-        active_records = [
-            record for record in records if self._record_is_usable(record)
-        ]
+        active_records = await self._fetch_usable_records(user_id)
 
         configured_providers_set = {record.provider.lower() for record in active_records}
         configured_providers = sorted(configured_providers_set)
         supported_providers = sorted(_SUPPORTED_PROVIDERS)
 
-        def _apply_filters(models: Iterable[ProviderModel]) -> list[ProviderModel]:
+        def _apply_filters(models: Sequence[ProviderModel]) -> list[ProviderModel]:
             return self._filter_models(
-                list(models),
+                models,
                 name=name,
                 model_id=model_id,
                 query=query,
+                limit=limit,
             )
 
         filters_applied = any([name, model_id, query])
@@ -288,36 +295,11 @@ class ProvidersService:
             models = await self._catalogue.list_all_models(providers_arg)
 
             filtered = _apply_filters(models)
-            using_public_catalogue = not active_records
-            fallback_used = using_public_catalogue and bool(filtered)
-            message: str | None = None
-
-            if not filtered:
-                if filters_applied:
-                    message = "No models matched the provided filters."
-                elif using_public_catalogue:
-                    message = (
-                        "No providers are configured for this workspace. "
-                        "Add a provider to browse available models."
-                    )
-                else:
-                    message = "No models are currently available from the configured providers."
-            elif using_public_catalogue:
-                message = (
-                    "Showing public provider catalogue results until you connect your own providers."
-                )
-
-            missing = [
-                provider_name
-                for provider_name in supported_providers
-                if provider_name not in configured_providers_set
-            ]
-            return ProviderModelsResponse(
-                models=filtered,
-                message=message,
-                configured_providers=configured_providers,
-                missing_providers=missing,
-                using_fallback=fallback_used,
+            return self._all_models_envelope(
+                filtered,
+                active_records,
+                filters_applied=filters_applied,
+                provider_status=getattr(models, "provider_status", []),
             )
 
         provider_key = provider.lower()
@@ -372,6 +354,7 @@ class ProvidersService:
             else:
                 message = f"No models are currently available for provider '{provider}'."
 
+        provider_status = list(getattr(models, "provider_status", []))
         return ProviderModelsResponse(
             models=filtered,
             message=message,
@@ -382,39 +365,129 @@ class ProvidersService:
                 if provider_name not in configured_providers_set
             ],
             using_fallback=fallback_used,
+            provider_status=provider_status,
+            partial=any(item.status == "timeout" for item in provider_status),
+        )
+
+    async def stream_provider_models(
+        self,
+        user_id: UUID,
+        provider: str | None = None,
+        *,
+        name: str | None = None,
+        model_id: str | None = None,
+        query: str | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Return an iterator of ``(event, data)`` pairs for a progressive listing.
+
+        A ``provider`` event carries one provider's status and filtered models
+        as soon as it answers; the closing ``done`` event is the
+        :class:`ProviderModelsResponse` envelope without ``models``. A listing
+        for a single provider is one ``provider`` event. Matches are ranked
+        within each provider and ``limit`` caps the total across events. The
+        provider records are loaded eagerly so that errors surface as regular
+        HTTP responses.
+        """
+
+        if provider is not None:
+            response = await self.get_provider_models(
+                user_id, provider, name=name, model_id=model_id, query=query, limit=limit
+            )
+            return _provider_listing_events(provider.lower(), response)
+
+        active_records = await self._fetch_usable_records(user_id)
+        return self._stream_all_models(
+            active_records, name=name, model_id=model_id, query=query, limit=limit
+        )
+
+    async def _stream_all_models(
+        self,
+        active_records: list[ProviderRecord],
+        *,
+        name: str | None,
+        model_id: str | None,
+        query: str | None,
+        limit: int | None,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        matched: list[ProviderModel] = []
+        provider_status: list[ProviderCatalogueStatus] = []
+        async for status, models in self._catalogue.stream_all_models(active_records or None):
+            remaining = None if limit is None else limit - len(matched)
+            filtered = (
+                self._filter_models(models, name=name, model_id=model_id, query=query, limit=remaining)
+                if remaining != 0
+                else []
+            )
+            matched.extend(filtered)
+            provider_status.append(status)
+            yield "provider", _provider_event(status, filtered)
+
+        envelope = self._all_models_envelope(
+            matched,
+            active_records,
+            filters_applied=any([name, model_id, query]),
+            provider_status=provider_status,
+        )
+        yield "done", envelope.model_dump(mode="json", exclude={"models"})
+
+    def _all_models_envelope(
+        self,
+        filtered: list[ProviderModel],
+        active_records: Sequence[ProviderRecord],
+        *,
+        filters_applied: bool,
+        provider_status: Iterable[ProviderCatalogueStatus],
+    ) -> ProviderModelsResponse:
+        configured_providers_set = {record.provider.lower() for record in active_records}
+        using_public_catalogue = not active_records
+        message: str | None = None
+
+        if not filtered:
+            if filters_applied:
+                message = "No models matched the provided filters."
+            elif using_public_catalogue:
+                message = (
+                    "No providers are configured for this workspace. "
+                    "Add a provider to browse available models."
+                )
+            else:
+                message = "No models are currently available from the configured providers."
+        elif using_public_catalogue:
+            message = (
+                "Showing public provider catalogue results until you connect your own providers."
+            )
+
+        provider_status = list(provider_status)
+        return ProviderModelsResponse(
+            models=filtered,
+            message=message,
+            configured_providers=sorted(configured_providers_set),
+            missing_providers=[
+                provider_name
+                for provider_name in sorted(_SUPPORTED_PROVIDERS)
+                if provider_name not in configured_providers_set
+            ],
+            using_fallback=using_public_catalogue and bool(filtered),
+            provider_status=provider_status,
+            partial=any(item.status == "timeout" for item in provider_status),
         )
 
     def _filter_models(
         self,
-        models: list[ProviderModel],
+        models: Sequence[ProviderModel],
         *,
         name: str | None = None,
         model_id: str | None = None,
         query: str | None = None,
+        limit: int | None = None,
     ) -> list[ProviderModel]:
-        if not any([name, model_id, query]):
-            return models
-
-        name_filter = name.lower() if name else None
-        id_filter = model_id.lower() if model_id else None
-        query_filter = query.lower() if query else None
-
-        def _matches(model: ProviderModel) -> bool:
-            if name_filter and name_filter not in model.name.lower():
-                return False
-            if id_filter and id_filter not in model.id.lower():
-                return False
-            if query_filter:
-                haystacks = [model.name, model.id]
-                if model.description:
-                    haystacks.append(model.description)
-                if model.metadata:
-                    haystacks.append(str(model.metadata))
-                if not any(query_filter in text.lower() for text in haystacks if isinstance(text, str)):
-                    return False
-            return True
+        """Apply the listing filters, best matches first, through the catalogue's indexes."""
 
-        return [model for model in models if _matches(model)]
+        segments = getattr(models, "segments", None)
+        if segments is None:
+            segments = [models]
+        return search_models(segments, name=name, model_id=model_id, query=query, limit=limit)
 
     def _record_is_usable(self, record: ProviderRecord) -> bool:
         if not record.is_active:
@@ -430,25 +503,77 @@ class ProvidersService:
             or record.api_key_hash
         )
 
+    async def _fetch_usable_records(self, user_id: UUID) -> list[ProviderRecord]:
+        records = await self._fetch_provider_records(user_id)
+        return [record for record in records if self._record_is_usable(record)]
+
     async def _fetch_provider_records(self, user_id: UUID) -> list[ProviderRecord]:
+        records = await self._configs.get_or_load(
+            user_id, ("providers",), lambda: self._load_provider_records(user_id)
+        )
+        return list(records)
+
+    async def _load_provider_records(self, user_id: UUID) -> tuple[ProviderRecord, ...]:
         records = await self._database.select(
             "providers",
             filters={"user_id": str(user_id)},
             order_by=[("created_at", True)],
         )
-        decrypted: list[ProviderRecord] = []
-        for record in records:
-            provider_record = ProviderRecord.from_mapping(record)
-            api_key: str | None = None
-            if provider_record.api_key_encrypted:
-                try:
-                    api_key = decrypt_secret(provider_record.api_key_encrypted, self._settings)
-                except RuntimeError as exc:
-                    self._logger.error(
-                        "Failed to decrypt API key for provider %s: %s", provider_record.provider, exc
-                    )
-            decrypted.append(replace(provider_record, api_key=api_key))
-        return decrypted
+        provider_records = [ProviderRecord.from_mapping(record) for record in records]
+        tokens = [record.api_key_encrypted for record in provider_records if record.api_key_encrypted]
+        rotated: dict[str, str] = {}
+        api_keys: dict[str, str | None] = {}
+        if tokens:
+            try:
+                api_keys = dict(zip(tokens, decrypt_many(tokens, self._settings, rotated=rotated)))
+            except RuntimeError as exc:
+                self._logger.error("Failed to decrypt provider API keys: %s", exc)
+        if rotated:
+            await self._store_rotated_keys(user_id, rotated)
+        return tuple(
+            replace(
+                record,
+                api_key=api_keys.get(record.api_key_encrypted) if record.api_key_encrypted else None,
+            )
+            for record in provider_records
+        )
+
+    async def _store_rotated_keys(self, user_id: UUID, rotated: dict[str, str]) -> None:
+        """Persist API keys re-encrypted under the primary encryption key.
+
+        Each update is conditional on the old ciphertext so a concurrent key
+        change is never overwritten.
+        """
+
+        results = await asyncio.gather(
+            *(
+                self._database.update(
+                    "providers",
+                    {"api_key_encrypted": new_token},
+                    filters={"user_id": str(user_id), "api_key_encrypted": old_token},
+                )
+                for old_token, new_token in rotated.items()
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self._logger.warning("Failed to store re-encrypted provider API key: %s", result)
+
+
+def _provider_event(status: ProviderCatalogueStatus, models: Iterable[ProviderModel]) -> dict[str, Any]:
+    return {**status.model_dump(mode="json"), "models": [model.model_dump(mode="json") for model in models]}
+
+
+async def _provider_listing_events(
+    provider: str, response: ProviderModelsResponse
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    status = next(
+        iter(response.provider_status),
+        ProviderCatalogueStatus(provider=provider, status="ok", model_count=len(response.models)),
+    )
+    yield "provider", _provider_event(status, response.models)
+    yield "done", response.model_dump(mode="json", exclude={"models"})
 
 
 __all__ = ["ProvidersService"]
@@ -10,6 +10,7 @@ from typing import Any, Mapping
 import httpx
 
 from app.core.config import Settings
+from app.core.http_clients import provider_http_client
 from app.schemas.providers import ProviderModel
 
 
@@ -110,18 +111,19 @@ class ProviderClient(ABC):
     async def _fetch_payload(self, headers: dict[str, str]) -> Any:
         """Execute the HTTP request and return the response payload."""
 
-        async with httpx.AsyncClient(
-            base_url=self.base_url,
-            headers=headers,
-            timeout=self.timeout,
-            transport=self._transport,
-        ) as client:
-            response = await client.get(self.models_endpoint)
+        url = self._build_url(self.models_endpoint)
+        async with provider_http_client(url, transport=self._transport) as client:
+            response = await client.get(url, headers=headers, timeout=self.timeout)
             response.raise_for_status()
             if response.headers.get("content-type", "").startswith("application/json"):
                 return response.json()
             return json.loads(response.text)
 
+    def _build_url(self, path: str) -> str:
+        """Join ``path`` onto the provider base URL."""
+
+        return f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+
     def _additional_headers(self) -> dict[str, str]:
         """Return additional provider specific headers."""
 
@@ -1,4 +1,27 @@
-"""Aggregation utilities for provider model catalogues."""
+"""Aggregation utilities for provider model catalogues.
+
+Catalogues are cached per provider configuration with stale-while-revalidate
+semantics: once an entry's TTL lapses it keeps being served, for at most
+``PROVIDER_CATALOGUE_MAX_STALE`` seconds, while a single background task
+refetches it. Failed fetches are cached for ``PROVIDER_CATALOGUE_ERROR_TTL``
+seconds so a failing provider is not retried on every request, and
+:class:`CatalogueRefresher` refetches the most requested entries before they
+expire.
+
+The cache is bounded to ``PROVIDER_CATALOGUE_CACHE_MAX_ENTRIES`` keys, evicted
+least recently used first. Keys whose catalogues are identical (every user of
+a provider with the same base URL usually sees the same list) share a single
+copy of the models. On a miss the optional second-tier store from
+:mod:`~app.services.providers.catalogue_store` is consulted before the
+provider, so new workers and cold starts begin warm.
+
+Listings fan out to every provider at once and keep whatever arrived by the
+deadline: each result carries a per-provider status, and
+:meth:`ProviderModelCatalogue.stream_all_models` yields providers as they
+finish. Each cached catalogue also carries the
+:mod:`~app.services.providers.catalogue_index` search index used by the
+``/v1/models`` filters.
+"""
 
 from __future__ import annotations
 
@@ -6,16 +29,21 @@ import asyncio
 import hashlib
 import json
 import logging
-from collections.abc import Iterable, Mapping, Sequence
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+import time
+import weakref
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 from app.core.config import Settings
-from app.schemas.providers import ProviderModel
+from app.core.metrics import CACHE_LOOKUPS
+from app.schemas.providers import ProviderCatalogueStatus, ProviderModel
 
 from .anthropic import AnthropicProviderClient
 from .base import ProviderClient
+from .catalogue_index import CatalogueIndex
+from .catalogue_store import CatalogueStore, decode_entry, encode_entry, get_catalogue_store, store_key
 from .deepseek import DeepSeekProviderClient
 from .groq import GroqProviderClient
 from .imagerouter import ImageRouterProviderClient
@@ -23,6 +51,13 @@ from .mistral import MistralProviderClient
 from .openai import OpenAIProviderClient
 from .openrouter import OpenRouterProviderClient
 
+_CACHE_HITS = CACHE_LOOKUPS.labels("provider_catalogue", "hit")
+_CACHE_STALE = CACHE_LOOKUPS.labels("provider_catalogue", "stale")
+_CACHE_MISSES = CACHE_LOOKUPS.labels("provider_catalogue", "miss")
+
+# Wall-clock seconds; patched by tests.
+_clock = time.time
+
 
 @dataclass(frozen=True)
 class _ProviderConfig:
@@ -32,10 +67,56 @@ class _ProviderConfig:
     metadata: Mapping[str, Any] | None
 
 
+class _SharedModels(list):
+    """A catalogue's models, shared by every cache key with identical content."""
+
+    __slots__ = ("digest", "size", "by_id", "_search_index", "__weakref__")
+
+    @property
+    def search_index(self) -> CatalogueIndex:
+        """The filter index over these models, built on first use."""
+
+        index = getattr(self, "_search_index", None)
+        if index is None:
+            index = self._search_index = CatalogueIndex(self)
+        return index
+
+
+class CatalogueModels(list):
+    """Models returned by a listing, with the outcome of each provider's fetch.
+
+    ``segments`` are the per-provider catalogues the models were concatenated
+    from, so filters can use each cached catalogue's search index.
+    """
+
+    __slots__ = ("provider_status", "segments")
+
+    def __init__(
+        self,
+        models: Iterable[ProviderModel] = (),
+        provider_status: Iterable[ProviderCatalogueStatus] = (),
+        segments: Iterable[Sequence[ProviderModel]] = (),
+    ) -> None:
+        super().__init__(models)
+        self.provider_status = list(provider_status)
+        self.segments = list(segments)
+
+    @property
+    def partial(self) -> bool:
+        """True when a provider missed the deadline and contributed nothing."""
+
+        return any(status.status == "timeout" for status in self.provider_status)
+
+
 @dataclass(frozen=True)
 class _CacheEntry:
-    expires_at: datetime
+    expires_at: float
+    stale_until: float
     models: list[ProviderModel]
+    # The client that produced the entry, reused to refresh it off the request path.
+    client: Any = field(default=None, compare=False, repr=False)
+    # The last fetch failed; ``models`` are the previous ones, if any.
+    failed: bool = False
 
 
 class ProviderModelCatalogue:
@@ -50,8 +131,10 @@ class ProviderModelCatalogue:
         *,
         clients: Iterable[ProviderClient] | None = None,
         client_factories: Mapping[str, type[ProviderClient]] | None = None,
+        store: CatalogueStore | None = None,
     ) -> None:
         self._settings = settings
+        self._store = store if store is not None else get_catalogue_store(settings)
         self._clients_override = list(clients) if clients is not None else None
         self._logger = logging.getLogger("app.services.providers.catalogue")
         self._client_factories: dict[str, type[ProviderClient]] = (
@@ -70,6 +153,15 @@ class ProviderModelCatalogue:
         self._cache_ttl_seconds = self._coerce_ttl(
             getattr(settings, "provider_catalogue_cache_ttl", 300)
         )
+        self._max_stale_seconds = self._coerce_ttl(
+            getattr(settings, "provider_catalogue_max_stale", 900)
+        )
+        self._error_ttl_seconds = self._coerce_ttl(
+            getattr(settings, "provider_catalogue_error_ttl", 30)
+        )
+        self._max_entries = max(
+            1, self._coerce_ttl(getattr(settings, "provider_catalogue_cache_max_entries", 1024))
+        )
         self._provider_timeout = self._coerce_timeout(
             getattr(settings, "provider_catalogue_provider_timeout", self.PROVIDER_TIMEOUT),
             self.PROVIDER_TIMEOUT,
@@ -87,43 +179,59 @@ class ProviderModelCatalogue:
             )
             self._provider_timeout = self._total_timeout
 
-    _cache: dict[str, "_CacheEntry"] = {}
-    _locks: dict[str, asyncio.Lock] = {}
+    _cache: OrderedDict[str, "_CacheEntry"] = OrderedDict()
+    # Catalogue content by digest; an entry disappears with the last key using it.
+    _catalogues: weakref.WeakValueDictionary[str, _SharedModels] = weakref.WeakValueDictionary()
+    # One fetch per cache key, shared by concurrent misses and background refreshes.
+    _refreshing: dict[str, "asyncio.Task[list[ProviderModel]]"] = {}
+    # Lookups per cache key since the refresher last ran.
+    _requests: Counter[str] = Counter()
+    _lookups: Counter[str] = Counter()
+    _evictions = 0
 
     async def list_all_models(
         self,
         providers: Sequence[object] | None = None,
-    ) -> list[ProviderModel]:
-        """Return models from every configured provider."""
+    ) -> CatalogueModels:
+        """Return models from every configured provider.
+
+        Providers still fetching when ``PROVIDER_CATALOGUE_TOTAL_TIMEOUT``
+        lapses are reported as ``timeout``; the others' models are returned.
+        """
 
         clients = self._get_clients(providers)
         if not clients:
             self._logger.warning("No provider clients available for catalogue lookup")
-            return []
+            return CatalogueModels()
+        return await self._collect(clients, self._total_timeout)
 
-        try:
-            return await asyncio.wait_for(
-                self._gather_models_concurrent(clients),
-                timeout=self._total_timeout if self._total_timeout > 0 else None,
-            )
-        except asyncio.TimeoutError:
-            self._logger.error(
-                "Provider catalogue fetch exceeded %.2fs timeout; returning partial results.",
-                self._total_timeout,
-            )
-            return []
+    async def stream_all_models(
+        self,
+        providers: Sequence[object] | None = None,
+    ) -> AsyncIterator[tuple[ProviderCatalogueStatus, list[ProviderModel]]]:
+        """Yield each provider's status and models as soon as its fetch completes.
+
+        Providers that miss the total timeout are yielded last, as ``timeout``.
+        """
+
+        clients = self._get_clients(providers)
+        if not clients:
+            self._logger.warning("No provider clients available for catalogue lookup")
+            return
+        async for _index, status, models in self._iter_fetches(clients, self._total_timeout):
+            yield status, models
 
     async def list_models_for_provider(
         self,
         provider: str,
         providers: Sequence[object] | None = None,
-    ) -> list[ProviderModel]:
+    ) -> CatalogueModels:
         """Return models for a single provider if supported."""
 
         provider_key = provider.lower()
         if provider_key not in self._client_factories:
             self._logger.warning("Requested unsupported provider catalogue: %s", provider)
-            return []
+            return CatalogueModels()
         clients = [
             client
             for client in self._get_clients(providers)
@@ -131,18 +239,8 @@ class ProviderModelCatalogue:
         ]
         if not clients:
             self._logger.warning("Provider %s is not configured for this user", provider)
-            return []
-
-        try:
-            return await asyncio.wait_for(
-                self._gather_models_concurrent(clients),
-                timeout=self._provider_timeout if self._provider_timeout > 0 else None,
-            )
-        except asyncio.TimeoutError:
-            self._logger.error(
-                "Provider %s catalogue fetch exceeded %.2fs timeout", provider, self._provider_timeout
-            )
-            return []
+            return CatalogueModels()
+        return await self._collect(clients, self._provider_timeout)
 
     def _get_clients(self, providers: Sequence[object] | None) -> list[ProviderClient]:
         if self._clients_override is not None:
@@ -313,73 +411,234 @@ class ProviderModelCatalogue:
 
         return fallbacks
 
-    async def _gather_models_concurrent(self, clients: Sequence[ProviderClient]) -> list[ProviderModel]:
-        if not clients:
-            return []
+    async def _collect(self, clients: Sequence[ProviderClient], timeout: float) -> CatalogueModels:
+        results = sorted(
+            [result async for result in self._iter_fetches(clients, timeout)],
+            key=lambda result: result[0],
+        )
+        collected = CatalogueModels(
+            provider_status=[status for _index, status, _models in results],
+            segments=[models for _index, _status, models in results if models],
+        )
+        for segment in collected.segments:
+            collected.extend(segment)
+        return collected
 
-        tasks = [
-            self._fetch_with_timeout(client, self._resolve_client_timeout(client))
-            for client in clients
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        models: list[ProviderModel] = []
-        for index, result in enumerate(results):
-            if isinstance(result, Exception):
-                client = clients[index]
-                self._logger.error(
-                    "Provider %s fetch failed with unexpected exception: %s",
-                    getattr(client, "provider", "unknown"),
-                    result,
+    async def _iter_fetches(
+        self,
+        clients: Sequence[ProviderClient],
+        timeout: float,
+    ) -> AsyncIterator[tuple[int, ProviderCatalogueStatus, list[ProviderModel]]]:
+        """Yield ``(client index, status, models)`` in completion order until ``timeout``.
+
+        Abandoning a fetch only cancels the wait for it: the shared fetch task
+        keeps running and still fills the cache for the next request.
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout > 0 else None
+        pending = {
+            asyncio.ensure_future(self._fetch_status(client)): index
+            for index, client in enumerate(clients)
+        }
+        try:
+            while pending:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
                 )
-                continue
-            models.extend(result)
-        return models
+                for task in done:
+                    index = pending.pop(task)
+                    status, models = task.result()
+                    yield index, status, models
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending:
+            late = sorted(pending.values())
+            self._logger.error(
+                "Provider catalogue fetch exceeded %.2fs timeout; returning partial results without %s",
+                timeout,
+                ", ".join(clients[index].provider for index in late),
+            )
+            for index in late:
+                yield index, ProviderCatalogueStatus(provider=clients[index].provider, status="timeout"), []
+
+    async def _fetch_status(
+        self, client: ProviderClient
+    ) -> tuple[ProviderCatalogueStatus, list[ProviderModel]]:
+        provider = getattr(client, "provider", "unknown")
+        try:
+            models = await self._fetch_with_timeout(client, self._resolve_client_timeout(client))
+        except Exception as exc:  # noqa: BLE001 - one provider must not fail the listing
+            self._logger.error("Provider %s fetch failed with unexpected exception: %s", provider, exc)
+            return ProviderCatalogueStatus(provider=provider, status="error"), []
+        status = ProviderCatalogueStatus(
+            provider=provider, status=self._fetch_outcome(client), model_count=len(models)
+        )
+        return status, models
+
+    def _fetch_outcome(self, client: ProviderClient) -> str:
+        entry = self._cache.get(self._build_cache_key(client))
+        if entry is None:
+            return "ok"
+        if entry.failed:
+            return "stale" if entry.models else "error"
+        return "stale" if entry.expires_at <= _clock() else "ok"
 
     async def _fetch_with_timeout(
         self,
         client: ProviderClient,
         timeout: float,
     ) -> list[ProviderModel]:
+        """Return ``client``'s catalogue; a cached list is returned as is and must not be mutated."""
+
         cache_key = self._build_cache_key(client)
-        cached = self._cache_lookup(cache_key)
+        cached = self._serve_cached(cache_key, client, timeout)
         if cached is not None:
+            return cached
+
+        _CACHE_MISSES.inc()
+        self._lookups["miss"] += 1
+        task = self._refreshing.get(cache_key)
+        if task is None or task.done():
+            task = self._spawn(cache_key, self._load(cache_key, client, timeout))
+        return await asyncio.shield(task)
+
+    def _serve_cached(
+        self,
+        cache_key: str,
+        client: ProviderClient,
+        timeout: float,
+    ) -> list[ProviderModel] | None:
+        entry = self._cache_lookup(cache_key)
+        if entry is None:
+            return None
+        self._requests[cache_key] += 1
+        if entry.expires_at > _clock():
+            _CACHE_HITS.inc()
+            self._lookups["hit"] += 1
             self._logger.debug(
                 "Serving cached model catalogue for provider %s", client.provider
             )
-            return cached
+        else:
+            _CACHE_STALE.inc()
+            self._lookups["stale"] += 1
+            self._logger.debug(
+                "Serving stale model catalogue for provider %s while it refreshes", client.provider
+            )
+            self._schedule_refresh(cache_key, client, timeout)
+        return entry.models
+
+    def _schedule_refresh(
+        self, cache_key: str, client: ProviderClient, timeout: float
+    ) -> "asyncio.Task[list[ProviderModel]]":
+        task = self._refreshing.get(cache_key)
+        if task is None or task.done():
+            task = self._spawn(cache_key, self._refresh(cache_key, client, timeout))
+        return task
+
+    def _spawn(self, cache_key: str, fetch: Any) -> "asyncio.Task[list[ProviderModel]]":
+        task = asyncio.create_task(fetch)
+        task.add_done_callback(lambda done: self._forget_refresh(cache_key, done))
+        self._refreshing[cache_key] = task
+        return task
 
-        lock = self._locks.setdefault(cache_key, asyncio.Lock())
-        async with lock:
-            cached = self._cache_lookup(cache_key)
-            if cached is not None:
-                self._logger.debug(
-                    "Serving cached model catalogue for provider %s", client.provider
-                )
-                return cached
-            try:
-                models = await asyncio.wait_for(
-                    client.list_models(),
-                    timeout=timeout if timeout > 0 else None,
-                )
-            except asyncio.TimeoutError:
-                self._logger.error(
-                    "Provider %s exceeded %.2fs timeout when fetching catalogue",
-                    client.provider,
-                    timeout,
-                )
-                models = []
-            except Exception:  # pragma: no cover - defensive catch-all
-                self._logger.exception(
-                    "Failed to fetch models from provider %s", client.provider
-                )
-                models = []
+    @classmethod
+    def _forget_refresh(cls, cache_key: str, task: "asyncio.Task[list[ProviderModel]]") -> None:
+        if cls._refreshing.get(cache_key) is task:
+            del cls._refreshing[cache_key]
+
+    async def _load(
+        self,
+        cache_key: str,
+        client: ProviderClient,
+        timeout: float,
+    ) -> list[ProviderModel]:
+        """Answer an in-memory miss from the second-tier store, else the provider."""
+
+        stored = await self._read_store(cache_key)
+        if stored is None:
+            return await self._refresh(cache_key, client, timeout)
+        expires_at, stale_until, models = stored
+        shared = self._share(models)
+        self._put(
+            cache_key,
+            _CacheEntry(expires_at=expires_at, stale_until=stale_until, models=shared, client=client),
+        )
+        if expires_at <= _clock():
+            # Replaces this task as the key's in-flight fetch.
+            self._spawn(cache_key, self._refresh(cache_key, client, timeout))
+        return shared
+
+    async def _read_store(self, cache_key: str) -> tuple[float, float, list[ProviderModel]] | None:
+        if self._store is None or self._cache_ttl_seconds <= 0:
+            return None
+        try:
+            blob = await self._store.get(store_key(cache_key))
+        except Exception as exc:  # noqa: BLE001 - the store is an optimisation
+            self._logger.warning("Provider catalogue %s store read failed: %s", self._store.name, exc)
+            return None
+        stored = decode_entry(blob) if blob else None
+        if stored is None or stored[1] <= _clock():
+            return None
+        return stored
+
+    async def _write_store(self, cache_key: str, entry: _CacheEntry) -> None:
+        if self._store is None:
+            return
+        ttl = entry.stale_until - _clock()
+        if ttl <= 0:
+            return
+        try:
+            await self._store.set(
+                store_key(cache_key), encode_entry(entry.expires_at, entry.stale_until, entry.models), ttl
+            )
+        except Exception as exc:  # noqa: BLE001 - the store is an optimisation
+            self._logger.warning("Provider catalogue %s store write failed: %s", self._store.name, exc)
+
+    async def _refresh(
+        self,
+        cache_key: str,
+        client: ProviderClient,
+        timeout: float,
+    ) -> list[ProviderModel]:
+        """Fetch ``client``'s catalogue and store the outcome under ``cache_key``.
+
+        A failure keeps serving the previous models, if they are still within
+        the max-stale window, and otherwise caches an empty catalogue; either
+        way the next attempt waits ``PROVIDER_CATALOGUE_ERROR_TTL`` seconds.
+        """
+
+        try:
+            models = await asyncio.wait_for(
+                client.list_models(),
+                timeout=timeout if timeout > 0 else None,
+            )
+        except asyncio.TimeoutError:
+            self._logger.error(
+                "Provider %s exceeded %.2fs timeout when fetching catalogue",
+                client.provider,
+                timeout,
+            )
+        except Exception:  # pragma: no cover - defensive catch-all
+            self._logger.exception(
+                "Failed to fetch models from provider %s", client.provider
+            )
+        else:
             if not models:
                 self._logger.info(
                     "Provider %s returned no models or is not configured", client.provider
                 )
-            self._store_cache(cache_key, models)
-            return list(models)
+            entry = self._store_cache(cache_key, models, client)
+            if entry is None:
+                return models
+            await self._write_store(cache_key, entry)
+            return entry.models
+        return self._store_failure(cache_key, client)
 
     def _resolve_client_timeout(self, client: ProviderClient) -> float:
         metadata = getattr(client, "metadata", None)
@@ -425,26 +684,139 @@ class ProviderModelCatalogue:
         """
 
         cls._cache.clear()
-        cls._locks.clear()
+        cls._catalogues.clear()
+        cls._refreshing.clear()
+        cls._requests.clear()
+        cls._lookups.clear()
+        cls._evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Occupancy and hit counters for ``/health/caches``; never exposes keys."""
+
+        catalogues = list(self._catalogues.values())
+        lookups = sum(self._lookups.values())
+        return {
+            "hits": self._lookups["hit"],
+            "stale_hits": self._lookups["stale"],
+            "misses": self._lookups["miss"],
+            "hit_ratio": round((self._lookups["hit"] + self._lookups["stale"]) / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "entries": len(self._cache),
+            "max_entries": self._max_entries,
+            "distinct_catalogues": len(catalogues),
+            "models": sum(len(models) for models in catalogues),
+            "approx_bytes": sum(models.size for models in catalogues),
+            "refreshing": len(self._refreshing),
+        }
+
+    @classmethod
+    def cached_model(cls, provider: str, model_id: str) -> ProviderModel | None:
+        """Return ``model_id`` from any servable cached catalogue of ``provider``.
+
+        Never triggers a fetch, so it is safe to call on latency-sensitive paths.
+        """
+
+        prefix = str(provider).lower()
+        now = _clock()
+        # Keys with identical catalogues share one list; look into each only once.
+        seen: set[int] = set()
+        for cache_key, entry in cls._cache.items():
+            models = entry.models
+            if id(models) in seen or entry.stale_until <= now or cache_key.partition("|")[0] != prefix:
+                continue
+            seen.add(id(models))
+            by_id = getattr(models, "by_id", None)
+            if by_id is not None:
+                model = by_id.get(model_id)
+                if model is not None:
+                    return model
+                continue
+            for model in models:
+                if model.id == model_id:
+                    return model
+        return None
+
+    def _cache_lookup(self, cache_key: str) -> _CacheEntry | None:
+        """Return the entry for ``cache_key`` while it may be served, fresh or stale."""
 
-    def _cache_lookup(self, cache_key: str) -> list[ProviderModel] | None:
         if self._cache_ttl_seconds <= 0:
             return None
         entry = self._cache.get(cache_key)
         if entry is None:
             return None
-        if entry.expires_at <= datetime.now(tz=timezone.utc):
+        if entry.stale_until <= _clock():
             self._cache.pop(cache_key, None)
+            self._requests.pop(cache_key, None)
             return None
-        return list(entry.models)
+        self._cache.move_to_end(cache_key)
+        return entry
 
-    def _store_cache(self, cache_key: str, models: list[ProviderModel]) -> None:
+    def _store_cache(
+        self, cache_key: str, models: list[ProviderModel], client: ProviderClient
+    ) -> _CacheEntry | None:
         if self._cache_ttl_seconds <= 0:
-            return
-        expires_at = datetime.now(tz=timezone.utc) + timedelta(
-            seconds=self._cache_ttl_seconds
+            return None
+        expires_at = _clock() + self._cache_ttl_seconds
+        entry = _CacheEntry(
+            expires_at=expires_at,
+            stale_until=expires_at + self._max_stale_seconds,
+            models=self._share(models),
+            client=client,
+        )
+        self._put(cache_key, entry)
+        return entry
+
+    def _store_failure(self, cache_key: str, client: ProviderClient) -> list[ProviderModel]:
+        if self._cache_ttl_seconds <= 0:
+            return []
+        now = _clock()
+        retry_at = now + self._error_ttl_seconds
+        previous = self._cache.get(cache_key)
+        if previous is not None and previous.models and previous.stale_until > now:
+            # Keep the last good catalogue, but never beyond its max-stale bound.
+            self._put(
+                cache_key,
+                replace(previous, expires_at=min(retry_at, previous.stale_until), failed=True),
+            )
+            return previous.models
+        empty = self._share([])
+        self._put(
+            cache_key,
+            _CacheEntry(expires_at=retry_at, stale_until=retry_at, models=empty, client=client, failed=True),
         )
-        self._cache[cache_key] = _CacheEntry(expires_at=expires_at, models=list(models))
+        return empty
+
+    def _put(self, cache_key: str, entry: _CacheEntry) -> None:
+        cache = self._cache
+        cache[cache_key] = entry
+        cache.move_to_end(cache_key)
+        while len(cache) > self._max_entries:
+            evicted, _entry = cache.popitem(last=False)
+            self._requests.pop(evicted, None)
+            type(self)._evictions += 1
+
+    def _share(self, models: Sequence[ProviderModel]) -> _SharedModels:
+        """Return the shared copy of a catalogue with exactly these models."""
+
+        digest = hashlib.sha256()
+        size = 0
+        for model in models:
+            dump = getattr(model, "model_dump_json", None)
+            payload = (dump() if callable(dump) else json.dumps(model, sort_keys=True, default=str)).encode("utf-8")
+            digest.update(payload)
+            digest.update(b"\n")
+            size += len(payload)
+        key = digest.hexdigest()
+        shared = self._catalogues.get(key)
+        if shared is None:
+            shared = _SharedModels(models)
+            shared.digest = key
+            shared.size = size
+            shared.by_id = {}
+            for model in shared:
+                shared.by_id.setdefault(model.id, model)
+            self._catalogues[key] = shared
+        return shared
 
     def _build_cache_key(self, client: ProviderClient) -> str:
         provider = getattr(client, "provider", "unknown")
@@ -497,4 +869,92 @@ class ProviderModelCatalogue:
         return timeout if timeout > 0 else default
 
 
-__all__ = ["ProviderModelCatalogue"]
+class CatalogueRefresher:
+    """Refetch the most requested catalogues before they go stale.
+
+    Every ``interval`` seconds the ``top`` cache keys looked up most often
+    since the previous round are refreshed if they expire within the next
+    round, so popular provider configurations are never served stale.
+    """
+
+    def __init__(self, settings: Settings, *, top: int | None = None, interval: float | None = None) -> None:
+        self._catalogue = ProviderModelCatalogue(settings)
+        self._top = int(getattr(settings, "provider_catalogue_prewarm_top", 20) if top is None else top)
+        ttl = self._catalogue._cache_ttl_seconds
+        self._interval = float(interval if interval is not None else max(ttl / 4, 5.0))
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._top <= 0 or self._catalogue._cache_ttl_seconds <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def prewarm(self) -> int:
+        """Refresh popular entries expiring within one interval; returns how many."""
+
+        catalogue = self._catalogue
+        popular = [key for key, _count in catalogue._requests.most_common(self._top)]
+        catalogue._requests.clear()
+        deadline = _clock() + self._interval
+        refreshes = []
+        for cache_key in popular:
+            entry = catalogue._cache.get(cache_key)
+            if entry is None or entry.client is None or entry.expires_at > deadline:
+                continue
+            if cache_key in catalogue._refreshing:
+                continue
+            client = entry.client
+            # Registered like any refresh, so requests meanwhile join this fetch;
+            # shielded so stopping the refresher does not cancel it under them.
+            task = catalogue._schedule_refresh(cache_key, client, catalogue._resolve_client_timeout(client))
+            refreshes.append(asyncio.shield(task))
+        await asyncio.gather(*refreshes, return_exceptions=True)
+        return len(refreshes)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.prewarm()
+            except Exception:  # pragma: no cover - keep the loop alive
+                logging.getLogger("app.services.providers.catalogue").exception(
+                    "Provider catalogue pre-warm failed"
+                )
+
+
+_refresher: CatalogueRefresher | None = None
+
+
+def get_catalogue_refresher(settings: Settings | None = None) -> CatalogueRefresher:
+    """Return the process-wide :class:`CatalogueRefresher`."""
+
+    global _refresher
+    if _refresher is None:
+        if settings is None:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+        _refresher = CatalogueRefresher(settings)
+    return _refresher
+
+
+async def close_catalogue_refresher() -> None:
+    global _refresher
+    refresher, _refresher = _refresher, None
+    if refresher is not None:
+        await refresher.aclose()
+
+
+__all__ = [
+    "CatalogueModels",
+    "CatalogueRefresher",
+    "ProviderModelCatalogue",
+    "close_catalogue_refresher",
+    "get_catalogue_refresher",
+]
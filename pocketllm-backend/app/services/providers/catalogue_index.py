@@ -0,0 +1,193 @@
+"""Substring search over provider model catalogues.
+
+``/v1/models`` filters (``name``, ``model_id`` and the free-text ``query``)
+are case-insensitive substring matches. :class:`CatalogueIndex` lower-cases
+each searchable field once and packs it into a single string per field, so a
+lookup is a handful of ``str.find`` calls over the packed text instead of
+lower-casing and ``str()``-ing every model's metadata on every request. The
+catalogue keeps one index per cached catalogue, built on its first search.
+
+Matches are ranked by where the term occurs: an exact name or id, then a
+name or id prefix, then the start of a word in either, then anywhere in
+either, then only in the description or metadata. Ties keep catalogue order.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+from collections.abc import Iterable, Sequence
+
+from app.schemas.providers import ProviderModel
+
+_SEPARATOR = "\x00"
+
+# Ranks, best first.
+_EXACT, _PREFIX, _WORD_PREFIX, _SUBSTRING, _DETAILS = range(5)
+# Check candidates one by one once they are fewer than 1 in this many models.
+_VERIFY_RATIO = 8
+
+
+class _PackedField:
+    """Lower-cased values joined into one string and searched with ``str.find``."""
+
+    __slots__ = ("_corpus", "_starts")
+
+    def __init__(self, values: Iterable[str]) -> None:
+        lowered = [value.lower() for value in values]
+        self._corpus = _SEPARATOR.join(lowered)
+        self._starts: list[int] = []
+        offset = 0
+        for value in lowered:
+            self._starts.append(offset)
+            offset += len(value) + 1
+
+    def value(self, position: int) -> str:
+        start = self._starts[position]
+        end = self._starts[position + 1] - 1 if position + 1 < len(self._starts) else len(self._corpus)
+        return self._corpus[start:end]
+
+    def find_all(self, needle: str) -> set[int]:
+        """Positions of the values containing ``needle`` (already lower-cased)."""
+
+        if _SEPARATOR in needle:
+            return set()
+        corpus, starts = self._corpus, self._starts
+        found: set[int] = set()
+        offset = corpus.find(needle)
+        while offset != -1:
+            position = bisect.bisect_right(starts, offset) - 1
+            found.add(position)
+            if position + 1 == len(starts):
+                break
+            offset = corpus.find(needle, starts[position + 1])
+        return found
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
+def _details(model: ProviderModel) -> str:
+    parts = []
+    if model.description:
+        parts.append(model.description)
+    if model.metadata:
+        parts.append(str(model.metadata))
+    return _SEPARATOR.join(parts)
+
+
+class CatalogueIndex:
+    """Packed, lower-cased text of one catalogue's models for filtered lookups.
+
+    The index holds no reference to the models: :meth:`search` returns their
+    positions in the sequence it was built from.
+    """
+
+    __slots__ = ("_names", "_ids", "_details")
+
+    def __init__(self, models: Sequence[ProviderModel]) -> None:
+        self._names = _PackedField(model.name for model in models)
+        self._ids = _PackedField(model.id for model in models)
+        self._details = _PackedField(_details(model) for model in models)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(
+        self,
+        *,
+        name: str | None = None,
+        model_id: str | None = None,
+        query: str | None = None,
+    ) -> list[tuple[int, int]]:
+        """Return ``(rank, position)`` for every model matching all filters, best first."""
+
+        name, model_id, query = (value.lower() if value else None for value in (name, model_id, query))
+        # Rank by the free-text term if there is one, else by the scoped filter.
+        term = query or name or model_id
+        scoped = (
+            (name, (self._names,)),
+            (model_id, (self._ids,)),
+            (query, (self._names, self._ids, self._details)),
+        )
+        matches: set[int] | None = None
+        ranked: Sequence[_PackedField] = ()
+        ranked_hits: set[int] = set()
+        for needle, fields in scoped:
+            if not needle:
+                continue
+            if matches is not None and len(matches) * _VERIFY_RATIO < len(self):
+                # Few candidates left: checking them beats scanning the packed text.
+                per_field = [
+                    {position for position in matches if needle in field.value(position)} for field in fields
+                ]
+            else:
+                per_field = [field.find_all(needle) for field in fields]
+            found = set().union(*per_field)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+            if needle is term:
+                ranked = fields[:2]
+                ranked_hits = set().union(*per_field[:2])
+        if matches is None:
+            return [(_EXACT, position) for position in range(len(self))]
+
+        return sorted(
+            (
+                _rank(term, [field.value(position) for field in ranked]) if position in ranked_hits else _DETAILS,
+                position,
+            )
+            for position in matches
+        )
+
+
+def _rank(term: str, texts: Sequence[str]) -> int:
+    best = _DETAILS
+    for text in texts:
+        if text == term:
+            return _EXACT
+        offset = text.find(term)
+        if offset == 0:
+            best = _PREFIX
+            continue
+        while offset != -1 and best > _WORD_PREFIX:
+            best = min(best, _WORD_PREFIX if not text[offset - 1].isalnum() else _SUBSTRING)
+            offset = text.find(term, offset + 1)
+    return best
+
+
+def index_for(models: Sequence[ProviderModel]) -> CatalogueIndex:
+    """Return the index cached on ``models`` if it has one, else build one."""
+
+    index = getattr(models, "search_index", None)
+    return index if index is not None else CatalogueIndex(models)
+
+
+def search_models(
+    segments: Sequence[Sequence[ProviderModel]],
+    *,
+    name: str | None = None,
+    model_id: str | None = None,
+    query: str | None = None,
+    limit: int | None = None,
+) -> list[ProviderModel]:
+    """Filter and rank the models of several catalogues, keeping at most ``limit``.
+
+    Without filters the models are returned in catalogue order.
+    """
+
+    if not any([name, model_id, query]):
+        models = [model for segment in segments for model in segment]
+        return models if limit is None else models[:limit]
+
+    hits = [
+        (rank, number, position)
+        for number, segment in enumerate(segments)
+        for rank, position in index_for(segment).search(name=name, model_id=model_id, query=query)
+    ]
+    best = sorted(hits) if limit is None else heapq.nsmallest(limit, hits)
+    return [segments[number][position] for _rank, number, position in best]
+
+
+__all__ = ["CatalogueIndex", "index_for", "search_models"]
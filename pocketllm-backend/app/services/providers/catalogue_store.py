@@ -0,0 +1,215 @@
+"""Second-tier provider catalogue cache shared across workers and cold starts.
+
+:class:`~app.services.providers.catalogue.ProviderModelCatalogue` consults a
+store on an in-memory miss before fanning out to the provider, and writes
+every successful fetch back to it. ``PROVIDER_CATALOGUE_STORE`` selects the
+backend: ``sqlite`` (a local file at ``PROVIDER_CATALOGUE_STORE_PATH``, shared
+by the workers of one host) or ``redis`` (``REDIS_URL``, shared by every
+instance). Entries are zlib-compressed JSON, keyed by a SHA-256 of the
+in-memory cache key, and expire with the entry's max-stale bound. Store
+failures are logged and treated as misses; they never fail a request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.schemas.providers import ProviderModel
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "pocketllm:catalogue:"
+_FORMAT_VERSION = 1
+
+
+def encode_entry(expires_at: float, stale_until: float, models: Sequence[ProviderModel]) -> bytes:
+    """Serialise a catalogue entry compactly (JSON without nulls, zlib)."""
+
+    payload = {
+        "v": _FORMAT_VERSION,
+        "e": expires_at,
+        "s": stale_until,
+        "m": [model.model_dump(mode="json", exclude_none=True) for model in models],
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_entry(blob: bytes) -> tuple[float, float, list[ProviderModel]] | None:
+    """Inverse of :func:`encode_entry`; ``None`` for unreadable or foreign data."""
+
+    try:
+        payload = json.loads(zlib.decompress(blob))
+        if payload.get("v") != _FORMAT_VERSION:
+            return None
+        models = [ProviderModel.model_validate(item) for item in payload["m"]]
+        return float(payload["e"]), float(payload["s"]), models
+    except Exception:  # noqa: BLE001 - any corrupt entry is just a miss
+        logger.debug("Ignoring unreadable catalogue store entry", exc_info=True)
+        return None
+
+
+def store_key(cache_key: str) -> str:
+    return _KEY_PREFIX + hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+
+
+class CatalogueStore(ABC):
+    """Byte-oriented key/value store with per-entry expiry."""
+
+    name: str
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Return the value stored under ``key``, or ``None`` if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+
+    async def aclose(self) -> None:
+        """Release connections; the default store holds none."""
+
+
+class SQLiteCatalogueStore(CatalogueStore):
+    """Entries in a local SQLite file, usable by several processes at once."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            connection.execute("pragma journal_mode=wal")
+            connection.execute(
+                "create table if not exists catalogue_cache ("
+                "key text primary key, delete_after real not null, payload blob not null)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._connect().execute(
+                "select payload from catalogue_cache where key = ? and delete_after > ?",
+                (key, time.time()),
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def _set(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "insert or replace into catalogue_cache (key, delete_after, payload) values (?, ?, ?)",
+                (key, now + ttl, value),
+            )
+            connection.execute("delete from catalogue_cache where delete_after <= ?", (now,))
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
+
+
+class RedisCatalogueStore(CatalogueStore):
+    """Entries in Redis (or any server speaking its protocol), expiring via ``PX``."""
+
+    name = "redis"
+
+    def __init__(self, url: str | None = None, *, client: Any | None = None) -> None:
+        if client is None:
+            if not url:
+                raise ValueError("REDIS_URL is required for the redis catalogue store")
+            from redis.asyncio import Redis
+
+            client = Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self._client = client
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(key, value, px=max(int(ttl * 1000), 1))
+
+    async def aclose(self) -> None:
+        close = getattr(self._client, "aclose", None)
+        if close is not None:
+            await close()
+
+
+def build_catalogue_store(settings: "Settings") -> CatalogueStore | None:
+    """Create the store selected by ``PROVIDER_CATALOGUE_STORE``, if any."""
+
+    backend = str(getattr(settings, "provider_catalogue_store", "") or "").lower()
+    if backend in {"", "none"}:
+        return None
+    if backend == "sqlite":
+        return SQLiteCatalogueStore(
+            getattr(settings, "provider_catalogue_store_path", None) or "/tmp/pocketllm-catalogue.sqlite3"
+        )
+    if backend == "redis":
+        return RedisCatalogueStore(getattr(settings, "redis_url", None))
+    raise ValueError(f"Unknown provider catalogue store {backend!r}")
+
+
+_store: CatalogueStore | None = None
+_store_built = False
+
+
+def get_catalogue_store(settings: "Settings" | None = None) -> CatalogueStore | None:
+    """Return the process-wide second-tier store, or ``None`` when disabled."""
+
+    global _store, _store_built
+    if not _store_built:
+        if settings is None:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+        _store = build_catalogue_store(settings)
+        _store_built = True
+    return _store
+
+
+async def close_catalogue_store() -> None:
+    global _store, _store_built
+    store, _store, _store_built = _store, None, False
+    if store is not None:
+        await store.aclose()
+
+
+__all__ = [
+    "CatalogueStore",
+    "RedisCatalogueStore",
+    "SQLiteCatalogueStore",
+    "build_catalogue_store",
+    "close_catalogue_store",
+    "decode_entry",
+    "encode_entry",
+    "get_catalogue_store",
+    "store_key",
+]
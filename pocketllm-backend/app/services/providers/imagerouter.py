@@ -9,6 +9,7 @@ from typing import Any, Mapping
 import httpx
 
 from app.core.config import Settings
+from app.core.http_clients import provider_http_client
 from app.schemas.providers import ProviderModel
 
 from .base import ProviderClient
@@ -71,13 +72,9 @@ class ImageRouterProviderClient(ProviderClient):
         headers = self._build_headers(api_key)
 
         try:
-            async with httpx.AsyncClient(
-                base_url=self.base_url,
-                headers=headers,
-                timeout=self.timeout,
-                transport=self._transport,
-            ) as client:
-                response = await client.get(self.models_endpoint)
+            url = self._build_url(self.models_endpoint)
+            async with provider_http_client(url, transport=self._transport) as client:
+                response = await client.get(url, headers=headers, timeout=self.timeout)
                 response.raise_for_status()
                 payload = response.json()
                 models = self._parse_models(payload)
@@ -515,13 +512,14 @@ class ImageRouterProviderClient(ProviderClient):
             payload["n"] = kwargs["num_images"]
 
         try:
-            async with httpx.AsyncClient(
-                base_url=self.base_url,
-                headers=headers,
-                timeout=self.timeout * 2,
-                transport=self._transport,
-            ) as client:
-                response = await client.post("/v1/openai/images/generations", json=payload)
+            url = self._build_url("/v1/openai/images/generations")
+            async with provider_http_client(url, transport=self._transport) as client:
+                response = await client.post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout * 2,
+                )
                 response.raise_for_status()
                 return response.json()
 
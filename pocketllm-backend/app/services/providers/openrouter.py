@@ -10,6 +10,7 @@ from openai import AsyncOpenAI
 from openai import OpenAIError
 
 from app.core.config import Settings
+from app.core.http_clients import provider_http_client
 from app.schemas.providers import ProviderModel
 
 from .base import ProviderClient
@@ -194,13 +195,9 @@ class OpenRouterProviderClient(ProviderClient):
     async def _fetch_payload(self, headers: dict[str, str]) -> Any:
         """Fallback method using direct HTTP requests if OpenAI SDK fails."""
         try:
-            async with httpx.AsyncClient(
-                base_url=self.base_url,
-                headers=headers,
-                timeout=self.timeout,
-                transport=self._transport,
-            ) as client:
-                response = await client.get("/models")
+            url = self._build_url("/models")
+            async with provider_http_client(url, transport=self._transport) as client:
+                response = await client.get(url, headers=headers, timeout=self.timeout)
                 response.raise_for_status()
                 return response.json()
         except Exception as exc:
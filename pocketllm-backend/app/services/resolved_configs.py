@@ -0,0 +1,153 @@
+"""Per-user cache of resolved model configurations and provider records."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any, TypeVar
+from uuid import UUID
+
+from app.core.metrics import CACHE_LOOKUPS
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from app.core.config import Settings
+
+T = TypeVar("T")
+
+_MISSING = object()
+_HITS = CACHE_LOOKUPS.labels("resolved_configs", "hit")
+_MISSES = CACHE_LOOKUPS.labels("resolved_configs", "miss")
+
+
+class ResolvedConfigCache:
+    """TTL + LRU cache of the records a user's chat turns resolve.
+
+    Entries are grouped per user so every write to a user's providers or
+    model configurations drops all of that user's entries at once. Provider
+    records are cached with their decrypted API key; they are held in process
+    memory only and never serialised, logged or reported by :meth:`stats`.
+
+    Writes from other workers are not observed, so ``ttl`` bounds how long a
+    process may keep serving a record changed elsewhere.
+    """
+
+    def __init__(self, *, ttl: float = 60.0, max_users: int = 1024) -> None:
+        self._ttl = ttl
+        self._max_users = max(1, max_users)
+        self._users: OrderedDict[str, dict[Hashable, tuple[float, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: UUID | str, key: Hashable) -> Any:
+        """Return the cached value, or ``None`` when absent or expired."""
+
+        bucket = self._users.get(str(user_id))
+        entry = bucket.get(key) if bucket is not None else None
+        if entry is None or time.monotonic() >= entry[0]:
+            if entry is not None:
+                del bucket[key]  # type: ignore[union-attr]
+            self.misses += 1
+            _MISSES.inc()
+            return None
+        self._users.move_to_end(str(user_id))
+        self.hits += 1
+        _HITS.inc()
+        return entry[1]
+
+    def token(self, user_id: UUID | str) -> object:
+        """Snapshot taken before loading; :meth:`set` ignores stale snapshots.
+
+        A load racing an invalidation would otherwise store the record it read
+        before the write landed.
+        """
+
+        user_key = str(user_id)
+        bucket = self._users.get(user_key)
+        if bucket is None:
+            bucket = self._users[user_key] = {}
+            self._evict()
+        return bucket
+
+    def set(self, user_id: UUID | str, key: Hashable, value: Any, token: object) -> None:
+        if self._ttl <= 0:
+            return
+        bucket = self._users.get(str(user_id))
+        if bucket is None or bucket is not token:
+            return
+        bucket[key] = (time.monotonic() + self._ttl, value)
+        self._users.move_to_end(str(user_id))
+
+    async def get_or_load(
+        self, user_id: UUID | str, key: Hashable, loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        value = self.get(user_id, key)
+        if value is not None:
+            return value
+        token = self.token(user_id)
+        value = await loader()
+        self.set(user_id, key, value, token)
+        return value
+
+    def invalidate(self, user_id: UUID | str) -> None:
+        """Drop everything cached for ``user_id`` after one of their writes."""
+
+        if self._users.pop(str(user_id), _MISSING) is not _MISSING:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._users.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "users": len(self._users),
+            "entries": sum(len(bucket) for bucket in self._users.values()),
+            "max_users": self._max_users,
+            "ttl": self._ttl,
+        }
+
+    def _evict(self) -> None:
+        while len(self._users) > self._max_users:
+            self._users.popitem(last=False)
+            self.evictions += 1
+
+
+_cache: ResolvedConfigCache | None = None
+
+
+def get_resolved_config_cache(settings: "Settings" | None = None) -> ResolvedConfigCache:
+    """Return the process-wide :class:`ResolvedConfigCache`."""
+
+    global _cache
+    if _cache is None:
+        if settings is None:
+            from app.core.config import get_settings
+
+            settings = get_settings()
+        _cache = ResolvedConfigCache(
+            ttl=float(getattr(settings, "resolved_config_cache_ttl", 60.0)),
+            max_users=int(getattr(settings, "resolved_config_cache_max_users", 1024)),
+        )
+    return _cache
+
+
+def invalidate_resolved_configs(user_id: UUID | str) -> None:
+    """Forget ``user_id``'s cached records; a no-op before the cache exists."""
+
+    if _cache is not None:
+        _cache.invalidate(user_id)
+
+
+__all__ = [
+    "ResolvedConfigCache",
+    "get_resolved_config_cache",
+    "invalidate_resolved_configs",
+]
@@ -7,12 +7,14 @@ _SECURITY_EXPORTS = {
     "create_supabase_service_headers",
     "decode_access_token",
     "hash_secret",
+    "invalidate_verified_token",
     "mask_secret",
     "verify_secret",
 }
 
 _CRYPTO_EXPORTS = {
     "encrypt_secret",
+    "decrypt_many",
     "decrypt_secret",
 }
 
@@ -6,10 +6,14 @@ import binascii
 import hashlib
 import logging
 from base64 import urlsafe_b64encode
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from cryptography.fernet import Fernet, InvalidToken
 
+from app.core.timing import timed
+
 if TYPE_CHECKING:  # pragma: no cover - typing helper
     from app.core.config import Settings
 
@@ -23,14 +27,13 @@ def _derive_fernet_token(secret: str) -> bytes:
     return urlsafe_b64encode(digest)
 
 
-def _load_fernet(settings: "Settings") -> Fernet:
-    """Return a :class:`Fernet` instance using the configured key."""
+_INVALID_KEY_MESSAGE = (
+    "Invalid encryption key format. Ensure ENCRYPTION_KEY is a base64 encoded Fernet key or a sufficiently long string."
+)
 
-    key = getattr(settings, "encryption_key", None)
-    if not key:
-        raise RuntimeError(
-            "Application encryption key is not configured. Set ENCRYPTION_KEY to a valid Fernet key."
-        )
+
+def _build_fernet(key: str) -> Fernet:
+    """Return a :class:`Fernet` for ``key``, deriving one from non-Fernet secrets."""
 
     token = key.encode("utf-8")
     try:
@@ -51,37 +54,110 @@ def _load_fernet(settings: "Settings") -> Fernet:
             try:
                 return Fernet(derived_token)
             except Exception as derived_exc:  # pragma: no cover - defensive guard for invalid derived keys
-                raise RuntimeError(
-                    "Invalid encryption key format. Ensure ENCRYPTION_KEY is a base64 encoded Fernet key or a sufficiently long string."
-                ) from derived_exc
-        raise RuntimeError(
-            "Invalid encryption key format. Ensure ENCRYPTION_KEY is a base64 encoded Fernet key or a sufficiently long string."
-        ) from exc
+                raise RuntimeError(_INVALID_KEY_MESSAGE) from derived_exc
+        raise RuntimeError(_INVALID_KEY_MESSAGE) from exc
     except Exception as exc:  # pragma: no cover - defensive guard for invalid keys
+        raise RuntimeError(_INVALID_KEY_MESSAGE) from exc
+
+
+class Keyring:
+    """Fernet instances for the primary key and any legacy keys.
+
+    New secrets are always encrypted with the primary key. Tokens written
+    under a legacy key still decrypt, and callers can collect re-encrypted
+    tokens to migrate them lazily.
+    """
+
+    def __init__(self, primary: str, legacy: Sequence[str] = ()) -> None:
+        self._primary = _build_fernet(primary)
+        self._legacy = tuple(_build_fernet(key) for key in legacy)
+
+    @property
+    def has_legacy_keys(self) -> bool:
+        return bool(self._legacy)
+
+    def encrypt(self, secret: str) -> str:
+        return self._primary.encrypt(secret.encode("utf-8")).decode("utf-8")
+
+    def decrypt(self, token: str, *, rotated: dict[str, str] | None = None) -> str:
+        """Decrypt ``token`` with the primary key, falling back to legacy keys.
+
+        When ``rotated`` is given, a token only a legacy key could open is
+        re-encrypted under the primary key and recorded as ``old -> new``.
+        """
+
+        data = token.encode("utf-8")
+        try:
+            return self._primary.decrypt(data).decode("utf-8")
+        except InvalidToken:
+            pass
+        for fernet in self._legacy:
+            try:
+                secret = fernet.decrypt(data).decode("utf-8")
+            except InvalidToken:
+                continue
+            if rotated is not None:
+                rotated[token] = self.encrypt(secret)
+            return secret
+        logger.error("Failed to decrypt stored secret: invalid token")
+        raise RuntimeError("Stored secret could not be decrypted with the configured key")
+
+    def decrypt_many(
+        self, tokens: Iterable[str], *, rotated: dict[str, str] | None = None
+    ) -> list[str | None]:
+        """Decrypt ``tokens`` in order; undecryptable entries come back as ``None``."""
+
+        results: list[str | None] = []
+        for token in tokens:
+            try:
+                results.append(self.decrypt(token, rotated=rotated))
+            except RuntimeError:
+                results.append(None)
+        return results
+
+
+@lru_cache(maxsize=8)
+def _cached_keyring(primary: str, legacy: tuple[str, ...]) -> Keyring:
+    return Keyring(primary, legacy)
+
+
+def get_keyring(settings: "Settings") -> Keyring:
+    """Return the :class:`Keyring` for the configured keys, built once per key set."""
+
+    key = getattr(settings, "encryption_key", None)
+    if not key:
         raise RuntimeError(
-            "Invalid encryption key format. Ensure ENCRYPTION_KEY is a base64 encoded Fernet key or a sufficiently long string."
-        ) from exc
+            "Application encryption key is not configured. Set ENCRYPTION_KEY to a valid Fernet key."
+        )
+    legacy = getattr(settings, "encryption_legacy_keys", None) or ()
+    if isinstance(legacy, str):
+        legacy = [item for item in (part.strip() for part in legacy.split(",")) if item]
+    return _cached_keyring(key, tuple(legacy))
 
 
 def encrypt_secret(secret: str, settings: "Settings") -> str:
     """Encrypt ``secret`` using the configured Fernet key."""
 
-    fernet = _load_fernet(settings)
-    encrypted = fernet.encrypt(secret.encode("utf-8"))
-    return encrypted.decode("utf-8")
+    return get_keyring(settings).encrypt(secret)
 
 
 def decrypt_secret(token: str, settings: "Settings") -> str:
     """Decrypt ``token`` returning the original secret string."""
 
-    fernet = _load_fernet(settings)
-    try:
-        decrypted = fernet.decrypt(token.encode("utf-8"))
-        return decrypted.decode("utf-8")
-    except InvalidToken as exc:
-        logger.error("Failed to decrypt stored secret: invalid token")
-        raise RuntimeError("Stored secret could not be decrypted with the configured key") from exc
+    with timed("decrypt", "secret"):
+        return get_keyring(settings).decrypt(token)
+
+
+def decrypt_many(
+    tokens: Iterable[str],
+    settings: "Settings",
+    *,
+    rotated: dict[str, str] | None = None,
+) -> list[str | None]:
+    """Decrypt several tokens with one keyring lookup; see :meth:`Keyring.decrypt`."""
 
+    with timed("decrypt", "secrets"):
+        return get_keyring(settings).decrypt_many(tokens, rotated=rotated)
 
-__all__ = ["encrypt_secret", "decrypt_secret"]
 
+__all__ = ["Keyring", "decrypt_many", "decrypt_secret", "encrypt_secret", "get_keyring"]
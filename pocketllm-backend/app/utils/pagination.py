@@ -0,0 +1,143 @@
+"""Keyset (cursor) pagination helpers shared by the list endpoints."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Restrict a select to rows strictly past ``values`` in ``columns`` order.
+
+    ``descending`` must match the direction the query is ordered in, so the
+    row-wise comparison is ``<`` for descending walks and ``>`` otherwise.
+    """
+
+    columns: tuple[str, ...]
+    values: tuple[Any, ...]
+    descending: bool = False
+
+
+@dataclass(frozen=True)
+class Page:
+    """One page of raw rows plus the opaque cursors around it."""
+
+    rows: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+    limit: int
+
+
+def encode_cursor(row: Dict[str, Any], columns: Sequence[str]) -> str:
+    payload = json.dumps([row.get(column) for column in columns], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[str]) -> tuple[Any, ...]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != len(columns) or None in values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+    return tuple(values)
+
+
+def keyset_filter_expression(keyset: Keyset) -> str:
+    """Render ``keyset`` as the body of a PostgREST ``or=(...)`` filter.
+
+    ``(a, b) > (x, y)`` becomes ``a.gt.x,and(a.eq.x,b.gt.y)``; values are
+    quoted because timestamps contain PostgREST's reserved characters.
+    """
+
+    operator = "lt" if keyset.descending else "gt"
+    branches: list[str] = []
+    for index, column in enumerate(keyset.columns):
+        terms = [
+            f"{keyset.columns[prior]}.eq.{_quote(keyset.values[prior])}" for prior in range(index)
+        ]
+        terms.append(f"{column}.{operator}.{_quote(keyset.values[index])}")
+        branches.append(terms[0] if len(terms) == 1 else f"and({','.join(terms)})")
+    return ",".join(branches)
+
+
+async def fetch_page(
+    database: Any,
+    table: str,
+    *,
+    filters: Dict[str, Any],
+    columns: tuple[str, ...] = ("created_at", "id"),
+    descending: bool,
+    limit: Optional[int],
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Page:
+    """Fetch one page of ``table`` ordered by ``columns``.
+
+    ``after`` continues in the natural direction, ``before`` walks back
+    towards the start; both take cursors previously returned in a
+    :class:`Page`.
+    """
+
+    if after and before:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either 'after' or 'before', not both",
+        )
+    size = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+    backwards = before is not None
+    walk_descending = descending != backwards
+    cursor = before if backwards else after
+    keyset = (
+        Keyset(columns, decode_cursor(cursor, columns), walk_descending) if cursor else None
+    )
+
+    rows = await database.select(
+        table,
+        filters=filters,
+        order_by=[(column, walk_descending) for column in columns],
+        limit=size + 1,
+        keyset=keyset,
+    )
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if backwards:
+        rows.reverse()
+
+    first = encode_cursor(rows[0], columns) if rows else None
+    last = encode_cursor(rows[-1], columns) if rows else None
+    if backwards:
+        next_cursor, prev_cursor = last, first if has_more else None
+    else:
+        next_cursor, prev_cursor = last if has_more else None, first if after else None
+    return Page(rows=rows, next_cursor=next_cursor, prev_cursor=prev_cursor, limit=size)
+
+
+def _quote(value: Any) -> str:
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "Keyset",
+    "MAX_PAGE_SIZE",
+    "Page",
+    "decode_cursor",
+    "encode_cursor",
+    "fetch_page",
+    "keyset_filter_expression",
+]
@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
 from typing import Any, Mapping
 
@@ -11,11 +16,96 @@ from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
 from app.core.config import Settings
+from app.core.http_clients import provider_http_client
+from app.core.jwks import get_jwks_cache
 from app.schemas.auth import TokenPayload
 
 
 _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_ASYMMETRIC_ALGORITHMS = frozenset(
+    {"RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512", "EdDSA"}
+)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of remotely verified tokens with single-flight validation.
+
+    Entries are keyed by a SHA-256 of the token, so raw bearer tokens are
+    never held, and are dropped after ``max_age`` seconds or ``expiry_margin``
+    seconds before the token's ``exp``, whichever comes first. Concurrent
+    lookups of the same token share one validation call.
+
+    The cache is per process: :meth:`invalidate` only reaches the worker that
+    handled the sign-out, so ``max_age`` bounds how long other workers keep
+    accepting a revoked token.
+    """
+
+    def __init__(
+        self, *, max_entries: int = 4096, expiry_margin: float = 30.0, max_age: float = 60.0
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._expiry_margin = expiry_margin
+        self._max_age = max_age
+        self._entries: OrderedDict[bytes, tuple[float, TokenPayload]] = OrderedDict()
+        self._inflight: dict[bytes, asyncio.Task[TokenPayload]] = {}
+
+    async def get_or_verify(
+        self, token: str, verify: Callable[[], Awaitable[TokenPayload]]
+    ) -> TokenPayload:
+        key = _token_digest(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.time() < entry[0]:
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(verify())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._store(key, done))
+        return await asyncio.shield(task)
+
+    def invalidate(self, token: str) -> None:
+        key = _token_digest(token)
+        self._entries.pop(key, None)
+        # A validation already in flight must not repopulate the entry.
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: bytes, task: asyncio.Task[TokenPayload]) -> None:
+        if self._inflight.get(key) is not task:
+            return
+        del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        payload = task.result()
+        now = time.time()
+        expires_at = min(payload.exp.timestamp() - self._expiry_margin, now + self._max_age)
+        if expires_at <= now:
+            return
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+def invalidate_verified_token(token: str) -> None:
+    """Forget a remotely verified token, e.g. once its session is signed out."""
+
+    verified_tokens.invalidate(token)
+
 
 def hash_secret(secret: str) -> str:
     """Return a hashed representation of ``secret`` suitable for storage."""
@@ -37,15 +127,36 @@ def mask_secret(secret: str, visible: int = 4) -> str:
     return f"{secret[:visible]}{'*' * (len(secret) - visible * 2)}{secret[-visible:]}"
 
 
-def decode_access_token(token: str, settings: Settings) -> TokenPayload:
-    """Decode and validate a Supabase JWT access token."""
+async def decode_access_token(token: str, settings: Settings) -> TokenPayload:
+    """Decode and validate a Supabase JWT access token.
+
+    HS256 tokens are checked against ``supabase_jwt_secret`` and asymmetric
+    ones against the project's cached JWKS, both without leaving the process.
+    Tokens neither can verify are rejected unless the remote ``/auth/v1/user``
+    check is enabled with ``SUPABASE_AUTH_REMOTE_VERIFICATION``.
+    """
 
-    if settings.supabase_jwt_secret:
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.InvalidTokenError as exc:  # type: ignore[attr-defined]
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token") from exc
+
+    algorithm = str(header.get("alg") or "")
+    decoded: Mapping[str, Any] | None = None
+    if algorithm in _ASYMMETRIC_ALGORITHMS:
+        decoded = await _decode_with_jwks(token, algorithm, header.get("kid"), settings)
+    elif settings.supabase_jwt_secret:
         decoded = _decode_with_secret(token, settings)
+
+    if decoded is not None:
+        payload = TokenPayload.model_validate(decoded)
+    elif getattr(settings, "supabase_auth_remote_verification", False):
+        payload = await verified_tokens.get_or_verify(
+            token, lambda: _verify_with_supabase(token, settings)
+        )
     else:
-        decoded = _decode_with_supabase_verification(token, settings)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
 
-    payload = TokenPayload.model_validate(decoded)
     if payload.exp < datetime.now(tz=UTC):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
     return payload
@@ -67,8 +178,38 @@ def _decode_with_secret(token: str, settings: Settings) -> Mapping[str, Any]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token") from exc
 
 
-def _decode_with_supabase_verification(token: str, settings: Settings) -> Mapping[str, Any]:
-    """Validate a Supabase JWT when the shared secret is not configured."""
+async def _decode_with_jwks(
+    token: str, algorithm: str, kid: str | None, settings: Settings
+) -> Mapping[str, Any] | None:
+    """Verify an asymmetrically signed JWT against the cached JWKS.
+
+    Returns ``None`` when no published key matches so the caller can fall back.
+    """
+
+    key = await get_jwks_cache(settings).get_signing_key(kid)
+    if key is None:
+        return None
+    if key.algorithm_name != algorithm:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
+    try:
+        return jwt.decode(
+            token,
+            key.key,
+            algorithms=[algorithm],
+            audience=settings.supabase_jwt_audience,
+        )
+    except jwt.ExpiredSignatureError as exc:  # type: ignore[attr-defined]
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired") from exc
+    except jwt.InvalidTokenError as exc:  # type: ignore[attr-defined]
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token") from exc
+
+
+async def _verify_with_supabase(token: str, settings: Settings) -> TokenPayload:
+    return TokenPayload.model_validate(await _decode_with_supabase_verification(token, settings))
+
+
+async def _decode_with_supabase_verification(token: str, settings: Settings) -> Mapping[str, Any]:
+    """Validate a Supabase JWT by asking the Auth server for its user."""
 
     supabase_url = str(getattr(settings, "supabase_url", "")).rstrip("/")
     api_key = getattr(settings, "supabase_anon_key", None) or getattr(settings, "supabase_service_role_key", None)
@@ -86,7 +227,7 @@ def _decode_with_supabase_verification(token: str, settings: Settings) -> Mappin
     }
 
     try:
-        response = httpx.get(auth_endpoint, headers=headers, timeout=5.0)
+        response = await _fetch_supabase_user(auth_endpoint, headers)
         response.raise_for_status()
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code in {status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN}:
@@ -132,6 +273,15 @@ def _decode_with_supabase_verification(token: str, settings: Settings) -> Mappin
     return payload
 
 
+async def _fetch_supabase_user(url: str, headers: dict[str, str]) -> httpx.Response:
+    async with provider_http_client(url) as client:
+        return await client.get(url, headers=headers, timeout=5.0)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
 def _coerce_timestamp(value: Any) -> datetime | None:
     """Convert a JWT timestamp into an aware ``datetime`` instance."""
 
@@ -160,9 +310,11 @@ def create_supabase_service_headers(settings: Settings) -> dict[str, str]:
 
 
 __all__ = [
+    "VerifiedTokenCache",
     "hash_secret",
     "verify_secret",
     "mask_secret",
     "decode_access_token",
+    "invalidate_verified_token",
     "create_supabase_service_headers",
 ]
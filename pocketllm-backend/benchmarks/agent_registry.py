@@ -0,0 +1,88 @@
+"""Measure per-request agent overhead with a fresh versus a cached AgentRegistry.
+
+The previous endpoints built a registry for every request: every agent,
+every ``LLMChain``, the compiled LangGraph workflow and the scan of
+``docs/langchain``. They now share one registry per process and bind the
+request's database for the duration of the run. The agents' LLMs are the
+deterministic local stand-ins and the Groq call fails fast without a key,
+and memory is kept in an in-process fake database, so the numbers are
+framework overhead only.
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/agent_registry.py --runs 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import types
+import warnings
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_SKIP_CONNECTION_TEST", "1")
+
+from app.services.agents import AgentContext, build_agent_registry  # noqa: E402
+
+
+class InMemoryDatabase:
+    """The subset of the database backend that agent memory uses."""
+
+    def __init__(self) -> None:
+        self._rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+
+    async def select(self, table: str, *, filters: dict[str, Any], limit: int | None = None, **_: Any) -> list[dict[str, Any]]:
+        row = self._rows.get((table, *sorted(filters.items())))
+        return [row] if row else []
+
+    async def upsert(self, table: str, payload: dict[str, Any], *, on_conflict: str) -> list[dict[str, Any]]:
+        key = (table, *sorted((column, payload[column]) for column in on_conflict.split(",")))
+        self._rows[key] = payload
+        return [payload]
+
+
+async def _per_request(registry_for, agent: str, task: str, runs: int) -> float:
+    database = InMemoryDatabase()
+    started = time.perf_counter()
+    for index in range(runs):
+        registry = registry_for(database)
+        context = AgentContext(session_id=f"session-{index}", user_id="benchmark")
+        await registry.run_agent(agent, context, prompt="Write a haiku about latency", task=task, database=database)
+    return (time.perf_counter() - started) * 1000 / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+    settings = types.SimpleNamespace(groq_api_base=None)
+    shared = build_agent_registry(settings)
+
+    started = time.perf_counter()
+    for _ in range(args.runs):
+        build_agent_registry(settings)
+    print(f"build_agent_registry alone:   {(time.perf_counter() - started) * 1000 / args.runs:>7.2f} ms")
+
+    for agent, task in (("code", "code"), ("workflow", "code"), ("workflow", "writing")):
+        fresh = asyncio.run(
+            _per_request(lambda database: build_agent_registry(settings, database), agent, task, args.runs)
+        )
+        cached = asyncio.run(_per_request(lambda _database: shared, agent, task, args.runs))
+        label = f"{agent} ({task})"
+        print(f"{label:<20} fresh registry {fresh:>7.2f} ms   cached {cached:>7.2f} ms   per run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Measure authenticated request throughput for each token verification path.
+
+A minimal app exposes one endpoint guarded by ``get_current_request_user`` and
+is driven in-process through ``httpx.ASGITransport`` with ``--concurrency``
+requests in flight. Supabase Auth is modelled as ``--latency-ms`` per call:
+
+* ``blocking remote``: the previous behaviour, a synchronous ``/auth/v1/user``
+  request inside the async dependency (modelled with ``time.sleep``).
+* ``async remote``: the opt-in ``SUPABASE_AUTH_REMOTE_VERIFICATION`` fallback.
+* ``local JWKS``: ES256 tokens verified against the cached key set.
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/auth_verification.py --requests 400 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import types
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_SKIP_CONNECTION_TEST", "1")
+
+import httpx  # noqa: E402
+import jwt  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.core import jwks  # noqa: E402
+from app.schemas.auth import TokenPayload  # noqa: E402
+from app.utils import security  # noqa: E402
+
+SETTINGS = types.SimpleNamespace(
+    supabase_jwt_secret=None,
+    supabase_url="https://example.supabase.co",
+    supabase_anon_key="anon",
+    supabase_service_role_key="service",
+    supabase_jwt_audience="authenticated",
+    token_algorithm="HS256",
+    supabase_auth_remote_verification=True,
+)
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+
+    async def settings_override():
+        return SETTINGS
+
+    app.dependency_overrides[deps.get_settings_dependency] = settings_override
+
+    @app.get("/me")
+    async def me(user: TokenPayload = Depends(deps.get_current_request_user)) -> dict[str, str]:
+        return {"sub": str(user.sub)}
+
+    return app
+
+
+def _claims() -> dict[str, object]:
+    now = datetime.now(tz=UTC)
+    return {
+        "sub": str(uuid.uuid4()),
+        "aud": "authenticated",
+        "role": "authenticated",
+        "iat": int(now.timestamp()),
+        "exp": int((now + timedelta(hours=1)).timestamp()),
+    }
+
+
+async def _drive(app: FastAPI, token: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+    claims = _claims()
+    user = {"id": claims["sub"], "aud": "authenticated", "role": "authenticated"}
+    app = _build_app()
+    original_decode = deps.decode_access_token
+
+    class _UserResponse:
+        def raise_for_status(self) -> None:
+            return None
+
+        def json(self) -> dict[str, object]:
+            return dict(user)
+
+    # Blocking remote check (previous behaviour).
+    async def blocking_decode(token: str, settings) -> TokenPayload:
+        time.sleep(latency)
+        unverified = jwt.decode(token, options={"verify_signature": False})
+        return TokenPayload.model_validate({**unverified, "sub": user["id"]})
+
+    hs_token = jwt.encode(claims, "secret-not-known-to-this-process-0123456789", algorithm="HS256")
+    deps.decode_access_token = blocking_decode
+    blocking = await _drive(app, hs_token, args.requests, args.concurrency)
+    deps.decode_access_token = original_decode
+
+    async def async_fetch(url: str, headers: dict[str, str]) -> _UserResponse:
+        await asyncio.sleep(latency)
+        return _UserResponse()
+
+    security._fetch_supabase_user = async_fetch  # type: ignore[assignment]
+    remote = await _drive(app, hs_token, args.requests, args.concurrency)
+
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    public_jwk = jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    public_jwk.update({"kid": "bench", "alg": "ES256"})
+
+    async def jwks_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"keys": [public_jwk]})
+
+    jwks._cache = jwks.JWKSCache(SETTINGS, transport=httpx.MockTransport(jwks_handler))
+    es_token = jwt.encode(claims, private_key, algorithm="ES256", headers={"kid": "bench"})
+    local = await _drive(app, es_token, args.requests, args.concurrency)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, auth latency {args.latency_ms:.0f} ms")
+    print(f"  blocking remote   {blocking:>8.0f} req/s")
+    print(f"  async remote      {remote:>8.0f} req/s")
+    print(f"  local JWKS        {local:>8.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,182 @@
+"""Measure database time spent per chat turn in ``ChatsService.create_message``.
+
+Every call to the fake database sleeps for ``--latency-ms`` to model a
+PostgREST round trip, and the provider is served by an in-process transport,
+so the reported wall time is dominated by how many round trips are issued
+sequentially.
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/chat_turn_db.py --turns 200 --latency-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import types
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_SKIP_CONNECTION_TEST", "1")
+
+import httpx  # noqa: E402
+
+from app.schemas.chats import MessageCreate  # noqa: E402
+from app.services import chats as chats_module  # noqa: E402
+
+
+class LatencyDatabase:
+    """In-memory tables where every call costs one simulated round trip."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.tables: dict[str, list[dict[str, object]]] = {
+            "model_configs": [],
+            "providers": [],
+            "chats": [],
+            "messages": [],
+        }
+
+    async def _round_trip(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+    async def select(self, table, *, columns="*", filters=None, limit=None, order_by=None):
+        await self._round_trip()
+        rows = [dict(row) for row in self.tables[table] if _matches(row, filters or {})]
+        if order_by:
+            rows.sort(key=lambda row: row["created_at"])
+        if "model_config:model_configs" in columns:
+            for row in rows:
+                config = next(
+                    dict(item)
+                    for item in self.tables["model_configs"]
+                    if item["id"] == row["model_config_id"]
+                )
+                config["provider_record"] = next(
+                    dict(item)
+                    for item in self.tables["providers"]
+                    if item["id"] == config["provider_id"]
+                )
+                row["model_config"] = config
+        return rows[:limit] if limit else rows
+
+    async def insert(self, table, data):
+        await self._round_trip()
+        record = {"id": uuid.uuid4(), "created_at": datetime.now(tz=UTC), **data}
+        record.setdefault("updated_at", record["created_at"])
+        self.tables[table].append(record)
+        return dict(record)
+
+    async def update(self, table, data, *, filters):
+        await self._round_trip()
+        updated = []
+        for row in self.tables[table]:
+            if _matches(row, filters):
+                row.update(data)
+                updated.append(dict(row))
+        return updated
+
+
+def _matches(row: dict[str, object], filters: dict[str, object]) -> bool:
+    return all(str(row.get(key)) == str(value) for key, value in filters.items())
+
+
+def _seed(database: LatencyDatabase) -> tuple[uuid.UUID, uuid.UUID]:
+    user_id, provider_id, config_id, chat_id = (uuid.uuid4() for _ in range(4))
+    now = datetime.now(tz=UTC)
+    database.tables["providers"].append(
+        {
+            "id": provider_id,
+            "user_id": user_id,
+            "provider": "openai",
+            "display_name": "OpenAI",
+            "base_url": "https://api.openai.com/v1",
+            "metadata": {},
+            "api_key_encrypted": "cipher",
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    database.tables["model_configs"].append(
+        {
+            "id": config_id,
+            "user_id": user_id,
+            "provider_id": provider_id,
+            "provider": "openai",
+            "model": "gpt-4o-mini",
+            "name": "GPT-4o Mini",
+            "is_default": True,
+            "is_active": True,
+            "settings": {"temperature": 0.1},
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    database.tables["chats"].append(
+        {
+            "id": chat_id,
+            "user_id": user_id,
+            "title": "Benchmark",
+            "model_config_id": config_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    return chat_id, user_id
+
+
+def _completion(_: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={"choices": [{"message": {"content": "ok"}, "finish_reason": "stop"}]},
+    )
+
+
+async def _run(turns: int, latency_ms: float) -> None:
+    chats_module.decrypt_secret = lambda value, _: "sk-bench"
+    database = LatencyDatabase(latency_ms / 1000)
+    chat_id, user_id = _seed(database)
+    service = chats_module.ChatsService(
+        database=database,
+        settings=types.SimpleNamespace(chat_completion_timeout_seconds=5),
+        http_transport=httpx.MockTransport(_completion),
+    )
+
+    durations: list[float] = []
+    calls: list[int] = []
+    for index in range(turns):
+        before = database.calls
+        started = time.perf_counter()
+        await service.create_message(chat_id, user_id, MessageCreate(content=f"turn {index}"))
+        durations.append((time.perf_counter() - started) * 1000)
+        calls.append(database.calls - before)
+
+    durations.sort()
+    p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+    print(f"turns={turns} latency_per_call={latency_ms}ms")
+    print(f"db calls per turn: {statistics.mean(calls):.1f}")
+    print(f"turn time p50={statistics.median(durations):.1f}ms p99={p99:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(_run(args.turns, args.latency_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measure provider API key decrypt throughput in ``app.utils.crypto``.
+
+Compares building a :class:`Fernet` for every call (the behaviour before the
+keyring was cached) with ``decrypt_secret`` and the batch ``decrypt_many``
+path, for both a real Fernet key and a passphrase that needs key derivation.
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/crypto_decrypt.py --tokens 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cryptography.fernet import Fernet  # noqa: E402
+
+from app.utils import crypto  # noqa: E402
+
+
+def _per_call_fernet(token: str, settings: types.SimpleNamespace) -> str:
+    # Equivalent to the former _load_fernet() + decrypt on every call.
+    return crypto._build_fernet(settings.encryption_key).decrypt(token.encode()).decode()
+
+
+def _measure(label: str, func, count: int) -> None:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<24} {count / elapsed:>10,.0f} decrypts/s  ({elapsed * 1e6 / count:.1f} µs each)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=5000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    keys = {
+        "fernet key": Fernet.generate_key().decode(),
+        "derived passphrase": "correct horse battery staple, but longer",
+    }
+    for name, key in keys.items():
+        settings = types.SimpleNamespace(encryption_key=key)
+        tokens = [crypto.encrypt_secret(f"sk-{index:08d}", settings) for index in range(args.tokens)]
+        print(f"{name}:")
+        _measure("per-call Fernet", lambda: [_per_call_fernet(t, settings) for t in tokens], len(tokens))
+        _measure("decrypt_secret", lambda: [crypto.decrypt_secret(t, settings) for t in tokens], len(tokens))
+        _measure("decrypt_many", lambda: crypto.decrypt_many(tokens, settings), len(tokens))
+
+
+if __name__ == "__main__":
+    main()
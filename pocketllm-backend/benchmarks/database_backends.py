@@ -0,0 +1,106 @@
+"""Compare database backend throughput under concurrent load.
+
+The ``supabase`` backend runs a synchronous client on the default executor,
+the ``postgrest`` backend awaits an async HTTP transport. Both see the same
+simulated PostgREST latency, so the difference comes from how each backend
+schedules concurrent queries.
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/database_backends.py --concurrency 50 200 1000 --latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("SUPABASE_SKIP_CONNECTION_TEST", "1")
+
+import httpx  # noqa: E402
+
+from app.core.database import Database  # noqa: E402
+from app.core.postgrest import PostgRESTDatabase  # noqa: E402
+
+_ROWS = [{"id": "00000000-0000-0000-0000-000000000001", "title": "Benchmark"}]
+
+
+class BlockingSupabase:
+    """Stand-in for ``SupabaseDatabase`` whose calls block like the sync SDK."""
+
+    _connection_verified = True
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.client = object()
+
+    def select(self, table, **_kwargs):
+        time.sleep(self.latency)
+        return list(_ROWS)
+
+
+def _settings() -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        supabase_url="https://bench.supabase.co",
+        supabase_service_role_key="bench",
+        supabase_schema="public",
+        database_rest_max_connections=1000,
+        database_rest_max_keepalive_connections=100,
+    )
+
+
+def _build(backend: str, latency: float):
+    if backend == "supabase":
+        return Database(_settings(), supabase=BlockingSupabase(latency))
+
+    async def handler(_: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=_ROWS)
+
+    return PostgRESTDatabase(_settings(), transport=httpx.MockTransport(handler))
+
+
+async def _measure(backend: str, concurrency: int, requests: int, latency: float) -> float:
+    database = _build(backend, latency)
+    await database.connect()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await database.select("chats", filters={"user_id": "bench"}, limit=20)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    await database.disconnect()
+    return requests / elapsed
+
+
+async def _run(levels: list[int], latency_ms: float, rounds: int) -> None:
+    latency = latency_ms / 1000
+    print(f"simulated latency={latency_ms}ms, requests per level={rounds}x concurrency")
+    print(f"{'concurrency':>12} {'supabase req/s':>16} {'postgrest req/s':>16} {'speedup':>8}")
+    for level in levels:
+        requests = level * rounds
+        executor = await _measure("supabase", level, requests, latency)
+        native = await _measure("postgrest", level, requests, latency)
+        print(f"{level:>12} {executor:>16.0f} {native:>16.0f} {native / executor:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_run(args.concurrency, args.latency_ms, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
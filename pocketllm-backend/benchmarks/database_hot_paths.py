@@ -0,0 +1,91 @@
+"""Report hot-path query latency for the PostgREST and asyncpg backends.
+
+Runs the chat-turn queries (chat lookup with embedded model config and
+provider, message history, provider lookup) against a real deployment using
+the credentials from the environment (``SUPABASE_URL``,
+``SUPABASE_SERVICE_ROLE_KEY`` and ``SUPABASE_DB_URL``).
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/database_hot_paths.py --chat-id <uuid> --user-id <uuid>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.postgres import AsyncpgDatabase  # noqa: E402
+from app.core.postgrest import PostgRESTDatabase  # noqa: E402
+
+_CHAT_COLUMNS = "*,model_config:model_configs(*,provider_record:providers(*))"
+
+
+async def _time(label: str, iterations: int, query) -> None:
+    await query()  # warm the pool and, for asyncpg, the statement cache
+    samples: list[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await query()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"  {label:<16} p50={statistics.median(samples):7.2f}ms p99={p99:7.2f}ms")
+
+
+async def _run(backend_name: str, chat_id: str, user_id: str, iterations: int) -> None:
+    settings = get_settings()
+    database = AsyncpgDatabase(settings) if backend_name == "asyncpg" else PostgRESTDatabase(settings)
+    await database.connect()
+    try:
+        [chat] = await database.select(
+            "chats", columns=_CHAT_COLUMNS, filters={"id": chat_id, "user_id": user_id}, limit=1
+        )
+        provider_id = (chat.get("model_config") or {}).get("provider_id")
+        print(backend_name)
+        await _time(
+            "chat lookup",
+            iterations,
+            lambda: database.select(
+                "chats", columns=_CHAT_COLUMNS, filters={"id": chat_id, "user_id": user_id}, limit=1
+            ),
+        )
+        await _time(
+            "message history",
+            iterations,
+            lambda: database.select(
+                "messages", filters={"chat_id": chat_id}, order_by=["created_at.asc"]
+            ),
+        )
+        if provider_id:
+            await _time(
+                "provider lookup",
+                iterations,
+                lambda: database.select(
+                    "providers", filters={"id": provider_id, "user_id": user_id}, limit=1
+                ),
+            )
+    finally:
+        await database.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chat-id", required=True)
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--backends", nargs="+", default=["postgrest", "asyncpg"])
+    args = parser.parse_args()
+    for backend in args.backends:
+        asyncio.run(_run(backend, args.chat_id, args.user_id, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Measure the logging cost a database operation adds to the calling thread.
+
+Compares the previous pattern (a ``json.dumps`` DB_OPERATION record before
+the query plus a success record after it, written synchronously) with the
+current one (a single lazily formatted record handed to the queue listener),
+at several ``DB_LOG_SAMPLE_RATE`` values. Output goes to ``os.devnull``.
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/db_logging.py --operations 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import types
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import logging as app_logging  # noqa: E402
+from app.core.logging import SAMPLED  # noqa: E402
+
+_SETTINGS = dict(log_level="INFO", environment="benchmark")
+
+
+def _legacy(logger: logging.Logger, table: str) -> None:
+    log_data = {
+        "operation": "select",
+        "table": table,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "has_data": False,
+        "has_filters": True,
+    }
+    logger.info("🔄 DB_OPERATION: %s", json.dumps(log_data))
+    logger.info("✅ Selected %s records from %s", 20, table)
+
+
+def _current(logger: logging.Logger, table: str) -> None:
+    logger.info(
+        "✅ DB_OPERATION: %s on %s (%s rows)",
+        "select",
+        table,
+        20,
+        extra={"operation": "select", "table": table, "rows": 20, "has_data": False, "has_filters": True, SAMPLED: True},
+    )
+
+
+def _measure(label: str, log_json: bool, queue: bool, rate: float, func, count: int) -> None:
+    settings = types.SimpleNamespace(
+        **_SETTINGS, log_json=log_json, log_queue_enabled=queue, db_log_sample_rate=rate
+    )
+    app_logging.configure_logging(settings)
+    with open(os.devnull, "w") as sink:
+        logging.getHandlerByName("default").setStream(sink)
+        logger = logging.getLogger("app.database.connection")
+        started = time.perf_counter()
+        for _ in range(count):
+            func(logger, "chats")
+        elapsed = time.perf_counter() - started
+        app_logging.stop_logging()
+    print(f"  {label:<34} {elapsed * 1e6 / count:>7.2f} µs/operation in the caller")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=50000)
+    args = parser.parse_args()
+
+    for log_json in (False, True):
+        print("LOG_JSON=true:" if log_json else "text format:")
+        _measure("previous (2 records, sync)", log_json, False, 1.0, _legacy, args.operations)
+        _measure("current, sync", log_json, False, 1.0, _current, args.operations)
+        for rate in (1.0, 0.1):
+            _measure(f"current, queued, sample {rate}", log_json, True, rate, _current, args.operations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Measure requests per second through the request context/logging middleware.
+
+Builds the same two endpoints behind the previous ``BaseHTTPMiddleware``
+implementations and behind the current pure ASGI ones, then drives each app
+in-process through ``httpx.ASGITransport``:
+
+* ``/health``: the real health handler.
+* ``/v1/me``: a typical authenticated endpoint (HS256 bearer token decoded
+  by ``get_current_request_user``).
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/middleware_overhead.py --requests 5000 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import types
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_SKIP_CONNECTION_TEST", "1")
+
+import httpx  # noqa: E402
+import jwt  # noqa: E402
+from fastapi import Depends, FastAPI, Request, Response  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.api.v1.endpoints import default as default_endpoints  # noqa: E402
+from app.core.middleware import LoggingMiddleware, RequestContextMiddleware  # noqa: E402
+from app.schemas.auth import TokenPayload  # noqa: E402
+
+SECRET = "benchmark-secret-benchmark-secret-0123"
+SETTINGS = types.SimpleNamespace(
+    supabase_jwt_secret=SECRET,
+    supabase_jwt_audience="authenticated",
+    token_algorithm="HS256",
+    version="bench",
+)
+
+
+class LegacyRequestContextMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request.state.request_id = uuid.uuid4().hex
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request.state.request_id
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, logger_name: str = "pocketllm.api") -> None:
+        super().__init__(app)
+        self._logger = logging.getLogger(logger_name)
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        process_time = (time.perf_counter() - start_time) * 1000
+        self._logger.info(
+            "HTTP request",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "duration_ms": round(process_time, 2),
+                "request_id": getattr(request.state, "request_id", None),
+                "client_ip": request.client.host if request.client else None,
+            },
+        )
+        response.headers["X-Process-Time"] = str(round(process_time, 2))
+        return response
+
+
+def _build_app(context_middleware, logging_middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(context_middleware)
+    app.add_middleware(logging_middleware)
+
+    async def settings_override():
+        return SETTINGS
+
+    app.dependency_overrides[deps.get_settings_dependency] = settings_override
+    app.include_router(default_endpoints.router)
+
+    @app.get("/v1/me")
+    async def me(user: TokenPayload = Depends(deps.get_current_request_user)) -> dict[str, str]:
+        return {"sub": str(user.sub)}
+
+    return app
+
+
+async def _drive(app: FastAPI, path: str, headers: dict[str, str], total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get(path, headers=headers)
+                response.raise_for_status()
+
+        await one()  # warm up routing and dependency caches
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    api_logger = logging.getLogger("pocketllm.api")
+    api_logger.addHandler(logging.NullHandler())
+    api_logger.propagate = False
+    api_logger.setLevel(logging.INFO)
+
+    now = datetime.now(tz=UTC)
+    token = jwt.encode(
+        {"sub": str(uuid.uuid4()), "aud": "authenticated", "exp": now + timedelta(hours=1)},
+        SECRET,
+        algorithm="HS256",
+    )
+    targets = {
+        "/health": {"Accept": "application/json"},
+        "/v1/me": {"Authorization": f"Bearer {token}"},
+    }
+    apps = {
+        "BaseHTTPMiddleware": _build_app(LegacyRequestContextMiddleware, LegacyLoggingMiddleware),
+        "pure ASGI": _build_app(RequestContextMiddleware, LoggingMiddleware),
+    }
+
+    print(f"{args.requests} requests per run, concurrency {args.concurrency}")
+    for path, headers in targets.items():
+        for label, app in apps.items():
+            rate = await _drive(app, path, headers, args.requests, args.concurrency)
+            print(f"  {path:<8} {label:<20} {rate:>8.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
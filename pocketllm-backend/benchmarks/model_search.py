@@ -0,0 +1,128 @@
+"""Measure /v1/models filter latency with a linear scan versus the catalogue search index.
+
+The previous filter lower-cased every model's name, id and description and
+``str()``-ed its metadata on every request. The index does that once per
+cached catalogue and answers each filter with ``str.find`` over the packed
+text. The synthetic catalogue mimics OpenRouter's: ids like
+``vendor/family-70b-instruct``, a paragraph of description, and the same
+description again inside the metadata.
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/model_search.py --models 5000 --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.schemas.providers import ProviderModel  # noqa: E402
+from app.services.providers.catalogue_index import CatalogueIndex, search_models  # noqa: E402
+
+_VENDORS = ("meta-llama", "mistralai", "qwen", "google", "deepseek", "anthropic", "openai", "cohere")
+_WORDS = (
+    "fast reasoning vision coding chat instruct preview turbo large small mini context tokens "
+    "multilingual tool use function calling open weights research agentic long documents"
+).split()
+_FILTERS = (
+    {"query": "llama"},
+    {"query": "vision"},
+    {"query": "qwen/coding-12"},
+    {"query": "no-such-model"},
+    {"name": "instruct"},
+    {"model_id": "deepseek", "query": "reasoning"},
+)
+
+
+def _catalogue(size: int) -> list[ProviderModel]:
+    rng = random.Random(7)
+    models = []
+    for index in range(size):
+        model_id = f"{rng.choice(_VENDORS)}/{rng.choice(_WORDS)}-{rng.randint(1, 400)}b-{rng.choice(_WORDS)}"
+        description = " ".join(rng.choice(_WORDS) for _ in range(60))
+        models.append(
+            ProviderModel(
+                provider="openrouter",
+                id=model_id,
+                name=model_id.split("/", 1)[1].replace("-", " ").title(),
+                description=description,
+                metadata={
+                    "created": 1_700_000_000 + index,
+                    "description": description,
+                    "architecture": {"input_modalities": ["text"], "output_modalities": ["text"]},
+                    "capabilities": ["text_input", "text_output"],
+                },
+            )
+        )
+    return models
+
+
+def _linear_scan(models, *, name=None, model_id=None, query=None):
+    """The filter ``ProvidersService`` used before the index."""
+
+    name_filter = name.lower() if name else None
+    id_filter = model_id.lower() if model_id else None
+    query_filter = query.lower() if query else None
+
+    def matches(model: ProviderModel) -> bool:
+        if name_filter and name_filter not in model.name.lower():
+            return False
+        if id_filter and id_filter not in model.id.lower():
+            return False
+        if query_filter:
+            haystacks = [model.name, model.id]
+            if model.description:
+                haystacks.append(model.description)
+            if model.metadata:
+                haystacks.append(str(model.metadata))
+            if not any(query_filter in text.lower() for text in haystacks):
+                return False
+        return True
+
+    return [model for model in models if matches(model)]
+
+
+def _ms_per_run(function, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - started) * 1000 / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    models = _catalogue(args.models)
+    build = _ms_per_run(lambda: CatalogueIndex(models), max(1, args.runs // 4))
+    print(f"{args.models} models; index build {build:.1f} ms (once per cached catalogue)")
+
+    index = CatalogueIndex(models)
+
+    class Indexed(list):
+        search_index = index
+
+    segment = Indexed(models)
+    for filters in _FILTERS:
+        matched = len(_linear_scan(models, **filters))
+        assert matched == len(search_models([segment], **filters)), filters
+        linear = _ms_per_run(lambda: _linear_scan(models, **filters), args.runs)
+        indexed = _ms_per_run(lambda: search_models([segment], **filters), args.runs)
+        limited = _ms_per_run(lambda: search_models([segment], limit=50, **filters), args.runs)
+        label = ", ".join(f"{key}={value}" for key, value in filters.items())
+        print(
+            f"{label:<36} {matched:>5} hits   linear {linear:>7.2f} ms   "
+            f"index {indexed:>6.2f} ms   limit=50 {limited:>6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
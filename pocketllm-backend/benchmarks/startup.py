@@ -0,0 +1,93 @@
+"""Measure ``import main`` time and resident memory with and without the agent stack.
+
+Each sample runs in a fresh interpreter: it imports ``main`` (what a cold
+worker pays before serving a request), then optionally loads the
+LangChain/LangGraph agent stack the way ``AGENTS_PRELOAD=true`` does at
+startup. Reports the median over ``--runs`` samples.
+
+Run from ``pocketllm-backend``::
+
+    python benchmarks/startup.py --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import json, resource, sys, time
+
+def rss_mib():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+result = {"import_main": imported - started, "rss_main": rss_mib()}
+if sys.argv[1] == "1":
+    from app.services.agents import preload_agent_stack
+    preload_agent_stack()
+    result["agent_stack"] = time.perf_counter() - imported
+    result["rss_agents"] = rss_mib()
+print(json.dumps(result))
+"""
+
+
+def _sample(with_agents: bool) -> dict[str, float]:
+    env = {
+        **os.environ,
+        "SUPABASE_URL": os.environ.get("SUPABASE_URL", "https://example.supabase.co"),
+        "SUPABASE_SERVICE_ROLE_KEY": os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "benchmark"),
+        "LOG_LEVEL": "WARNING",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, "1" if with_agents else "0"],
+        cwd=BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _median(samples: list[dict[str, float]], key: str) -> float:
+    return statistics.median(sample[key] for sample in samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    lazy = [_sample(False) for _ in range(args.runs)]
+    eager = [_sample(True) for _ in range(args.runs)]
+
+    total = statistics.median(sample["import_main"] + sample["agent_stack"] for sample in eager)
+    rows = (
+        ("import main", _median(lazy, "import_main"), _median(lazy, "rss_main")),
+        ("import main + agent stack", total, _median(eager, "rss_agents")),
+    )
+    for label, seconds, rss in rows:
+        print(f"{label:<28}{seconds * 1000:>7.0f} ms   RSS {rss:>6.1f} MiB")
+    print(f"{'  agent stack alone':<28}{_median(eager, 'agent_stack') * 1000:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+-- PocketLLM migration: store rolling summaries of long chats.
+-- Run with: psql "$SUPABASE_DB_URL" -f database/migrations/20261018_chat_summaries.sql
+
+create table if not exists public.chat_summaries (
+    chat_id uuid primary key references public.chats(id) on delete cascade,
+    summary text not null,
+    covered_until timestamptz not null,
+    covered_message_id uuid not null,
+    token_estimate integer not null default 0,
+    updated_at timestamptz default now()
+);
+
+alter table public.chat_summaries enable row level security;
+
+drop policy if exists "Users read own chat summaries" on public.chat_summaries;
+create policy "Users read own chat summaries" on public.chat_summaries for select using (
+    auth.uid() = (select user_id from public.chats where id = chat_id)
+);
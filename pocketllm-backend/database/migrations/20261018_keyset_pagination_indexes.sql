@@ -0,0 +1,12 @@
+-- PocketLLM migration: indexes backing keyset pagination of the list endpoints.
+-- Run with: psql "$SUPABASE_DB_URL" -f database/migrations/20261018_keyset_pagination_indexes.sql
+
+create index if not exists idx_chats_user_id_updated_at
+    on public.chats(user_id, updated_at desc, id desc);
+drop index if exists public.idx_chats_user_id;
+
+create index if not exists idx_jobs_user_id_created_at
+    on public.jobs(user_id, created_at desc, id desc);
+
+create index if not exists idx_notifications_user_id_created_at
+    on public.notifications(user_id, created_at desc, id desc);
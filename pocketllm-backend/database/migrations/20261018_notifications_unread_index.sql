@@ -0,0 +1,6 @@
+-- PocketLLM migration: partial index for the unread notification count.
+-- Run with: psql "$SUPABASE_DB_URL" -f database/migrations/20261018_notifications_unread_index.sql
+
+create index if not exists idx_notifications_user_id_unread
+    on public.notifications(user_id)
+    where is_read = false;
@@ -0,0 +1,20 @@
+-- PocketLLM migration: bump chats.updated_at from a messages insert trigger.
+-- Run with: psql "$SUPABASE_DB_URL" -f database/migrations/20261018_touch_chat_on_message.sql
+
+create or replace function public.touch_chat_on_message()
+returns trigger as $$
+begin
+    update public.chats set updated_at = now() where id = new.chat_id;
+    return new;
+end;
+$$ language plpgsql;
+
+drop trigger if exists trg_messages_touch_chat on public.messages;
+create trigger trg_messages_touch_chat
+    after insert on public.messages
+    for each row execute procedure public.touch_chat_on_message();
+
+-- History is always read per chat in insertion order.
+create index if not exists idx_messages_chat_id_created_at
+    on public.messages(chat_id, created_at);
+drop index if exists public.idx_messages_chat_id;
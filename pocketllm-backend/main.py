@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -11,8 +13,28 @@ from app.api.v1.api import api_router
 from app.api.v1.endpoints import default as default_endpoints
 from app.core.config import get_settings
 from app.core.database import close_database, connect_to_database
+from app.core.http_clients import close_http_clients
+from app.core.jwks import close_jwks_cache, get_jwks_cache
 from app.core.logging import configure_logging
-from app.core.middleware import LoggingMiddleware, RequestContextMiddleware
+from app.core.metrics import close_metrics_exporter, get_metrics_exporter
+from app.core.middleware import (
+    LoggingMiddleware,
+    MetricsMiddleware,
+    RequestContextMiddleware,
+    ServerTimingMiddleware,
+)
+from app.services.agents import load_agent_stack
+from app.services.providers.catalogue import close_catalogue_refresher, get_catalogue_refresher
+from app.services.providers.catalogue_store import close_catalogue_store
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_database() -> None:
+    try:
+        await connect_to_database()
+    except Exception:  # pragma: no cover - logged for operators
+        logger.exception("Background database warm-up failed")
 
 
 @asynccontextmanager
@@ -24,10 +46,32 @@ async def lifespan(app: FastAPI):
         yield
         return
 
-    await connect_to_database()
+    warmup: asyncio.Task[None] | None = None
+    if settings.database_warmup:
+        await connect_to_database()
+    else:
+        warmup = asyncio.create_task(_warm_database())
+    if settings.agents_preload:
+        await load_agent_stack()
+    if not settings.supabase_jwt_secret and not settings.supabase_auth_remote_verification:
+        logger.warning(
+            "Neither SUPABASE_JWT_SECRET nor SUPABASE_AUTH_REMOTE_VERIFICATION is set; "
+            "HS256 access tokens will be rejected"
+        )
+    if settings.supabase_jwks_prefetch:
+        get_jwks_cache(settings).start()
+    get_metrics_exporter(settings).start()
+    get_catalogue_refresher(settings).start()
     try:
         yield
     finally:
+        if warmup is not None and not warmup.done():
+            warmup.cancel()
+        await close_catalogue_refresher()
+        await close_catalogue_store()
+        await close_metrics_exporter()
+        await close_jwks_cache()
+        await close_http_clients()
         await close_database()
 
 
@@ -44,8 +88,10 @@ def create_application() -> FastAPI:
     )
     application.state.settings = settings
 
+    application.add_middleware(ServerTimingMiddleware, settings=settings)
     application.add_middleware(RequestContextMiddleware)
     application.add_middleware(LoggingMiddleware)
+    application.add_middleware(MetricsMiddleware)
     application.add_middleware(
         CORSMiddleware,
         allow_origins=settings.backend_cors_origins,
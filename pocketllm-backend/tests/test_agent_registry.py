@@ -0,0 +1,74 @@
+"""Tests for the process-wide agent registry."""
+
+from __future__ import annotations
+
+import asyncio
+import types
+from typing import Any
+
+import pytest
+
+from app.services.agents import AgentContext, registry as registry_module
+from app.services.agents.registry import build_agent_registry, get_agent_registry
+
+
+class InMemoryDatabase:
+    def __init__(self) -> None:
+        self.rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+
+    async def select(self, table: str, *, filters: dict[str, Any], limit: int | None = None) -> list[dict[str, Any]]:
+        await asyncio.sleep(0)  # let concurrent runs interleave
+        row = self.rows.get((table, *sorted(filters.items())))
+        return [row] if row else []
+
+    async def upsert(self, table: str, payload: dict[str, Any], *, on_conflict: str) -> list[dict[str, Any]]:
+        key = (table, *sorted((column, payload[column]) for column in on_conflict.split(",")))
+        self.rows[key] = payload
+        return [payload]
+
+
+@pytest.fixture
+def settings() -> types.SimpleNamespace:
+    return types.SimpleNamespace(groq_api_base=None)
+
+
+def test_registry_is_built_once_per_process(monkeypatch, settings) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(registry_module, "_registry", None)
+
+    first = get_agent_registry(settings)
+
+    assert get_agent_registry(settings) is first
+    assert {agent.name for agent in first.list_agents()} >= {"prompt_enhancer", "retrieval", "workflow"}
+
+
+def test_concurrent_runs_use_their_own_database_and_session(settings) -> None:  # type: ignore[no-untyped-def]
+    registry = build_agent_registry(settings)
+    databases = [InMemoryDatabase(), InMemoryDatabase()]
+
+    async def run_both() -> None:
+        await asyncio.gather(
+            *(
+                registry.run_agent(
+                    "retrieval",
+                    AgentContext(session_id=f"session-{index}", user_id=f"user-{index}"),
+                    prompt=f"question {index}",
+                    database=database,
+                )
+                for index, database in enumerate(databases)
+            )
+        )
+
+    asyncio.run(run_both())
+
+    for index, database in enumerate(databases):
+        (stored,) = database.rows.values()
+        assert stored["owner_id"] == f"user-{index}"
+        assert stored["session_id"] == f"session-{index}"
+        assert stored["memory_state"]["knowledge_base"] == [f"question {index}"]
+
+
+def test_running_without_a_database_fails_clearly(settings) -> None:  # type: ignore[no-untyped-def]
+    registry = build_agent_registry(settings)
+
+    with pytest.raises(RuntimeError, match="No database is bound"):
+        asyncio.run(registry.run_agent("code", AgentContext(session_id="s", user_id="u"), prompt="x"))
@@ -55,7 +55,7 @@ async def test_get_current_token_payload_from_credentials(monkeypatch: pytest.Mo
 
     captured: dict[str, str] = {}
 
-    def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
+    async def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
         captured["token"] = token
         return {"token": token}
 
@@ -72,7 +72,7 @@ async def test_get_current_token_payload_from_authorization_header(monkeypatch:
     request = DummyRequest(headers={"Authorization": "token-from-header"})
     settings = _make_settings()
 
-    def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
+    async def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
         return {"token": token}
 
     monkeypatch.setattr("app.api.deps.decode_access_token", fake_decode)
@@ -87,7 +87,7 @@ async def test_get_current_token_payload_prefers_bearer_scheme_when_present(monk
     request = DummyRequest(headers={"Authorization": "Bearer token-from-bearer"})
     settings = _make_settings()
 
-    def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
+    async def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
         return {"token": token}
 
     monkeypatch.setattr("app.api.deps.decode_access_token", fake_decode)
@@ -102,7 +102,7 @@ async def test_get_current_token_payload_from_cookie(monkeypatch: pytest.MonkeyP
     request = DummyRequest(cookies={"sb-access-token": "token-from-cookie"})
     settings = _make_settings()
 
-    def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
+    async def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
         return {"token": token}
 
     monkeypatch.setattr("app.api.deps.decode_access_token", fake_decode)
@@ -117,7 +117,7 @@ async def test_get_current_token_payload_from_query_parameter(monkeypatch: pytes
     request = DummyRequest(query_params={"access_token": "token-from-query"})
     settings = _make_settings()
 
-    def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
+    async def fake_decode(token: str, _settings: Settings) -> dict[str, str]:
         return {"token": token}
 
     monkeypatch.setattr("app.api.deps.decode_access_token", fake_decode)
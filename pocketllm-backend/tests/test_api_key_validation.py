@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import asynccontextmanager
 from types import SimpleNamespace
 from typing import Any
 
@@ -11,33 +10,25 @@ import httpx
 import pytest
 
 from app.core.config import Settings
+from app.core.http_clients import ProviderHTTPClientRegistry
 from app.services.api_keys import APIKeyValidationService
 
 
 def test_validate_groq_falls_back_to_http_when_sdk_missing(monkeypatch: pytest.MonkeyPatch) -> None:
     """Ensure Groq validation succeeds via HTTP when the SDK is unavailable."""
 
-    real_async_client = httpx.AsyncClient
     captured_requests: list[httpx.Request] = []
     captured_timeouts: list[Any] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
         captured_requests.append(request)
+        captured_timeouts.append(request.extensions["timeout"]["read"])
         return httpx.Response(200, json={"data": []})
 
-    transport = httpx.MockTransport(handler)
-
-    @asynccontextmanager
-    async def client_factory(*args: Any, **kwargs: Any):
-        kwargs.setdefault("transport", transport)
-        captured_timeouts.append(kwargs.get("timeout"))
-        async with real_async_client(*args, **kwargs) as client:
-            yield client
-
+    registry = ProviderHTTPClientRegistry(transport=httpx.MockTransport(handler))
     monkeypatch.setattr("app.services.api_keys.AsyncGroq", None, raising=False)
-    monkeypatch.setattr("app.services.api_keys.httpx.AsyncClient", client_factory, raising=False)
 
-    service = APIKeyValidationService(Settings())
+    service = APIKeyValidationService(Settings(), http_clients=registry)
 
     asyncio.run(
         service.validate(
@@ -58,25 +49,16 @@ def test_validate_groq_falls_back_to_http_when_sdk_missing(monkeypatch: pytest.M
 def test_validate_groq_http_fallback_appends_openai_prefix(monkeypatch: pytest.MonkeyPatch) -> None:
     """Ensure bare Groq base URLs gain the OpenAI compatibility prefix."""
 
-    real_async_client = httpx.AsyncClient
     captured_urls: list[str] = []
 
     def handler(request: httpx.Request) -> httpx.Response:
         captured_urls.append(str(request.url))
         return httpx.Response(200, json={"data": []})
 
-    transport = httpx.MockTransport(handler)
-
-    @asynccontextmanager
-    async def client_factory(*args: Any, **kwargs: Any):
-        kwargs.setdefault("transport", transport)
-        async with real_async_client(*args, **kwargs) as client:
-            yield client
-
+    registry = ProviderHTTPClientRegistry(transport=httpx.MockTransport(handler))
     monkeypatch.setattr("app.services.api_keys.AsyncGroq", None, raising=False)
-    monkeypatch.setattr("app.services.api_keys.httpx.AsyncClient", client_factory, raising=False)
 
-    service = APIKeyValidationService(Settings())
+    service = APIKeyValidationService(Settings(), http_clients=registry)
 
     asyncio.run(
         service.validate(
@@ -94,23 +76,14 @@ def test_validate_groq_http_fallback_appends_openai_prefix(monkeypatch: pytest.M
 def test_validate_groq_http_fallback_raises_for_errors(monkeypatch: pytest.MonkeyPatch) -> None:
     """HTTP fallback should surface non-success status codes as validation errors."""
 
-    real_async_client = httpx.AsyncClient
 
     def handler(_: httpx.Request) -> httpx.Response:
         return httpx.Response(403, text="Forbidden")
 
-    transport = httpx.MockTransport(handler)
-
-    @asynccontextmanager
-    async def client_factory(*args: Any, **kwargs: Any):
-        kwargs.setdefault("transport", transport)
-        async with real_async_client(*args, **kwargs) as client:
-            yield client
-
+    registry = ProviderHTTPClientRegistry(transport=httpx.MockTransport(handler))
     monkeypatch.setattr("app.services.api_keys.AsyncGroq", None, raising=False)
-    monkeypatch.setattr("app.services.api_keys.httpx.AsyncClient", client_factory, raising=False)
 
-    service = APIKeyValidationService(Settings())
+    service = APIKeyValidationService(Settings(), http_clients=registry)
 
     with pytest.raises(ValueError) as excinfo:
         asyncio.run(service.validate("groq", "invalid", metadata={}))
@@ -136,7 +109,7 @@ def test_validate_groq_sdk_normalises_base_url(monkeypatch: pytest.MonkeyPatch)
 
     monkeypatch.setattr("app.services.api_keys.AsyncGroq", FakeGroqClient, raising=False)
 
-    service = APIKeyValidationService(Settings())
+    service = APIKeyValidationService(Settings(), http_clients=ProviderHTTPClientRegistry())
 
     asyncio.run(
         service.validate(
@@ -149,3 +122,26 @@ def test_validate_groq_sdk_normalises_base_url(monkeypatch: pytest.MonkeyPatch)
 
     assert created_kwargs.get("api_key") == "test-key"
     assert created_kwargs.get("base_url") == "https://proxy.example.com"
+
+
+def test_validation_reuses_pooled_client_per_origin() -> None:
+    """Repeated validations against one host should share a single pooled client."""
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": []})
+
+    registry = ProviderHTTPClientRegistry(transport=httpx.MockTransport(handler))
+    service = APIKeyValidationService(Settings(), http_clients=registry)
+
+    async def _validate_twice() -> dict[str, Any]:
+        await service.validate("imagerouter", "key-one")
+        await service.validate("imagerouter", "key-two")
+        stats = registry.stats()
+        await registry.aclose()
+        return stats
+
+    stats = asyncio.run(_validate_twice())
+
+    assert list(stats["pools"]) == ["https://api.imagerouter.io"]
+    assert stats["pools"]["https://api.imagerouter.io"]["checkouts"] == 2
+    assert registry.stats()["pools"] == {}
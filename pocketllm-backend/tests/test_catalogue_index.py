@@ -0,0 +1,98 @@
+"""Tests for the model catalogue search index."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.providers import ProviderModel
+from app.services.providers import ProviderModelCatalogue
+from app.services.providers.catalogue_index import CatalogueIndex, search_models
+
+
+def model(model_id: str, name: str, description: str | None = None, **metadata) -> ProviderModel:
+    return ProviderModel(
+        provider="openrouter",
+        id=model_id,
+        name=name,
+        description=description,
+        metadata=metadata or None,
+    )
+
+
+CATALOGUE = [
+    model("meta-llama/llama-3-70b", "Llama 3 70B", "Open weights chat model"),
+    model("mistralai/mixtral-8x7b", "Mixtral 8x7B", "Sparse mixture of experts", tokenizer="Mistral"),
+    model("llama-guard", "LLaMA Guard", capabilities=["moderation"]),
+    model("qwen/qwen-2-72b", "Qwen 2 72B", "Multilingual, strong at llama-style prompts"),
+]
+
+
+def ids(models: list[ProviderModel]) -> list[str]:
+    return [item.id for item in models]
+
+
+def test_filters_match_case_insensitive_substrings_per_field() -> None:
+    assert ids(search_models([CATALOGUE], name="GUARD")) == ["llama-guard"]
+    assert ids(search_models([CATALOGUE], model_id="8x7")) == ["mistralai/mixtral-8x7b"]
+    assert ids(search_models([CATALOGUE], query="moderation")) == ["llama-guard"]
+    assert ids(search_models([CATALOGUE], query="mistral")) == ["mistralai/mixtral-8x7b"]
+    assert ids(search_models([CATALOGUE], name="llama", model_id="meta")) == ["meta-llama/llama-3-70b"]
+    assert search_models([CATALOGUE], name="llama", query="experts") == []
+
+
+def test_query_matches_are_ranked_by_where_the_term_occurs() -> None:
+    catalogue = [
+        model("acme/super-llama", "Super Llama"),
+        model("notes", "Notes", "Mentions llama once"),
+        model("llama", "Llama"),
+        model("ollamas", "Ollamas"),
+        model("llama-3", "Llama 3"),
+    ]
+
+    ranked = ids(search_models([catalogue], query="llama"))
+
+    assert ranked == ["llama", "llama-3", "acme/super-llama", "ollamas", "notes"]
+
+
+def test_limit_keeps_the_best_matches_across_catalogues() -> None:
+    other = [model("llama", "Llama")]
+
+    assert ids(search_models([CATALOGUE, other], query="llama", limit=3)) == [
+        "llama",
+        "meta-llama/llama-3-70b",  # name prefix, ahead of an id prefix later in the catalogue
+        "llama-guard",
+    ]
+    assert ids(search_models([CATALOGUE, other], limit=2)) == ids(CATALOGUE[:2])
+
+
+def test_index_returns_positions_without_holding_models() -> None:
+    index = CatalogueIndex(CATALOGUE)
+
+    assert len(index) == len(CATALOGUE)
+    assert [position for _rank, position in index.search(model_id="qwen")] == [3]
+    assert index.search(query="no such model") == []
+
+
+@pytest.mark.asyncio
+async def test_cached_catalogues_build_their_index_once() -> None:
+    class Client:
+        provider = "openrouter"
+        base_url = "https://example.test"
+        metadata: dict = {}
+
+        async def list_models(self) -> list[ProviderModel]:
+            return list(CATALOGUE)
+
+    ProviderModelCatalogue.clear_cache()
+    catalogue = ProviderModelCatalogue(SimpleNamespace(provider_catalogue_cache_ttl=300), clients=[Client()])
+    try:
+        first = await catalogue.list_all_models()
+        second = await catalogue.list_all_models()
+
+        (segment,) = second.segments
+        assert segment is first.segments[0]
+        assert segment.search_index is segment.search_index
+    finally:
+        ProviderModelCatalogue.clear_cache()
@@ -1,14 +1,17 @@
+import asyncio
 import json
 import types
 import uuid
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 import httpx
 import pytest
 from fastapi import HTTPException
 
 from app.schemas.chats import MessageCreate
+from app.services import chat_summaries
 from app.services.chats import ChatsService
+from app.services.resolved_configs import invalidate_resolved_configs
 
 
 class InMemoryChatDatabase:
@@ -19,20 +22,51 @@ class InMemoryChatDatabase:
             "chats": [],
             "messages": [],
         }
+        self.selects: list[str] = []
 
-    async def select(self, table: str, *, filters=None, limit=None, order_by=None):
+    async def select(
+        self, table: str, *, columns="*", filters=None, limit=None, order_by=None, keyset=None
+    ):
+        self.selects.append(table)
         rows = [
             row
             for row in self.tables.get(table, [])
             if self._matches(row, filters or {})
         ]
+        if keyset is not None:
+            position = tuple(str(value) for value in keyset.values)
+
+            def past(row):
+                key = tuple(str(row.get(c)) for c in keyset.columns)
+                return key < position if keyset.descending else key > position
+
+            rows = [row for row in rows if past(row)]
         if order_by:
-            for order in order_by:
+            for order in reversed(list(order_by)):
                 key, reverse = self._parse_order(order)
-                rows.sort(key=lambda item: item.get(key), reverse=reverse)
+                rows.sort(key=lambda item: str(item.get(key)), reverse=reverse)
         if limit:
             rows = rows[:limit]
-        return [dict(row) for row in rows]
+        rows = [dict(row) for row in rows]
+        if "model_config:model_configs" in columns:
+            for row in rows:
+                row["model_config"] = self._embed_model_config(row.get("model_config_id"))
+        return rows
+
+    def _embed_model_config(self, model_config_id):
+        for config in self.tables["model_configs"]:
+            if str(config["id"]) == str(model_config_id):
+                embedded = dict(config)
+                embedded["provider_record"] = next(
+                    (
+                        dict(provider)
+                        for provider in self.tables["providers"]
+                        if str(provider["id"]) == str(config.get("provider_id"))
+                    ),
+                    None,
+                )
+                return embedded
+        return None
 
     async def insert(self, table: str, data: dict[str, object]):
         record = dict(data)
@@ -41,8 +75,20 @@ class InMemoryChatDatabase:
         record.setdefault("created_at", now)
         record.setdefault("updated_at", now)
         self.tables.setdefault(table, []).append(record)
+        if table == "messages":
+            # Mirrors the touch_chat_on_message trigger.
+            for chat in self.tables["chats"]:
+                if str(chat["id"]) == str(record.get("chat_id")):
+                    chat["updated_at"] = now
         return dict(record)
 
+    async def upsert(self, table: str, data: dict[str, object], *, on_conflict=None):
+        rows = self.tables.setdefault(table, [])
+        key = on_conflict or "id"
+        rows[:] = [row for row in rows if str(row.get(key)) != str(data.get(key))]
+        rows.append(dict(data))
+        return [dict(data)]
+
     async def update(self, table: str, data: dict[str, object], *, filters: dict[str, object]):
         updated: list[dict[str, object]] = []
         for row in self.tables.get(table, []):
@@ -177,11 +223,104 @@ async def test_create_message_invokes_provider(monkeypatch):
     assert result.role == "assistant"
     assert result.content == "Assistant reply"
     assert captured["body"]["messages"][-1]["content"] == "Hello"
+    assert [message["content"] for message in captured["body"]["messages"]].count("Hello") == 1
     assert len(database.tables["messages"]) == 2
+    # Model config and provider arrive embedded in the chat lookup.
+    assert sorted(database.selects) == ["chats", "messages"]
+
+
+def _sse_body(*chunks: dict[str, object]) -> bytes:
+    lines = [f"data: {json.dumps(chunk)}\n\n" for chunk in chunks]
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode()
+
+
+@pytest.mark.asyncio
+async def test_stream_message_proxies_deltas_and_persists_reply(monkeypatch):
+    database = InMemoryChatDatabase()
+    chat_id, user_id = _seed_database(database)
+    captured: dict[str, object] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        captured["body"] = json.loads(request.content.decode())
+        captured["accept"] = request.headers.get("accept")
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=_sse_body(
+                {"choices": [{"delta": {"role": "assistant"}}]},
+                {"choices": [{"delta": {"content": "Hello"}}]},
+                {"choices": [{"delta": {"content": " there"}, "finish_reason": "stop"}]},
+            ),
+        )
+
+    monkeypatch.setattr(
+        "app.services.chats.decrypt_secret",
+        lambda value, _: "sk-test",
+    )
+    service = ChatsService(
+        database=database,
+        settings=types.SimpleNamespace(chat_completion_timeout_seconds=5),
+        http_transport=httpx.MockTransport(handler),
+    )
+
+    events = await service.stream_message(
+        chat_id,
+        user_id,
+        MessageCreate(content="hi", stream=True),
+    )
+    received = [event async for event in events]
+
+    assert captured["body"]["stream"] is True
+    assert captured["accept"] == "text/event-stream"
+    assert received[0] == 'event: delta\ndata: {"content":"Hello"}\n\n'
+    assert received[1] == 'event: delta\ndata: {"content":" there"}\n\n'
+    assert received[-1].startswith("event: message\n")
+    final = json.loads(received[-1].split("data: ", 1)[1])
+    assert final["content"] == "Hello there"
+    assert final["metadata"]["finish_reason"] == "stop"
+    assert [row["role"] for row in database.tables["messages"]] == ["user", "assistant"]
 
 
 @pytest.mark.asyncio
-async def test_streaming_not_supported(monkeypatch):
+async def test_stream_message_aborts_when_client_disconnects(monkeypatch):
+    database = InMemoryChatDatabase()
+    chat_id, user_id = _seed_database(database)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=_sse_body({"choices": [{"delta": {"content": "partial"}}]}),
+        )
+
+    async def disconnected() -> bool:
+        return True
+
+    monkeypatch.setattr(
+        "app.services.chats.decrypt_secret",
+        lambda value, _: "sk-test",
+    )
+    service = ChatsService(
+        database=database,
+        settings=types.SimpleNamespace(chat_completion_timeout_seconds=5),
+        http_transport=httpx.MockTransport(handler),
+    )
+
+    events = await service.stream_message(
+        chat_id,
+        user_id,
+        MessageCreate(content="hi", stream=True),
+        is_disconnected=disconnected,
+    )
+    received = [event async for event in events]
+
+    assert received == []
+    assert [row["role"] for row in database.tables["messages"]] == ["user"]
+
+
+@pytest.mark.asyncio
+async def test_create_message_rejects_stream_flag(monkeypatch):
     database = InMemoryChatDatabase()
     chat_id, user_id = _seed_database(database)
     settings = types.SimpleNamespace()
@@ -194,4 +333,264 @@ async def test_streaming_not_supported(monkeypatch):
             MessageCreate(content="hi", stream=True),
         )
 
-    assert exc.value.status_code == 501
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_messages_page_returns_newest_first_with_cursors():
+    database = InMemoryChatDatabase()
+    chat_id, user_id = _seed_database(database)
+    for index in range(3):
+        await database.insert(
+            "messages",
+            {"chat_id": chat_id, "role": "user", "content": f"message {index}", "metadata": {}},
+        )
+    service = ChatsService(database=database, settings=types.SimpleNamespace())
+
+    first = await service.list_messages_page(chat_id, user_id, limit=2)
+    assert [message.content for message in first.items] == ["message 2", "message 1"]
+    assert first.prev_cursor is None and first.next_cursor
+
+    second = await service.list_messages_page(chat_id, user_id, limit=2, after=first.next_cursor)
+    assert [message.content for message in second.items] == ["message 0"]
+    assert second.next_cursor is None
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.list_messages_page(chat_id, uuid.uuid4(), limit=2)
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_message_sends_only_the_history_tail_that_fits(monkeypatch):
+    database = InMemoryChatDatabase()
+    chat_id, user_id = _seed_database(database)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    for index in range(30):
+        database.tables["messages"].append(
+            {
+                "id": uuid.uuid4(),
+                "chat_id": chat_id,
+                "role": "user" if index % 2 == 0 else "assistant",
+                "content": f"turn {index:02d} " + "x" * 400,
+                "metadata": {},
+                "created_at": start + timedelta(minutes=index),
+            }
+        )
+    captured: dict[str, object] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        captured["body"] = json.loads(request.content.decode())
+        return httpx.Response(
+            200, json={"choices": [{"message": {"content": "ok"}, "finish_reason": "stop"}]}
+        )
+
+    monkeypatch.setattr("app.services.chats.decrypt_secret", lambda value, _: "sk-test")
+    service = ChatsService(
+        database=database,
+        settings=types.SimpleNamespace(
+            chat_default_context_window=2000, chat_history_page_size=4
+        ),
+        http_transport=httpx.MockTransport(handler),
+    )
+
+    await service.create_message(chat_id, user_id, MessageCreate(content="Latest question"))
+
+    sent = captured["body"]["messages"]
+    # 2000 * 0.9 - 128 reserved output tokens leaves room for the newest turns only.
+    assert 1 < len(sent) < 30
+    assert sent[-1]["content"] == "Latest question"
+    assert sent[-2]["content"].startswith("turn 29")
+    assert [m["content"][:7] for m in sent[:-1]] == sorted(m["content"][:7] for m in sent[:-1])
+    # Pages are read lazily: only as many as the budget needed.
+    assert database.selects.count("messages") < 30 // 4
+
+
+def _summary_settings(**overrides):
+    values = dict(
+        chat_default_context_window=8000,
+        chat_history_page_size=8,
+        chat_summary_enabled=True,
+        chat_summary_provider="openai",
+        chat_summary_model="summary-model",
+        chat_summary_trigger_tokens=50,
+        chat_summary_keep_recent=2,
+        chat_summary_min_batch_tokens=20,
+        openai_api_key="sk-deployment",
+    )
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
+
+
+@pytest.mark.asyncio
+async def test_create_message_sends_summary_and_compacts_in_background(monkeypatch):
+    database = InMemoryChatDatabase()
+    chat_id, user_id = _seed_database(database)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    for index in range(30):
+        database.tables["messages"].append(
+            {
+                "id": uuid.uuid4(),
+                "chat_id": chat_id,
+                "role": "user" if index % 2 == 0 else "assistant",
+                "content": f"turn {index:02d}",
+                "metadata": {},
+                "created_at": start + timedelta(minutes=index),
+            }
+        )
+    covered = database.tables["messages"][19]
+    database.tables["chat_summaries"] = [
+        {
+            "chat_id": chat_id,
+            "summary": "old summary",
+            "covered_until": covered["created_at"],
+            "covered_message_id": covered["id"],
+            "token_estimate": 3,
+        }
+    ]
+    requests: dict[str, object] = {}
+    release_summary = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content.decode())
+        if body["model"] == "summary-model":
+            requests["summary"] = body
+            await release_summary.wait()
+            content = "new summary"
+        else:
+            requests["chat"] = body
+            content = "ok"
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    monkeypatch.setattr("app.services.chats.decrypt_secret", lambda value, _: "sk-test")
+    service = ChatsService(
+        database=database,
+        settings=_summary_settings(),
+        http_transport=httpx.MockTransport(handler),
+    )
+
+    reply = await service.create_message(chat_id, user_id, MessageCreate(content="Latest"))
+
+    # The reply does not wait on the summariser, which is still blocked.
+    assert reply.content == "ok"
+    sent = [message["content"] for message in requests["chat"]["messages"]]
+    assert sent[0] == "Summary of the earlier conversation:\nold summary"
+    assert sent[1:] == [f"turn {index:02d}" for index in range(20, 30)] + ["Latest"]
+
+    pending = chat_summaries._inflight[str(chat_id)]
+    assert not pending.done()
+    release_summary.set()
+    await pending
+
+    prompt = requests["summary"]["messages"][-1]["content"]
+    assert prompt.startswith("Existing summary:\nold summary")
+    assert "turn 19" not in prompt and "turn 20" in prompt
+    (stored,) = database.tables["chat_summaries"]
+    assert stored["summary"] == "new summary"
+    kept = sorted(database.tables["messages"], key=lambda row: str(row["created_at"]))[-2:]
+    assert stored["covered_message_id"] not in {str(row["id"]) for row in kept}
+
+
+@pytest.mark.asyncio
+async def test_summary_waits_for_a_batch_beyond_the_kept_turns(monkeypatch):
+    database = InMemoryChatDatabase()
+    chat_id, user_id = _seed_database(database)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    for index, content in enumerate(["short question", "long answer " + "x" * 800]):
+        database.tables["messages"].append(
+            {
+                "id": uuid.uuid4(),
+                "chat_id": chat_id,
+                "role": "user" if index % 2 == 0 else "assistant",
+                "content": content,
+                "metadata": {},
+                "created_at": start + timedelta(minutes=index),
+            }
+        )
+    models: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        models.append(json.loads(request.content.decode())["model"])
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    monkeypatch.setattr("app.services.chats.decrypt_secret", lambda value, _: "sk-test")
+    service = ChatsService(
+        database=database,
+        settings=_summary_settings(),
+        http_transport=httpx.MockTransport(handler),
+    )
+
+    # The kept turns (the long answer and the new question) alone pass the
+    # trigger, but folding the one short turn behind them is not worth a run.
+    await service.create_message(chat_id, user_id, MessageCreate(content="Next question"))
+
+    assert str(chat_id) not in chat_summaries._inflight
+    assert "summary-model" not in models
+    assert "chat_summaries" not in database.tables or not database.tables["chat_summaries"]
+
+
+@pytest.mark.asyncio
+async def test_summarizer_runs_once_per_chat_at_a_time():
+    database = InMemoryChatDatabase()
+    chat_id, _ = _seed_database(database)
+    release = asyncio.Event()
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return httpx.Response(200, json={"choices": [{"message": {"content": "s"}}]})
+
+    for index in range(5):
+        database.tables["messages"].append(
+            {
+                "id": uuid.uuid4(),
+                "chat_id": chat_id,
+                "role": "user",
+                "content": f"turn {index}",
+                "created_at": datetime(2025, 1, 1, tzinfo=UTC) + timedelta(minutes=index),
+            }
+        )
+    summarizer = chat_summaries.ConversationSummarizer(
+        database,
+        _summary_settings(),
+        base_url="https://api.openai.com/v1",
+        http_transport=httpx.MockTransport(handler),
+    )
+
+    first = summarizer.schedule(chat_id)
+    second = summarizer.schedule(chat_id)
+    assert first is second
+    release.set()
+    await first
+    assert calls == 1
+    assert str(chat_id) not in chat_summaries._inflight
+
+
+@pytest.mark.asyncio
+async def test_provider_key_is_decrypted_once_across_turns(monkeypatch):
+    database = InMemoryChatDatabase()
+    chat_id, user_id = _seed_database(database)
+    decrypted: list[str] = []
+
+    def fake_decrypt(value, _):
+        decrypted.append(value)
+        return "sk-test"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    monkeypatch.setattr("app.services.chats.decrypt_secret", fake_decrypt)
+    service = ChatsService(
+        database=database,
+        settings=types.SimpleNamespace(),
+        http_transport=httpx.MockTransport(handler),
+    )
+
+    await service.create_message(chat_id, user_id, MessageCreate(content="one"))
+    await service.create_message(chat_id, user_id, MessageCreate(content="two"))
+    assert decrypted == ["cipher"]
+
+    invalidate_resolved_configs(user_id)
+    await service.create_message(chat_id, user_id, MessageCreate(content="three"))
+    assert decrypted == ["cipher", "cipher"]
@@ -0,0 +1,76 @@
+import time
+import types
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.schemas.chats import Message
+from app.schemas.models import ModelSettings
+from app.schemas.providers import ProviderModel
+from app.services.context_window import (
+    ContextWindow,
+    estimate_tokens,
+    resolve_context_budget,
+)
+from app.services.providers.catalogue import ProviderModelCatalogue, _CacheEntry
+
+
+@pytest.fixture(autouse=True)
+def _clear_catalogue_cache():
+    ProviderModelCatalogue.clear_cache()
+    yield
+    ProviderModelCatalogue.clear_cache()
+
+
+def _message(content: str, minutes: int) -> Message:
+    return Message(
+        id=uuid.uuid4(),
+        chat_id=uuid.uuid4(),
+        role="user",
+        content=content,
+        created_at=datetime(2025, 1, 1, tzinfo=UTC) + timedelta(minutes=minutes),
+    )
+
+
+def test_estimate_tokens_handles_ascii_and_other_scripts():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("日本語") == 3
+    assert estimate_tokens("hi 日本") == 3
+
+
+def test_budget_prefers_catalogue_limits_and_falls_back_to_settings():
+    settings = types.SimpleNamespace(chat_default_context_window=4000)
+    fallback = resolve_context_budget("openai", "gpt-x", ModelSettings(max_tokens=500), settings)
+    assert fallback.context_window == 4000
+    assert fallback.max_output_tokens == 500
+    assert fallback.prompt_tokens == 3100
+
+    ProviderModelCatalogue._cache["openai|key"] = _CacheEntry(
+        expires_at=time.time() + 300,
+        stale_until=time.time() + 600,
+        models=[
+            ProviderModel(
+                provider="openai",
+                id="gpt-x",
+                name="GPT X",
+                context_window=128_000,
+                max_output_tokens=300,
+            )
+        ],
+    )
+    budget = resolve_context_budget("openai", "gpt-x", ModelSettings(max_tokens=500), settings)
+    assert budget.context_window == 128_000
+    assert budget.max_output_tokens == 300
+
+
+def test_context_window_keeps_a_contiguous_tail():
+    window = ContextWindow(budget=30)
+    window.reserve("system", "x" * 16)
+    newest_first = [_message("a" * 20, 3), _message("b" * 80, 2), _message("c" * 4, 1)]
+    window.offer(newest_first)
+
+    assert window.full is True
+    # "c" would fit on its own but is older than the message that overflowed.
+    assert [message["content"] for message in window.messages()] == ["a" * 20]
@@ -6,7 +6,7 @@ import pytest
 
 from cryptography.fernet import Fernet
 
-from app.utils.crypto import decrypt_secret, encrypt_secret
+from app.utils.crypto import decrypt_many, decrypt_secret, encrypt_secret, get_keyring
 
 
 class _Settings:
@@ -55,3 +55,25 @@ def test_encrypt_decrypt_with_long_non_base64_key(secret: str) -> None:
     token = encrypt_secret(secret, settings)
 
     assert decrypt_secret(token, settings) == secret
+
+
+def test_keyring_is_built_once_per_key() -> None:
+    settings = _Settings(encryption_key=Fernet.generate_key().decode("utf-8"))
+
+    assert get_keyring(settings) is get_keyring(settings)
+
+
+def test_legacy_keys_decrypt_and_report_rotated_tokens() -> None:
+    old_key = Fernet.generate_key().decode("utf-8")
+    old_token = encrypt_secret("sk-old", _Settings(encryption_key=old_key))
+    settings = _Settings(encryption_key=Fernet.generate_key().decode("utf-8"))
+    settings.encryption_legacy_keys = f" {old_key} ,"
+    fresh_token = encrypt_secret("sk-new", settings)
+
+    rotated: dict[str, str] = {}
+    values = decrypt_many([old_token, fresh_token, "garbage"], settings, rotated=rotated)
+
+    assert values == ["sk-old", "sk-new", None]
+    assert list(rotated) == [old_token]
+    primary_only = _Settings(encryption_key=settings.encryption_key)
+    assert decrypt_secret(rotated[old_token], primary_only) == "sk-old"
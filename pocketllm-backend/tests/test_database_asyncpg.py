@@ -0,0 +1,139 @@
+import os
+import types
+import uuid
+
+import pytest
+
+from app.core.postgres import AsyncpgDatabase, build_count, build_insert, build_select, build_update
+
+TEST_DATABASE_URL = os.getenv("POCKETLLM_TEST_DATABASE_URL")
+
+
+def test_select_sql_embeds_related_rows_and_binds_filters_as_jsonb():
+    sql = build_select(
+        "public",
+        "chats",
+        "*,model_config:model_configs(*,provider_record:providers(*))",
+        ("id", "user_id"),
+        (),
+        (),
+        1,
+    )
+
+    assert sql.startswith("SELECT to_jsonb(t0.*) || jsonb_build_object('model_config'")
+    assert 'WHERE t1."id" = t0."model_config_id"' in sql
+    assert 'WHERE t2."id" = t1."provider_id"' in sql
+    assert 'jsonb_populate_record(NULL::"public"."chats", $1::jsonb) AS f' in sql
+    assert sql.endswith('WHERE t0."id" = f."id" AND t0."user_id" = f."user_id" LIMIT 1')
+    # Identical call shapes reuse the same SQL text, and so the prepared statement.
+    assert build_select("public", "chats", "*", ("id",), (), (), 1) is build_select(
+        "public", "chats", "*", ("id",), (), (), 1
+    )
+
+
+def test_write_sql_returns_rows_and_handles_conflicts():
+    upsert = build_insert("public", "providers", ("user_id", "provider", "base_url"), ("user_id", "provider"))
+    assert 'ON CONFLICT ("user_id", "provider") DO UPDATE SET "base_url" = EXCLUDED."base_url"' in upsert
+    assert upsert.endswith("RETURNING to_jsonb(t0.*)")
+
+    update = build_update("public", "chats", ("title",), ("id",), ("archived_at",))
+    assert 'SET "title" = d."title"' in update
+    assert 'WHERE t0."id" = f."id" AND t0."archived_at" IS NULL' in update
+
+
+def test_count_sql_counts_server_side():
+    sql = build_count("public", "notifications", ("user_id", "is_read"), ())
+    assert sql.startswith('SELECT count(*) FROM "public"."notifications" AS t0')
+    assert sql.endswith('WHERE t0."user_id" = f."user_id" AND t0."is_read" = f."is_read"')
+
+
+def test_identifiers_are_validated():
+    with pytest.raises(ValueError):
+        build_select("public", "chats; drop table chats", "*", (), (), (), None)
+    with pytest.raises(ValueError):
+        build_select("public", "chats", "id,title)--", (), (), (), None)
+
+
+def test_backend_requires_database_url():
+    with pytest.raises(ValueError):
+        AsyncpgDatabase(types.SimpleNamespace(database_url=None))
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="POCKETLLM_TEST_DATABASE_URL is not set")
+async def test_crud_and_transactions_against_local_postgres():
+    schema = f"pocketllm_test_{uuid.uuid4().hex[:8]}"
+    settings = types.SimpleNamespace(
+        database_url=TEST_DATABASE_URL,
+        database_pool_min_size=1,
+        database_pool_max_size=2,
+        database_statement_timeout=5_000,
+        supabase_schema=schema,
+    )
+    database = AsyncpgDatabase(settings)
+    await database.connect()
+    pool = database._pool
+    await pool.execute(
+        f"""
+        create schema {schema};
+        create table {schema}.providers (
+            id uuid primary key default gen_random_uuid(),
+            user_id uuid not null,
+            provider text not null,
+            metadata jsonb not null default '{{}}'::jsonb,
+            unique (user_id, provider)
+        );
+        create table {schema}.model_configs (
+            id uuid primary key default gen_random_uuid(),
+            user_id uuid not null,
+            provider_id uuid references {schema}.providers(id),
+            model text not null
+        );
+        create table {schema}.chats (
+            id uuid primary key default gen_random_uuid(),
+            user_id uuid not null,
+            title text not null,
+            model_config_id uuid references {schema}.model_configs(id),
+            updated_at timestamptz not null default now()
+        );
+        """
+    )
+    try:
+        user_id = str(uuid.uuid4())
+        provider = await database.insert(
+            "providers", {"user_id": user_id, "provider": "openai", "metadata": {"a": 1}}
+        )
+        assert provider["metadata"] == {"a": 1}
+        upserted = await database.upsert(
+            "providers",
+            {"user_id": user_id, "provider": "openai", "metadata": {"a": 2}},
+            on_conflict="user_id,provider",
+        )
+        assert upserted[0]["id"] == provider["id"]
+
+        config = await database.insert(
+            "model_configs", {"user_id": user_id, "provider_id": provider["id"], "model": "gpt"}
+        )
+        chat = await database.insert(
+            "chats", {"user_id": user_id, "title": "Hello", "model_config_id": config["id"]}
+        )
+        [bundle] = await database.select(
+            "chats",
+            columns="*,model_config:model_configs(*,provider_record:providers(*))",
+            filters={"id": chat["id"], "user_id": user_id},
+            limit=1,
+        )
+        assert bundle["model_config"]["provider_record"]["metadata"] == {"a": 2}
+
+        with pytest.raises(RuntimeError):
+            async with database.transaction() as tx:
+                await tx.update("chats", {"title": "Rolled back"}, filters={"id": chat["id"]})
+                raise RuntimeError("abort")
+        [reloaded] = await database.select("chats", filters={"id": chat["id"]})
+        assert reloaded["title"] == "Hello"
+
+        deleted = await database.delete("chats", filters={"id": chat["id"]})
+        assert [row["id"] for row in deleted] == [chat["id"]]
+    finally:
+        await pool.execute(f"drop schema {schema} cascade")
+        await database.disconnect()
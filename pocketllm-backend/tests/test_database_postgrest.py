@@ -0,0 +1,126 @@
+import json
+import types
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.core.postgrest import PostgRESTDatabase, PostgRESTError
+
+
+def _settings(**overrides):
+    values = {
+        "supabase_url": "https://project.supabase.co/",
+        "supabase_service_role_key": "service-key",
+        "supabase_schema": "public",
+    }
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
+
+
+def _database(handler) -> PostgRESTDatabase:
+    return PostgRESTDatabase(_settings(), transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_select_builds_postgrest_query():
+    captured: dict[str, httpx.Request] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        captured["request"] = request
+        return httpx.Response(200, json=[{"id": "1"}])
+
+    database = _database(handler)
+    user_id = uuid.uuid4()
+    rows = await database.select(
+        "chats",
+        columns="id,title",
+        filters={"user_id": user_id, "archived": False},
+        order_by=["updated_at.desc", ("id", False)],
+        limit=5,
+    )
+
+    request = captured["request"]
+    assert rows == [{"id": "1"}]
+    assert request.method == "GET"
+    assert request.url.path == "/rest/v1/chats"
+    assert request.url.params.get("select") == "id,title"
+    assert request.url.params.get("user_id") == f"eq.{user_id}"
+    assert request.url.params.get("archived") == "eq.false"
+    assert request.url.params.get("order") == "updated_at.desc,id.asc"
+    assert request.url.params.get("limit") == "5"
+    assert request.headers["apikey"] == "service-key"
+    assert request.headers["authorization"] == "Bearer service-key"
+    await database.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_writes_request_representation_and_serialise_payload():
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = json.loads(request.content.decode()) if request.content else {}
+        return httpx.Response(201, json=[body] if isinstance(body, dict) else body)
+
+    database = _database(handler)
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    inserted = await database.insert("messages", {"chat_id": uuid.UUID(int=1), "created_at": created_at})
+    await database.upsert("providers", {"provider": "openai"}, on_conflict="user_id,provider")
+    await database.update("chats", {"title": "Renamed"}, filters={"id": "abc"})
+
+    insert, upsert, update = requests
+    assert inserted["created_at"] == created_at.isoformat()
+    assert inserted["chat_id"] == str(uuid.UUID(int=1))
+    assert insert.headers["prefer"] == "return=representation"
+    assert upsert.url.params.get("on_conflict") == "user_id,provider"
+    assert upsert.headers["prefer"] == "resolution=merge-duplicates,return=representation"
+    assert update.method == "PATCH"
+    assert update.url.params.get("id") == "eq.abc"
+    await database.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_get_profile_returns_none_when_missing_and_errors_raise():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/profiles"):
+            return httpx.Response(200, json=[])
+        return httpx.Response(404, json={"code": "42P01", "message": "relation does not exist"})
+
+    database = _database(handler)
+    assert await database.get_profile(uuid.uuid4()) is None
+
+    with pytest.raises(PostgRESTError) as exc_info:
+        await database.select("missing")
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.code == "42P01"
+    await database.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_count_issues_head_request_and_reads_content_range():
+    captured: dict[str, httpx.Request] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        captured["request"] = request
+        return httpx.Response(200, headers={"Content-Range": "*/7"})
+
+    database = _database(handler)
+    total = await database.count("notifications", filters={"user_id": "u1", "is_read": False})
+
+    request = captured["request"]
+    assert total == 7
+    assert request.method == "HEAD"
+    assert request.headers["prefer"] == "count=exact"
+    assert request.url.params.get("is_read") == "eq.false"
+    await database.disconnect()
+
+
+def test_get_database_selects_backend_from_settings(monkeypatch):
+    from app.core import database as database_module
+
+    monkeypatch.setattr(database_module, "_database_instance", None)
+    backend = database_module.get_database(_settings(database_backend="postgrest"))
+    assert isinstance(backend, PostgRESTDatabase)
+    monkeypatch.setattr(database_module, "_database_instance", None)
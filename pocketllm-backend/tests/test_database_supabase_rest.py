@@ -172,8 +172,10 @@ def test_startup_allows_unverified_connection_when_not_strict(monkeypatch) -> No
     monkeypatch.setattr(SupabaseDatabase, "_client", None, raising=False)
 
     monkeypatch.delenv("SUPABASE_STRICT_STARTUP", raising=False)
+    monkeypatch.delenv("SUPABASE_SKIP_CONNECTION_TEST", raising=False)
 
     supabase = SupabaseDatabase()
+    supabase.connect()
 
     assert supabase._allow_unverified_connection is True  # type: ignore[attr-defined]
     assert supabase._connection_verified is False  # type: ignore[attr-defined]
@@ -182,6 +184,23 @@ def test_startup_allows_unverified_connection_when_not_strict(monkeypatch) -> No
     SupabaseDatabase._client = None
 
 
+def test_construction_defers_client_creation(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    created = []
+    monkeypatch.setattr(sys.modules["supabase"], "create_client", lambda *args: created.append(args) or object())
+    monkeypatch.setattr(SupabaseDatabase, "_instance", None, raising=False)
+    monkeypatch.setattr(SupabaseDatabase, "_client", None, raising=False)
+
+    supabase = SupabaseDatabase()
+    assert created == []
+
+    client = supabase.client
+    assert supabase.client is client
+    assert len(created) == 1
+
+    SupabaseDatabase._instance = None
+    SupabaseDatabase._client = None
+
+
 def test_startup_raises_when_strict_and_connection_fails(monkeypatch) -> None:  # type: ignore[no-untyped-def]
     def _failing_test(self):  # type: ignore[no-untyped-def]
         self._connection_verified = False
@@ -193,9 +212,11 @@ def test_startup_raises_when_strict_and_connection_fails(monkeypatch) -> None:
     monkeypatch.setattr(SupabaseDatabase, "_client", None, raising=False)
 
     monkeypatch.setenv("SUPABASE_STRICT_STARTUP", "1")
+    monkeypatch.delenv("SUPABASE_SKIP_CONNECTION_TEST", raising=False)
 
+    supabase = SupabaseDatabase()
     with pytest.raises(ConnectionError):
-        SupabaseDatabase()
+        supabase.connect()
 
     monkeypatch.delenv("SUPABASE_STRICT_STARTUP", raising=False)
     SupabaseDatabase._instance = None
@@ -0,0 +1,69 @@
+"""Import-time budget for the serverless entry point.
+
+Each cold start on Vercel imports ``main`` before serving anything, so the
+import must stay cheap: it must not reach the network, load the Supabase
+SDK or load the LangChain/LangGraph agent stack. The budget can be
+tightened (or relaxed on slow CI machines) with ``IMPORT_TIME_BUDGET``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+IMPORT_TIME_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET", "6.0"))
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+deferred = ("supabase", "langchain_core", "langchain_classic", "langgraph")
+print(json.dumps({"seconds": elapsed, "loaded": [name for name in deferred if name in sys.modules]}))
+"""
+
+
+def _import_main() -> dict[str, object]:
+    env = {
+        **os.environ,
+        "SUPABASE_URL": os.environ.get("SUPABASE_URL", "https://example.supabase.co"),
+        "SUPABASE_SERVICE_ROLE_KEY": os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "service-role-key"),
+        "LOG_LEVEL": "WARNING",
+    }
+    # A connectivity check at import time would make this test hit the network.
+    env.pop("SUPABASE_SKIP_CONNECTION_TEST", None)
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_main_stays_within_budget() -> None:
+    measurement = _import_main()
+
+    assert measurement["loaded"] == []
+    assert measurement["seconds"] < IMPORT_TIME_BUDGET, (
+        f"import main took {measurement['seconds']:.2f}s (budget {IMPORT_TIME_BUDGET:.2f}s)"
+    )
+
+
+def test_agent_exports_resolve_after_loading_the_stack() -> None:
+    from app.services import agents
+
+    asyncio.run(agents.load_agent_stack())
+
+    from app.services.agents.registry import build_agent_registry
+
+    assert agents.build_agent_registry is build_agent_registry
+    assert agents.AgentContext(session_id="s", user_id="u").session_id == "s"
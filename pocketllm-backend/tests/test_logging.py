@@ -0,0 +1,89 @@
+"""Tests for the queued, sampled logging pipeline."""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import types
+
+import pytest
+
+from app.core import logging as app_logging
+from app.core.logging import SAMPLED, JSONFormatter, SamplingFilter, lazy_json
+
+
+def _settings(**overrides: object) -> types.SimpleNamespace:
+    values = {"log_json": True, "log_level": "INFO", "environment": "test", "db_log_sample_rate": 1.0}
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
+
+
+@pytest.fixture
+def captured():
+    stream = io.StringIO()
+    yield stream
+    app_logging.stop_logging()
+    logging.config.dictConfig({"version": 1, "disable_existing_loggers": False})
+
+
+def _configure(stream: io.StringIO, **overrides: object) -> None:
+    app_logging.configure_logging(_settings(**overrides))
+    # The listener writes through the handler dictConfig created.
+    logging.getHandlerByName("default").setStream(stream)
+
+
+def _records(stream: io.StringIO) -> list[dict[str, object]]:
+    app_logging.stop_logging()  # drains the queue
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    return [record for record in records if record["message"] != "Logging configured"]
+
+
+def test_json_formatter_includes_extra_fields() -> None:
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    record.table = "chats"
+
+    payload = json.loads(JSONFormatter().format(record))
+
+    assert payload["message"] == "hello world"
+    assert payload["logger"] == "app.test" and payload["level"] == "INFO"
+    assert payload["table"] == "chats"
+    assert "args" not in payload and "msg" not in payload
+
+
+def test_sampling_filter_keeps_failures_and_unmarked_records() -> None:
+    sampler = SamplingFilter(0.0)
+
+    def record(level: int, sampled: bool) -> logging.LogRecord:
+        entry = logging.LogRecord("app", level, __file__, 1, "msg", (), None)
+        if sampled:
+            setattr(entry, SAMPLED, True)
+        return entry
+
+    assert not sampler.filter(record(logging.INFO, sampled=True))
+    assert sampler.filter(record(logging.INFO, sampled=False))
+    assert sampler.filter(record(logging.ERROR, sampled=True))
+
+
+def test_records_are_written_by_the_listener_thread(captured) -> None:
+    _configure(captured, db_log_sample_rate=0.0)
+    logger = logging.getLogger("app.database.connection")
+
+    logger.info("kept %s", lazy_json({"rows": 1}))
+    logger.info("dropped", extra={SAMPLED: True})
+    logger.critical("failure", extra={SAMPLED: True})
+
+    messages = [entry["message"] for entry in _records(captured)]
+    assert messages == ['kept {"rows": 1}', "failure"]
+
+
+def test_lazy_json_is_not_rendered_below_the_log_level(captured) -> None:
+    _configure(captured, log_level="WARNING")
+
+    class Exploding:
+        def __str__(self) -> str:  # pragma: no cover - must not be called
+            raise AssertionError("formatted")
+
+    logging.getLogger("app.test").info("value %s", lazy_json(Exploding()))
+
+    assert _records(captured) == []
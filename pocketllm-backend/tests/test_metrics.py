@@ -0,0 +1,117 @@
+"""Tests for the Prometheus metrics registry, exporter and instrumentation."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.metrics import (
+    DB_OPERATION_ERRORS,
+    DB_OPERATION_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    MetricsExporter,
+    MetricsRegistry,
+    instrument_db_operation,
+)
+from app.core.middleware import MetricsMiddleware
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ("route",), buckets=(0.1, 1.0))
+    child = latency.labels('/a"b')
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+    registry.counter("demo_total", "Demo counter.").inc(2)
+
+    text = metrics.render(registry.snapshot())
+
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="1"} 3' in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{route="/a\\"b"} 4' in text
+    assert 'demo_seconds_sum{route="/a\\"b"} 3.65' in text
+    assert "demo_total 2" in text
+
+
+def test_middleware_labels_requests_by_route_template() -> None:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    async def item(item_id: str) -> dict[str, str]:
+        return {"id": item_id}
+
+    app.include_router(router, prefix="/v1")
+    client = TestClient(app)
+    client.get("/v1/items/1")
+    client.get("/v1/items/2")
+    client.get("/does-not-exist")
+
+    samples = {key: child.counts for key, child in HTTP_REQUEST_SECONDS._children.items()}
+    assert sum(samples[("GET", "/v1/items/{item_id}", "200")]) == 2
+    assert sum(samples[("GET", "unmatched", "404")]) == 1
+
+
+def test_db_operations_are_timed_by_table_and_operation() -> None:
+    class Backend:
+        @instrument_db_operation("select")
+        async def select(self, table: str) -> list[dict[str, str]]:
+            return []
+
+        @instrument_db_operation("get_profile", table="profiles")
+        async def get_profile(self, user_id: str) -> None:
+            raise RuntimeError("boom")
+
+    backend = Backend()
+    asyncio.run(backend.select("chats"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(backend.get_profile("user"))
+
+    assert sum(DB_OPERATION_SECONDS.labels("chats", "select").counts) == 1
+    assert sum(DB_OPERATION_SECONDS.labels("profiles", "get_profile").counts) == 1
+    assert DB_OPERATION_ERRORS.labels("profiles", "get_profile").value == 1
+    assert ("chats", "select") not in DB_OPERATION_ERRORS._children
+
+
+def test_exporter_merges_worker_snapshots(tmp_path) -> None:
+    settings = types.SimpleNamespace(metrics_multiproc_dir=str(tmp_path), metrics_flush_interval=10.0)
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("demo_seconds", "Latency.", buckets=(1.0,))
+    depth = registry.gauge("demo_depth", "Depth.")
+    requests.labels("/a").inc(3)
+    latency.observe(0.5)
+    depth.set(4)
+
+    sibling = MetricsExporter(settings, registry)
+    sibling._pid = 1
+    sibling.flush()
+    stale = tmp_path / "worker-1.json"
+    os.utime(stale, (0, 0))
+
+    requests.labels("/a").inc(2)
+    latency.observe(2.0)
+    text = MetricsExporter(settings, registry).render()
+
+    assert 'demo_requests_total{route="/a"} 8' in text
+    assert 'demo_seconds_bucket{le="1"} 2' in text
+    assert 'demo_seconds_count 3' in text
+    assert f'demo_depth{{pid="{os.getpid()}"}} 4' in text
+    assert 'pid="1"' not in text
@@ -0,0 +1,128 @@
+"""Tests for the ASGI request context, logging and Server-Timing middleware."""
+
+from __future__ import annotations
+
+import json
+import logging
+import types
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.http_clients import provider_http_client
+from app.core.metrics import instrument_db_operation
+from app.core.middleware import LoggingMiddleware, RequestContextMiddleware, ServerTimingMiddleware
+from app.core.timing import current_timings, timed
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    app.add_middleware(LoggingMiddleware)
+
+    @app.get("/echo")
+    async def echo(request: Request) -> dict[str, str]:
+        return {"request_id": request.state.request_id}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for index in range(3):
+                yield f"chunk {index}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def test_headers_match_request_state_and_log_record(caplog) -> None:
+    client = TestClient(_build_app())
+
+    with caplog.at_level(logging.INFO, logger="pocketllm.api"):
+        response = client.get("/echo")
+
+    request_id = response.json()["request_id"]
+    assert response.headers["X-Request-ID"] == request_id
+    assert float(response.headers["X-Process-Time"]) >= 0
+    (record,) = [r for r in caplog.records if r.name == "pocketllm.api"]
+    assert (record.method, record.path, record.status_code) == ("GET", "/echo", 200)
+    assert record.request_id == request_id
+    assert record.duration_ms == float(response.headers["X-Process-Time"])
+    assert record.client_ip == "testclient"
+
+
+def test_streaming_responses_pass_through_with_headers() -> None:
+    client = TestClient(_build_app())
+
+    response = client.get("/stream")
+
+    assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+    assert "X-Request-ID" in response.headers and "X-Process-Time" in response.headers
+
+
+def _build_timing_app(**settings: object) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, settings=types.SimpleNamespace(**settings))
+    app.add_middleware(RequestContextMiddleware)
+
+    class Backend:
+        @instrument_db_operation("select")
+        async def select(self, table: str) -> list[dict[str, str]]:
+            return []
+
+    async def upstream(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={})
+
+    @app.get("/work")
+    async def work() -> dict[str, bool]:
+        await Backend().select("chats")
+        async with provider_http_client(
+            "https://api.example.com/v1", transport=httpx.MockTransport(upstream)
+        ) as client:
+            await client.get("https://api.example.com/v1/models")
+        with timed("decrypt", "secret"):
+            pass
+        return {"timed": current_timings() is not None}
+
+    return app
+
+
+def test_server_timing_is_off_by_default() -> None:
+    client = TestClient(_build_timing_app(server_timing_token="secret"))
+
+    response = client.get("/work")
+
+    assert response.json() == {"timed": False}
+    assert "Server-Timing" not in response.headers
+
+
+def test_server_timing_header_for_requests_presenting_the_token() -> None:
+    client = TestClient(_build_timing_app(server_timing_token="secret"))
+
+    rejected = client.get("/work", headers={"X-Server-Timing": "wrong"})
+    response = client.get("/work", headers={"X-Server-Timing": "secret"})
+
+    assert "Server-Timing" not in rejected.headers
+    assert response.json() == {"timed": True}
+    entries = [entry.strip() for entry in response.headers["Server-Timing"].split(",")]
+    names = [entry.split(";", 1)[0] for entry in entries]
+    assert names == ["db", "provider", "decrypt", "app"]
+    assert entries[0].endswith('desc="1 calls"')
+
+
+def test_server_timing_logs_spans_with_request_id(caplog) -> None:
+    client = TestClient(_build_timing_app(server_timing_enabled=True))
+
+    with caplog.at_level(logging.DEBUG, logger="pocketllm.timing"):
+        response = client.get("/work")
+
+    (record,) = [r for r in caplog.records if r.name == "pocketllm.timing"]
+    detail = json.loads(record.args[0])
+    assert detail["request_id"] == response.headers["X-Request-ID"]
+    assert [span["name"] for span in detail["spans"]] == [
+        "chats.select",
+        "GET api.example.com",
+        "secret",
+    ]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import importlib.util
+import json
 import os
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -53,6 +54,7 @@ def client(monkeypatch):
             name: str | None = None,
             model_id: str | None = None,
             query: str | None = None,
+            limit: int | None = None,
         ) -> ProviderModelsResponse:
             calls.append(
                 {
@@ -61,6 +63,7 @@ def client(monkeypatch):
                     "name": name,
                     "model_id": model_id,
                     "query": query,
+                    "limit": limit,
                 }
             )
             return ProviderModelsResponse(
@@ -74,6 +77,15 @@ def client(monkeypatch):
                 configured_providers=["imagerouter"],
             )
 
+        async def stream_provider_models(self, user_id, provider: str | None = None, **filters: Any):
+            calls.append({"user_id": user_id, "provider": provider, "stream": True, **filters})
+
+            async def events():
+                yield "provider", {"provider": "imagerouter", "status": "ok", "model_count": 1, "models": []}
+                yield "done", {"partial": False}
+
+            return events()
+
     monkeypatch.setattr(models_endpoint, "ProvidersService", StubProvidersService)
 
     async def override_current_user():
@@ -121,3 +133,36 @@ def test_legacy_filter_path_parses_optional_filters(client):
     assert last_call["name"] == "flux"
     assert last_call["model_id"] == "flux-pro"
     assert last_call["query"] == "flux"
+
+
+def test_models_endpoint_streams_ndjson_when_requested(client):
+    test_client, calls = client
+    response = test_client.get(
+        "/v1/models?query=flux", headers={"Accept": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["event"] for line in lines] == ["provider", "done"]
+    assert lines[0]["data"]["provider"] == "imagerouter"
+    assert calls[-1]["stream"] is True and calls[-1]["query"] == "flux"
+
+
+def test_models_endpoint_streams_server_sent_events_when_requested(client):
+    test_client, _calls = client
+    response = test_client.get("/v1/models", headers={"Accept": "text/event-stream"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: provider\ndata: {")
+    assert response.text.endswith('event: done\ndata: {"partial":false}\n\n')
+
+
+def test_models_endpoint_passes_the_result_limit(client):
+    test_client, calls = client
+    response = test_client.get("/v1/models?query=flux&limit=5")
+
+    assert response.status_code == 200
+    assert calls[-1]["limit"] == 5
+    assert test_client.get("/v1/models?limit=0").status_code == 422
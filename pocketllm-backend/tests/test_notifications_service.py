@@ -0,0 +1,108 @@
+import types
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.notifications import NotificationService, UnreadCountCache, unread_counts
+
+
+class NotificationDatabase:
+    def __init__(self) -> None:
+        self.rows: list[dict[str, object]] = []
+        self.count_calls = 0
+        self.select_calls = 0
+
+    def _matches(self, row, filters):
+        return all(str(row.get(key)) == str(value) for key, value in filters.items())
+
+    async def count(self, table, *, filters=None):
+        self.count_calls += 1
+        return sum(1 for row in self.rows if self._matches(row, filters or {}))
+
+    async def select(self, table, *, filters=None, limit=None, **_kwargs):
+        self.select_calls += 1
+        rows = [dict(row) for row in self.rows if self._matches(row, filters or {})]
+        return rows[:limit] if limit else rows
+
+    async def insert(self, table, data):
+        row = {
+            "id": str(uuid.uuid4()),
+            "is_read": False,
+            "created_at": "2025-01-01T00:00:00+00:00",
+            **data,
+        }
+        self.rows.append(row)
+        return dict(row)
+
+    async def update(self, table, data, *, filters):
+        updated = []
+        for row in self.rows:
+            if self._matches(row, filters):
+                row.update(data)
+                updated.append(dict(row))
+        return updated
+
+
+@pytest.fixture(autouse=True)
+def _reset_unread_counts():
+    unread_counts.clear()
+    yield
+    unread_counts.clear()
+
+
+@pytest.mark.asyncio
+async def test_unread_count_uses_count_query_and_cached_counter():
+    database = NotificationDatabase()
+    service = NotificationService(
+        settings=types.SimpleNamespace(notification_unread_count_ttl=60), database=database
+    )
+    user_id = uuid.uuid4()
+    await service.create_notification(user_id, "job_status", "Job finished")
+
+    assert await service.get_unread_notification_count(user_id) == 1
+    assert database.count_calls == 1
+    assert database.select_calls == 0
+
+    await service.create_notification(user_id, "job_status", "Another job finished")
+    assert await service.get_unread_notification_count(user_id) == 2
+
+    first_id = database.rows[0]["id"]
+    await service.mark_notification_as_read(user_id, first_id)
+    # Marking an already-read notification must not decrement again.
+    already_read = await service.mark_notification_as_read(user_id, first_id)
+    assert already_read.is_read is True
+    assert await service.get_unread_notification_count(user_id) == 1
+
+    await service.mark_all_notifications_as_read(user_id)
+    assert await service.get_unread_notification_count(user_id) == 0
+    assert database.count_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_mark_missing_notification_as_read_returns_404():
+    service = NotificationService(settings=types.SimpleNamespace(), database=NotificationDatabase())
+    with pytest.raises(HTTPException) as exc_info:
+        await service.mark_notification_as_read(uuid.uuid4(), uuid.uuid4())
+    assert exc_info.value.status_code == 404
+
+
+def test_unread_count_cache_evicts_idle_and_overflowing_users(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("app.services.notifications.time.monotonic", lambda: now[0])
+    cache = UnreadCountCache(max_entries=2)
+    idle, first, second, third = (uuid.uuid4() for _ in range(4))
+
+    cache.set(idle, 1, ttl=30)
+    now[0] = 31.0
+    cache.set(first, 2, ttl=30)
+    # The idle user expired without polling again and is swept on the next write.
+    assert len(cache) == 1
+
+    cache.set(second, 3, ttl=30)
+    assert cache.get(first) == 2
+    cache.set(third, 4, ttl=30)
+
+    assert len(cache) == 2
+    assert cache.get(second) is None
+    assert (cache.get(first), cache.get(third)) == (2, 4)
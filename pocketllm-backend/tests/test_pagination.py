@@ -0,0 +1,92 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.pagination import (
+    Keyset,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    keyset_filter_expression,
+)
+
+
+class KeysetDatabase:
+    """Minimal select() that honours ordering, limit and keyset positions."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def select(self, table, *, filters=None, order_by=None, limit=None, keyset=None):
+        rows = [row for row in self.rows if all(row.get(k) == v for k, v in (filters or {}).items())]
+        columns = [column for column, _ in order_by]
+        descending = order_by[0][1]
+        if keyset is not None:
+            position = tuple(keyset.values)
+
+            def past(row):
+                key = tuple(row[c] for c in columns)
+                return key < position if keyset.descending else key > position
+
+            rows = [row for row in rows if past(row)]
+        rows.sort(key=lambda row: tuple(row[c] for c in columns), reverse=descending)
+        return rows[:limit]
+
+
+def _rows(count):
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    return [
+        {"id": f"{index:04d}", "user_id": "u1", "created_at": (start + timedelta(minutes=index)).isoformat()}
+        for index in range(count)
+    ]
+
+
+def test_keyset_expression_matches_row_comparison():
+    keyset = Keyset(("created_at", "id"), ("2025-01-01T00:00:00+00:00", "abc"), descending=True)
+    assert keyset_filter_expression(keyset) == (
+        'created_at.lt."2025-01-01T00:00:00+00:00",'
+        'and(created_at.eq."2025-01-01T00:00:00+00:00",id.lt."abc")'
+    )
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    row = {"created_at": "2025-01-01T00:00:00+00:00", "id": "abc"}
+    cursor = encode_cursor(row, ("created_at", "id"))
+    assert decode_cursor(cursor, ("created_at", "id")) == ("2025-01-01T00:00:00+00:00", "abc")
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor", ("created_at", "id"))
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_walks_forward_and_back():
+    database = KeysetDatabase(_rows(5))
+    kwargs = {"filters": {"user_id": "u1"}, "descending": True, "limit": 2}
+
+    first = await fetch_page(database, "jobs", **kwargs)
+    assert [row["id"] for row in first.rows] == ["0004", "0003"]
+    assert first.prev_cursor is None
+
+    second = await fetch_page(database, "jobs", after=first.next_cursor, **kwargs)
+    assert [row["id"] for row in second.rows] == ["0002", "0001"]
+
+    last = await fetch_page(database, "jobs", after=second.next_cursor, **kwargs)
+    assert [row["id"] for row in last.rows] == ["0000"]
+    assert last.next_cursor is None
+
+    back = await fetch_page(database, "jobs", before=second.prev_cursor, **kwargs)
+    assert [row["id"] for row in back.rows] == ["0004", "0003"]
+    assert back.prev_cursor is None
+    assert back.next_cursor == first.next_cursor
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_rejects_both_directions():
+    database = KeysetDatabase(_rows(1))
+    cursor = encode_cursor(_rows(1)[0], ("created_at", "id"))
+    with pytest.raises(HTTPException):
+        await fetch_page(
+            database, "jobs", filters={}, descending=True, limit=1, after=cursor, before=cursor
+        )
@@ -21,6 +21,14 @@ from app.services.providers import (
     OpenRouterProviderClient,
     ProviderModelCatalogue,
 )
+from app.services.providers import catalogue as catalogue_module
+from app.services.providers.catalogue import CatalogueRefresher
+from app.services.providers.catalogue_store import (
+    RedisCatalogueStore,
+    SQLiteCatalogueStore,
+    decode_entry,
+    encode_entry,
+)
 from database import ProviderRecord
 
 
@@ -488,6 +496,406 @@ async def test_catalogue_uses_cache_for_repeated_requests():
     assert client.calls == 1
 
 
+class VersionedClient:
+    """Returns a new model id on every fetch; can be made to fail or block."""
+
+    def __init__(self) -> None:
+        self.provider = "openai"
+        self.base_url = "https://example.test"
+        self.metadata = {}
+        self.calls = 0
+        self.fail = False
+        self.release: asyncio.Event | None = None
+
+    async def list_models(self) -> list[ProviderModel]:
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return [ProviderModel(provider="openai", id=f"v{self.calls}", name="Model")]
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1_000.0]
+    monkeypatch.setattr(catalogue_module, "_clock", lambda: now[0])
+    return now
+
+
+def swr_settings(**overrides: Any) -> SimpleNamespace:
+    values = {
+        "provider_catalogue_cache_ttl": 300,
+        "provider_catalogue_max_stale": 600,
+        "provider_catalogue_error_ttl": 30,
+    }
+    values.update(overrides)
+    return make_settings(**values)
+
+
+@pytest.mark.asyncio
+async def test_catalogue_serves_stale_entries_while_one_refresh_runs(clock):
+    client = VersionedClient()
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[client])
+    assert [model.id for model in await catalogue.list_all_models()] == ["v1"]
+
+    clock[0] += 301
+    client.release = asyncio.Event()
+    stale = await asyncio.gather(*(catalogue.list_all_models() for _ in range(3)))
+    assert all([model.id for model in models] == ["v1"] for models in stale)
+
+    client.release.set()
+    await asyncio.sleep(0.01)
+    assert client.calls == 2
+    assert [model.id for model in await catalogue.list_all_models()] == ["v2"]
+
+
+@pytest.mark.asyncio
+async def test_catalogue_blocks_once_entries_pass_max_stale(clock):
+    client = VersionedClient()
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[client])
+    await catalogue.list_all_models()
+
+    clock[0] += 300 + 601
+
+    assert [model.id for model in await catalogue.list_all_models()] == ["v2"]
+
+
+@pytest.mark.asyncio
+async def test_catalogue_caches_failures_briefly(clock):
+    client = VersionedClient()
+    client.fail = True
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[client])
+
+    assert await catalogue.list_all_models() == []
+    assert await catalogue.list_all_models() == []
+    assert client.calls == 1
+
+    clock[0] += 31
+    client.fail = False
+    assert [model.id for model in await catalogue.list_all_models()] == ["v2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_the_stale_catalogue(clock):
+    client = VersionedClient()
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[client])
+    await catalogue.list_all_models()
+
+    clock[0] += 301
+    client.fail = True
+    assert [model.id for model in await catalogue.list_all_models()] == ["v1"]
+    await asyncio.sleep(0.01)
+
+    assert [model.id for model in await catalogue.list_all_models()] == ["v1"]
+    assert client.calls == 2  # the failure is not retried within the error TTL
+
+
+@pytest.mark.asyncio
+async def test_refresher_prewarms_popular_entries_before_they_expire(clock):
+    popular, idle = VersionedClient(), VersionedClient()
+    idle.base_url = "https://idle.test"
+    settings = swr_settings()
+    await ProviderModelCatalogue(settings, clients=[popular, idle]).list_all_models()
+    for _ in range(3):
+        await ProviderModelCatalogue(settings, clients=[popular]).list_all_models()
+    refresher = CatalogueRefresher(settings, top=1, interval=60)
+
+    clock[0] += 250
+    assert await refresher.prewarm() == 1
+
+    assert (popular.calls, idle.calls) == (2, 1)
+    clock[0] += 60
+    models = await ProviderModelCatalogue(settings, clients=[popular]).list_all_models()
+    assert [model.id for model in models] == ["v2"]
+
+
+@pytest.mark.asyncio
+async def test_requests_during_a_prewarm_join_its_fetch(clock):
+    client = VersionedClient()
+    settings = swr_settings()
+    catalogue = ProviderModelCatalogue(settings, clients=[client])
+    await catalogue.list_all_models()
+    await catalogue.list_all_models()  # a hit makes the entry popular
+    refresher = CatalogueRefresher(settings, top=1, interval=60)
+
+    clock[0] += 301  # already stale when the prewarm starts
+    client.release = asyncio.Event()
+    prewarm = asyncio.create_task(refresher.prewarm())
+    await asyncio.sleep(0)
+    assert [model.id for model in await catalogue.list_all_models()] == ["v1"]
+
+    client.release.set()
+    assert await prewarm == 1
+    assert client.calls == 2
+    assert [model.id for model in await catalogue.list_all_models()] == ["v2"]
+
+
+class FixedClient:
+    def __init__(self, base_url: str, model_id: str = "shared") -> None:
+        self.provider = "openrouter"
+        self.base_url = base_url
+        self.metadata = {}
+        self.model_id = model_id
+        self.calls = 0
+
+    async def list_models(self) -> list[ProviderModel]:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return [ProviderModel(provider="openrouter", id=self.model_id, name="Model")]
+
+
+@pytest.mark.asyncio
+async def test_catalogue_cache_evicts_least_recently_used_keys(clock):
+    settings = swr_settings(provider_catalogue_cache_max_entries=2)
+    first, second, third = (FixedClient(f"https://{name}.test", name) for name in ("a", "b", "c"))
+    for client in (first, second):
+        await ProviderModelCatalogue(settings, clients=[client]).list_all_models()
+    await ProviderModelCatalogue(settings, clients=[first]).list_all_models()  # refresh recency
+
+    await ProviderModelCatalogue(settings, clients=[third]).list_all_models()
+    await ProviderModelCatalogue(settings, clients=[first]).list_all_models()
+    await ProviderModelCatalogue(settings, clients=[second]).list_all_models()
+
+    assert (first.calls, second.calls, third.calls) == (1, 2, 1)
+    stats = ProviderModelCatalogue(settings).stats()
+    assert stats["entries"] == 2 and stats["max_entries"] == 2
+    assert stats["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_identical_catalogues_are_stored_once(clock):
+    settings = swr_settings()
+    clients = [FixedClient(f"https://user-{index}.test") for index in range(3)]
+    for client in clients:
+        await ProviderModelCatalogue(settings, clients=[client]).list_all_models()
+
+    entries = list(ProviderModelCatalogue._cache.values())
+    assert entries[0].models is entries[1].models is entries[2].models
+    stats = ProviderModelCatalogue(settings).stats()
+    assert stats["entries"] == 3
+    assert stats["distinct_catalogues"] == 1 and stats["models"] == 1
+    assert stats["approx_bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_cached_model_looks_up_shared_catalogues_by_id(clock):
+    settings = swr_settings()
+    for index in range(5):
+        await ProviderModelCatalogue(settings, clients=[FixedClient(f"https://user-{index}.test")]).list_all_models()
+
+    (shared,) = {id(entry.models): entry.models for entry in ProviderModelCatalogue._cache.values()}.values()
+    assert shared.by_id == {"shared": shared[0]}
+    assert ProviderModelCatalogue.cached_model("OpenRouter", "shared") is shared[0]
+    assert ProviderModelCatalogue.cached_model("openrouter", "missing") is None
+    assert ProviderModelCatalogue.cached_model("openai", "shared") is None
+
+    clock[0] += 300 + 601
+    assert ProviderModelCatalogue.cached_model("openrouter", "shared") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch_and_leave_nothing_behind(clock):
+    client = FixedClient("https://example.test")
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[client])
+
+    results = await asyncio.gather(*(catalogue.list_all_models() for _ in range(5)))
+
+    assert client.calls == 1
+    assert all(len(models) == 1 for models in results)
+    await asyncio.sleep(0)
+    assert ProviderModelCatalogue._refreshing == {}
+
+
+class FakeRedis:
+    """Stand-in for ``redis.asyncio.Redis``: GET and SET with PX only."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.expiries: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, px: int) -> None:
+        self.values[key] = value
+        self.expiries[key] = px
+
+
+def test_catalogue_store_entries_round_trip() -> None:
+    models = [ProviderModel(provider="openai", id="gpt", name="GPT", context_window=8192)]
+
+    expires_at, stale_until, decoded = decode_entry(encode_entry(10.0, 20.0, models))
+
+    assert (expires_at, stale_until) == (10.0, 20.0)
+    assert decoded == models
+    assert decode_entry(b"not zlib") is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_catalogue_store_expires_entries(tmp_path):
+    store = SQLiteCatalogueStore(tmp_path / "catalogue.sqlite3")
+    try:
+        await store.set("fresh", b"payload", ttl=60)
+        await store.set("expired", b"payload", ttl=-1)
+
+        assert await store.get("fresh") == b"payload"
+        assert await store.get("expired") is None
+        assert await store.get("missing") is None
+    finally:
+        await store.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "redis"])
+async def test_cold_catalogue_is_served_from_the_shared_store(clock, tmp_path, backend):
+    redis = FakeRedis()
+
+    def make_store():
+        if backend == "redis":
+            return RedisCatalogueStore(client=redis)
+        return SQLiteCatalogueStore(tmp_path / "catalogue.sqlite3")
+
+    warm_store, client = make_store(), VersionedClient()
+    await ProviderModelCatalogue(swr_settings(), clients=[client], store=warm_store).list_all_models()
+    await warm_store.aclose()
+    if backend == "redis":
+        assert list(redis.expiries.values()) == [900_000]
+
+    ProviderModelCatalogue.clear_cache()  # a new worker starts cold
+    cold_store = make_store()
+    try:
+        catalogue = ProviderModelCatalogue(swr_settings(), clients=[client], store=cold_store)
+        assert [model.id for model in await catalogue.list_all_models()] == ["v1"]
+        assert client.calls == 1
+
+        ProviderModelCatalogue.clear_cache()
+        clock[0] += 301  # past the TTL but within max-stale: serve, then refresh
+        assert [model.id for model in await catalogue.list_all_models()] == ["v1"]
+        await asyncio.sleep(0.01)
+        assert client.calls == 2
+        assert [model.id for model in await catalogue.list_all_models()] == ["v2"]
+    finally:
+        await cold_store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_catalogue_store_errors_fall_back_to_the_provider(clock):
+    class BrokenRedis(FakeRedis):
+        async def get(self, key: str) -> bytes | None:
+            raise ConnectionError("redis down")
+
+        async def set(self, key: str, value: bytes, px: int) -> None:
+            raise ConnectionError("redis down")
+
+    client = VersionedClient()
+    store = RedisCatalogueStore(client=BrokenRedis())
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[client], store=store)
+
+    assert [model.id for model in await catalogue.list_all_models()] == ["v1"]
+    assert [model.id for model in await catalogue.list_all_models()] == ["v1"]
+    assert client.calls == 1
+
+
+class GatedClient:
+    """Answers only once ``release`` is set; its own timeout outlives the listing's."""
+
+    def __init__(self, provider: str, model_id: str) -> None:
+        self.provider = provider
+        self.base_url = f"https://{model_id}.test"
+        self.metadata = {"timeout": 5}
+        self.model_id = model_id
+        self.release = asyncio.Event()
+
+    async def list_models(self) -> list[ProviderModel]:
+        await self.release.wait()
+        return [ProviderModel(provider=self.provider, id=self.model_id, name="Model")]
+
+
+@pytest.mark.asyncio
+async def test_total_timeout_keeps_the_providers_that_answered(clock):
+    slow, fast = GatedClient("groq", "slow"), GatedClient("openai", "fast")
+    fast.release.set()
+    settings = swr_settings(provider_catalogue_total_timeout=0.05)
+    catalogue = ProviderModelCatalogue(settings, clients=[slow, fast])
+
+    models = await catalogue.list_all_models()
+
+    assert [model.id for model in models] == ["fast"]
+    assert models.partial
+    assert [(item.provider, item.status, item.model_count) for item in models.provider_status] == [
+        ("groq", "timeout", 0),
+        ("openai", "ok", 1),
+    ]
+
+    slow.release.set()  # the abandoned fetch still completes and fills the cache
+    await asyncio.sleep(0.01)
+    models = await catalogue.list_all_models()
+    assert [model.id for model in models] == ["slow", "fast"]
+    assert not models.partial
+
+
+@pytest.mark.asyncio
+async def test_stream_all_models_yields_providers_as_they_finish(clock):
+    slow, fast = GatedClient("groq", "slow"), GatedClient("openai", "fast")
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[slow, fast])
+    stream = catalogue.stream_all_models()
+
+    fast.release.set()
+    status, models = await anext(stream)
+    assert (status.provider, status.status, [model.id for model in models]) == ("openai", "ok", ["fast"])
+
+    slow.release.set()
+    status, models = await anext(stream)
+    assert (status.provider, [model.id for model in models]) == ("groq", ["slow"])
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+
+
+@pytest.mark.asyncio
+async def test_provider_status_reports_stale_and_failed_catalogues(clock):
+    flaky, down = VersionedClient(), VersionedClient()
+    down.base_url, down.provider, down.fail = "https://down.test", "groq", True
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[flaky, down])
+    await catalogue.list_all_models()
+
+    clock[0] += 301
+    flaky.fail = True
+    models = await catalogue.list_all_models()
+
+    assert [(item.provider, item.status) for item in models.provider_status] == [
+        ("openai", "stale"),
+        ("groq", "error"),
+    ]
+    await asyncio.sleep(0.01)
+    models = await catalogue.list_all_models()
+    assert [item.status for item in models.provider_status] == ["stale", "error"]
+
+
+@pytest.mark.asyncio
+async def test_providers_service_streams_filtered_models_per_provider(clock):
+    slow, fast = GatedClient("groq", "slow-model"), GatedClient("openai", "fast-model")
+    slow.release.set()
+    fast.release.set()
+    catalogue = ProviderModelCatalogue(swr_settings(), clients=[slow, fast])
+    service = ProvidersService(make_settings(), database=FakeDatabase(), catalogue=catalogue)
+
+    async def no_records(_: UUID) -> list[ProviderRecord]:
+        return []
+
+    service._fetch_provider_records = no_records  # type: ignore[assignment]
+
+    events = [event async for event in await service.stream_provider_models(uuid4(), model_id="fast")]
+
+    provider_events = {data["provider"]: data for name, data in events if name == "provider"}
+    assert [model["id"] for model in provider_events["openai"]["models"]] == ["fast-model"]
+    assert provider_events["groq"]["models"] == [] and provider_events["groq"]["model_count"] == 1
+    name, done = events[-1]
+    assert name == "done" and "models" not in done
+    assert done["using_fallback"] is True and done["partial"] is False
+    assert {item["provider"] for item in done["provider_status"]} == {"openai", "groq"}
+
+
 @pytest.mark.asyncio
 async def test_catalogue_requires_active_provider_configuration():
     RecordingProviderClient.initialiser_calls = []
@@ -217,3 +217,35 @@ async def test_get_provider_models_for_specific_provider_returns_public_results(
     assert len(response.models) == 1
     assert response.models[0].id == "alt"
     assert response.message is not None and "public" in response.message.lower()
+
+
+@pytest.mark.anyio("asyncio")
+async def test_list_providers_re_encrypts_keys_written_under_a_legacy_key() -> None:
+    old_key = Fernet.generate_key().decode("utf-8")
+    new_key = Fernet.generate_key().decode("utf-8")
+    old_token = Fernet(old_key.encode()).encrypt(b"sk-legacy").decode()
+    database = _StubDatabase(
+        {
+            "id": str(uuid4()),
+            "user_id": str(uuid4()),
+            "provider": "openai",
+            "display_name": "OpenAI",
+            "base_url": None,
+            "metadata": {},
+            "api_key_hash": "hash",
+            "api_key_preview": "sk-...acy",
+            "api_key_encrypted": old_token,
+            "is_active": True,
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc),
+        }
+    )
+    settings = SimpleNamespace(encryption_key=new_key, encryption_legacy_keys=old_key)
+    service = ProvidersService(settings, database, catalogue=Mock())
+
+    records = await service._load_provider_records(uuid4())
+
+    assert records[0].api_key == "sk-legacy"
+    assert database.last_filters["api_key_encrypted"] == old_token
+    new_token = database.last_update["api_key_encrypted"]
+    assert Fernet(new_key.encode()).decrypt(new_token.encode()) == b"sk-legacy"
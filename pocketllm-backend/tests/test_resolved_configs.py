@@ -0,0 +1,50 @@
+import uuid
+
+import pytest
+
+from app.services import resolved_configs
+from app.services.resolved_configs import ResolvedConfigCache
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_per_user_and_counts_hits():
+    cache = ResolvedConfigCache(ttl=60)
+    user_id = uuid.uuid4()
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        return "record"
+
+    assert await cache.get_or_load(user_id, ("providers",), load) == "record"
+    assert await cache.get_or_load(user_id, ("providers",), load) == "record"
+    assert loads == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_entries_expire_and_least_recent_users_are_evicted(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(resolved_configs.time, "monotonic", lambda: clock[0])
+    cache = ResolvedConfigCache(ttl=10, max_users=2)
+    first, second, third = "u1", "u2", "u3"
+    for user in (first, second):
+        cache.set(user, "k", user, cache.token(user))
+    assert cache.get(first, "k") == first  # first is now most recent
+    cache.set(third, "k", third, cache.token(third))
+
+    assert cache.get(second, "k") is None
+    assert cache.stats()["evictions"] == 1
+    clock[0] += 11
+    assert cache.get(first, "k") is None
+
+
+def test_invalidate_discards_loads_that_started_before_the_write():
+    cache = ResolvedConfigCache(ttl=60)
+    token = cache.token("user")
+    cache.invalidate("user")
+    cache.set("user", "k", "stale", token)
+
+    assert cache.get("user", "k") is None
+    assert cache.stats()["invalidations"] == 1
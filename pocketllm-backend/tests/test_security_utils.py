@@ -1,10 +1,18 @@
+import asyncio
 from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
 from uuid import uuid4
 
+import httpx
 import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi import HTTPException
 
-from app.utils.security import decode_access_token
+from app.core import jwks
+from app.core.jwks import JWKSCache
+from app.schemas.auth import TokenPayload
+from app.utils.security import VerifiedTokenCache, decode_access_token
 
 
 class _StubResponse:
@@ -21,8 +29,9 @@ class _StubResponse:
         return dict(self._payload)
 
 
-def test_decode_access_token_uses_supabase_verification(monkeypatch) -> None:
-    """Fallback validation should succeed when the JWT secret is missing."""
+@pytest.mark.asyncio
+async def test_decode_access_token_uses_supabase_verification(monkeypatch) -> None:
+    """The opt-in remote check validates tokens the process cannot verify."""
 
     user_id = uuid4()
     issued_at = datetime.now(tz=UTC) - timedelta(minutes=1)
@@ -47,12 +56,12 @@ def test_decode_access_token_uses_supabase_verification(monkeypatch) -> None:
         "aud": "authenticated",
     }
 
-    def _fake_get(url: str, *, headers: dict[str, str], timeout: float) -> _StubResponse:
+    async def _fake_fetch(url: str, headers: dict[str, str]) -> _StubResponse:
         assert url == "https://example.supabase.co/auth/v1/user"
         assert "Authorization" in headers and headers["Authorization"].startswith("Bearer ")
         return _StubResponse(supabase_user_payload)
 
-    monkeypatch.setattr("httpx.get", _fake_get)
+    monkeypatch.setattr("app.utils.security._fetch_supabase_user", _fake_fetch)
 
     settings = SimpleNamespace(
         supabase_jwt_secret=None,
@@ -61,12 +70,268 @@ def test_decode_access_token_uses_supabase_verification(monkeypatch) -> None:
         supabase_service_role_key="service-role",
         token_algorithm="HS256",
         supabase_jwt_audience="authenticated",
+        supabase_auth_remote_verification=True,
     )
 
-    payload = decode_access_token(token, settings)
+    payload = await decode_access_token(token, settings)
 
     assert payload.sub == user_id
     assert payload.email == "user@example.com"
     assert payload.role == "authenticated"
     assert payload.aud == "authenticated"
     assert payload.exp == expires_at.replace(microsecond=0)
+
+
+def _token_claims() -> dict[str, object]:
+    now = datetime.now(tz=UTC)
+    return {
+        "sub": str(uuid4()),
+        "aud": "authenticated",
+        "role": "authenticated",
+        "iat": int(now.timestamp()),
+        "exp": int((now + timedelta(hours=1)).timestamp()),
+    }
+
+
+def _jwks_settings(**overrides: object) -> SimpleNamespace:
+    values: dict[str, object] = dict(
+        supabase_jwt_secret=None,
+        supabase_url="https://example.supabase.co",
+        supabase_anon_key="anon-key",
+        supabase_jwt_audience="authenticated",
+        token_algorithm="HS256",
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.mark.asyncio
+async def test_decode_access_token_verifies_es256_against_cached_jwks(monkeypatch) -> None:
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    public_jwk = jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    public_jwk.update({"kid": "key-1", "alg": "ES256", "use": "sig"})
+    fetches = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal fetches
+        fetches += 1
+        assert request.url.path == "/auth/v1/.well-known/jwks.json"
+        return httpx.Response(200, json={"keys": [public_jwk]})
+
+    settings = _jwks_settings()
+    monkeypatch.setattr(jwks, "_cache", JWKSCache(settings, transport=httpx.MockTransport(handler)))
+    claims = _token_claims()
+    token = jwt.encode(claims, private_key, algorithm="ES256", headers={"kid": "key-1"})
+
+    first = await decode_access_token(token, settings)
+    second = await decode_access_token(token, settings)
+
+    assert str(first.sub) == claims["sub"] == str(second.sub)
+    assert fetches == 1
+
+    forged = jwt.encode(
+        claims, ec.generate_private_key(ec.SECP256R1()), algorithm="ES256", headers={"kid": "key-1"}
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await decode_access_token(forged, settings)
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_unverifiable_tokens_are_rejected_without_remote_opt_in(monkeypatch) -> None:
+    async def _unexpected_fetch(*_args: object) -> None:
+        raise AssertionError("remote verification must be opt-in")
+
+    monkeypatch.setattr("app.utils.security._fetch_supabase_user", _unexpected_fetch)
+    token = jwt.encode(_token_claims(), "some-other-secret", algorithm="HS256")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await decode_access_token(token, _jwks_settings())
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_serves_stale_keys_while_refreshing_in_background() -> None:
+    public_jwk = jwt.algorithms.ECAlgorithm.to_jwk(
+        ec.generate_private_key(ec.SECP256R1()).public_key(), as_dict=True
+    )
+    public_jwk["kid"] = "key-1"
+    clock = [0.0]
+    fetch_times: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetch_times.append(clock[0])
+        return httpx.Response(200, json={"keys": [public_jwk]})
+
+    cache = JWKSCache(
+        _jwks_settings(supabase_jwks_ttl=60),
+        transport=httpx.MockTransport(handler),
+        clock=lambda: clock[0],
+    )
+    assert (await cache.get_signing_key("key-1")).key_id == "key-1"
+
+    clock[0] = 120.0
+    stale = await cache.get_signing_key("key-1")
+    # The expired key is served straight away; the refetch runs in the background.
+    assert stale is not None and fetch_times == [0.0]
+    await cache.refresh()
+    assert fetch_times == [0.0, 120.0]
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_keeps_its_keys_when_a_refetch_has_none() -> None:
+    public_jwk = jwt.algorithms.ECAlgorithm.to_jwk(
+        ec.generate_private_key(ec.SECP256R1()).public_key(), as_dict=True
+    )
+    public_jwk["kid"] = "key-1"
+    clock = [0.0]
+    responses = [{"keys": [public_jwk]}, {"keys": []}, {"keys": [{"kty": "unknown"}]}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=responses.pop(0))
+
+    cache = JWKSCache(
+        _jwks_settings(supabase_jwks_ttl=60),
+        transport=httpx.MockTransport(handler),
+        clock=lambda: clock[0],
+    )
+    assert await cache.get_signing_key("key-1") is not None
+
+    for now in (120.0, 240.0):
+        clock[0] = now
+        await cache.refresh()
+        assert (await cache.get_signing_key("key-1")).key_id == "key-1"
+    assert responses == []
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_retries_a_failed_first_fetch_with_backoff() -> None:
+    public_jwk = jwt.algorithms.ECAlgorithm.to_jwk(
+        ec.generate_private_key(ec.SECP256R1()).public_key(), as_dict=True
+    )
+    public_jwk["kid"] = "key-1"
+    clock = [0.0]
+    fetch_times: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetch_times.append(clock[0])
+        if len(fetch_times) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"keys": [public_jwk]})
+
+    cache = JWKSCache(
+        _jwks_settings(), transport=httpx.MockTransport(handler), clock=lambda: clock[0]
+    )
+    for now in (0.0, 0.5, 1.0, 2.0, 3.0):
+        clock[0] = now
+        key = await cache.get_signing_key("key-1")
+
+    # Retried after 1 s, then 2 s, instead of waiting out the 30 s refetch throttle.
+    assert fetch_times == [0.0, 1.0, 3.0]
+    assert key is not None and key.key_id == "key-1"
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_jwks_refresher_waits_for_the_first_asymmetric_token(monkeypatch) -> None:
+    public_jwk = jwt.algorithms.ECAlgorithm.to_jwk(
+        ec.generate_private_key(ec.SECP256R1()).public_key(), as_dict=True
+    )
+    public_jwk["kid"] = "key-1"
+    fetches = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal fetches
+        fetches += 1
+        return httpx.Response(200, json={"keys": [public_jwk]})
+
+    settings = _jwks_settings(supabase_jwt_secret="shared-secret")
+    cache = JWKSCache(settings, transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(jwks, "_cache", cache)
+    token = jwt.encode(_token_claims(), "shared-secret", algorithm="HS256")
+
+    await decode_access_token(token, settings)
+    await asyncio.sleep(0)
+    # HS256-only traffic never touches the JWKS endpoint.
+    assert cache._refresher is None and fetches == 0
+
+    assert await cache.get_signing_key("key-1") is not None
+    assert cache._refresher is not None and not cache._refresher.done()
+    await asyncio.sleep(0)
+    # The refresher sleeps first instead of refetching the keys it just loaded.
+    assert fetches == 1
+    await cache.aclose()
+
+
+def _payload(exp: datetime) -> TokenPayload:
+    return TokenPayload.model_validate({"sub": str(uuid4()), "exp": exp})
+
+
+@pytest.mark.asyncio
+async def test_verified_token_cache_shares_one_remote_check_per_token() -> None:
+    cache = VerifiedTokenCache()
+    release = asyncio.Event()
+    calls = 0
+
+    async def verify() -> TokenPayload:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return _payload(datetime.now(tz=UTC) + timedelta(hours=1))
+
+    waiters = [asyncio.create_task(cache.get_or_verify("token", verify)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert len({result.sub for result in results}) == 1
+    assert await cache.get_or_verify("token", verify) is results[0]
+    assert calls == 1
+
+    cache.invalidate("token")
+    await cache.get_or_verify("token", verify)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_verified_token_cache_is_bounded_and_skips_near_expiry_tokens() -> None:
+    cache = VerifiedTokenCache(max_entries=2, expiry_margin=60)
+    later = datetime.now(tz=UTC) + timedelta(hours=1)
+
+    async def fresh() -> TokenPayload:
+        return _payload(later)
+
+    async def nearly_expired() -> TokenPayload:
+        return _payload(datetime.now(tz=UTC) + timedelta(seconds=30))
+
+    for token in ("a", "b", "c"):
+        await cache.get_or_verify(token, fresh)
+    await cache.get_or_verify("d", nearly_expired)
+
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_verified_tokens_are_rechecked_after_max_age(monkeypatch) -> None:
+    now = [1_000_000.0]
+    monkeypatch.setattr("app.utils.security.time", SimpleNamespace(time=lambda: now[0]))
+    cache = VerifiedTokenCache(max_age=60)
+    calls = 0
+
+    async def verify() -> TokenPayload:
+        nonlocal calls
+        calls += 1
+        return _payload(datetime.fromtimestamp(now[0], tz=UTC) + timedelta(hours=1))
+
+    await cache.get_or_verify("token", verify)
+    now[0] += 59
+    await cache.get_or_verify("token", verify)
+    assert calls == 1
+
+    # A sign-out handled by another worker takes effect here within max_age.
+    now[0] += 2
+    await cache.get_or_verify("token", verify)
+    assert calls == 2